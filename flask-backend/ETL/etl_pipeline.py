@@ -1,47 +1,91 @@
 import pandas as pd
+import numpy as np
 import psycopg2
+import argparse
+import glob
+import io
+import itertools
 import os
 import re
+import time as timer
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import time
 from dotenv import load_dotenv
+from openpyxl import load_workbook
 from psycopg2.extras import execute_batch
 
 # ------------------ Extract ------------------
-def extract_excel(file_name):
-    df = pd.read_excel(file_name, header=1, index_col=None) # add nrows= for 10k for testing
-    year_match = re.search(r'(\d{4})', file_name)
-
+def year_from_filename(file_name):
     # ------------------ use the file name to get the year for this dataset ------------------
+    year_match = re.search(r'(\d{4})', os.path.basename(file_name))
     if not year_match:
         raise ValueError("No 4 digit year found in excel filename\n")
-    
-    year = int(year_match.group(1))
-    df["year"] = year
+    return int(year_match.group(1))
 
+def extract_excel(file_name):
+    df = pd.read_excel(file_name, header=1, index_col=None) # add nrows= for 10k for testing
+    df["year"] = year_from_filename(file_name)
     return df
 
-df = extract_excel("Fall 2025 Master Schedule - Copy.xlsx")
+# raw excel columns that identify a section, chunks are only cut between sections
+CHUNK_KEY = ["Subject", "Catalog", "Session", "Section"]
+
+def iter_excel_chunks(file_name, chunksize=5000):
+    # ------------------ streaming extract: read_only openpyxl yields one row at a time ------------------
+    year = year_from_filename(file_name)
+    workbook = load_workbook(file_name, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(min_row=2, values_only=True)   # header is on the 2nd row
+        header = list(next(rows))
+        key = [header.index(column) for column in CHUNK_KEY]
+
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            # ---------- keep every row of a section (one per instructor) in the same chunk ----------
+            if len(buffer) >= chunksize and [row[i] for i in key] != [buffer[-1][i] for i in key]:
+                yield rows_to_frame(buffer, header, year)
+                buffer = []
+            buffer.append(row)
+
+        if buffer:
+            yield rows_to_frame(buffer, header, year)
+    finally:
+        workbook.close()
+
+def rows_to_frame(rows, header, year):
+    df = pd.DataFrame(rows, columns=header)
+    df["year"] = year
+    return df
 
 # ------------------ Transform ------------------
-def float_to_time(value):
-    if pd.isnull(value):
-        return None
-    hour = int(value)
-    minute = int(round((value - hour) * 100))
-    return pd.to_datetime(f"{hour}:{minute:02d}:00").time()
-
-def string_to_bool(value):
-    if pd.isnull(value):
-        return None
-    value = str(value).lower()
-    if value == "yes":
-        return True
-    elif value == "no":
-        return False
-    return None
+# every minute of the day as a datetime.time, indexed by minute-of-day (0 - 1439)
+TIME_OF_DAY = np.array([time(minute // 60, minute % 60) for minute in range(24 * 60)], dtype=object)
+
+def floats_to_times(values):
+    # ------------------ hh.mm floats (14.30 = 2:30 PM) decoded with array math ------------------
+    numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    hours = np.floor(numbers)
+    minutes = np.round((numbers - hours) * 100)
+    minute_of_day = hours * 60 + minutes
+
+    valid = ~np.isnan(minute_of_day) & (minutes < 60) & (minute_of_day >= 0) & (minute_of_day < 24 * 60)
+    result = np.full(len(numbers), None, dtype=object)
+    result[valid] = TIME_OF_DAY[minute_of_day[valid].astype(int)]
+    return pd.Series(result, index=values.index, dtype=object)
+
+def strings_to_bools(values):
+    # ------------------ yes/no -> True/False, anything else -> None ------------------
+    lowered = values.astype(str).str.lower()
+    result = pd.Series(None, index=values.index, dtype=object)
+    result[lowered == "yes"] = True
+    result[lowered == "no"] = False
+    return result
 
 def transform_data(df):
     # ------------------ drop columns not needed or can't use ourselves ------------------
-    df = df.drop(columns=["Class Nbr", "Room Capacity", "Current Enrollment", 
+    df = df.drop(columns=["Class Nbr", "Room Capacity", "Current Enrollment",
                           "Waitlist Capacity", "Waitlist Total", "Acad Group"])
 
     # ------------------ rename columns to mirror schema ------------------
@@ -71,33 +115,97 @@ def transform_data(df):
     df = df.rename(columns=column_mapping)
 
     # ------------------ convert values to match database schema ------------------
-    df["start_time"] = df["start_time"].apply(float_to_time)
-    df["end_time"] = df["end_time"].apply(float_to_time)
-    df["combined"] = df["combined"].apply(string_to_bool)
+    df["start_time"] = floats_to_times(df["start_time"])
+    df["end_time"] = floats_to_times(df["end_time"])
+    df["combined"] = strings_to_bools(df["combined"])
+    # ------------------ nullable ints, so a blank capacity doesn't turn the column into floats (COPY would get "45.0" / "nan") ------------------
+    df["enrollment_capacity"] = pd.to_numeric(df["enrollment_capacity"], errors="coerce").round().astype("Int64")
 
-    return df
+    # ------------------ text keys so merges line up with the varchar columns read back from the db ------------------
+    for column in ["session_code", "catalog_num", "section_num"]:
+        df[column] = df[column].astype(str)
 
-df = transform_data(df)
+    return df
 
 # ------------------ Load ------------------
-load_dotenv()                               # read the .env file
-DATABASE_URL = os.getenv("DATABASE_URL")    # update connection string
-conn = psycopg2.connect(DATABASE_URL)       # conn is live db connection
-cursor = conn.cursor()                      # cursor allows for executing SQL
-
-def load_to_db(df):
+def frame_to_params(frame):
+    # ------------------ rows as tuples of plain python values (NaN -> NULL) for psycopg2 ------------------
+    columns = [frame[name].astype(object).where(frame[name].notna(), None).tolist() for name in frame.columns]
+    return list(zip(*columns))
+
+def fetch_frame(cursor, query, columns):
+    cursor.execute(query)
+    return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+def build_course_params(courses, dept_ids):
+    # ---------- courses + department_id via merge instead of per row dict lookups ----------
+    courses = courses.merge(dept_ids, on="department_code")
+    return frame_to_params(courses[["department_id", "subject", "catalog_num", "title", "units"]])
+
+def build_section_params(sections, course_ids, term_ids):
+    sections = (
+        sections
+        .merge(course_ids, on=["subject", "catalog_num"])
+        .merge(term_ids, on=["session_code", "year"])
+        .drop_duplicates(subset=["course_id", "term_id", "section_num"])
+    )
+    return frame_to_params(sections[["course_id", "term_id", "section_num", "component",
+                                     "instruction_mode", "class_days", "start_time", "end_time",
+                                     "combined", "class_status", "enrollment_capacity", "room_code"]])
+
+def build_section_instructor_params(df, course_ids, term_ids, section_ids, instructor_ids):
+    links = (
+        df[["subject", "catalog_num", "session_code", "year", "section_num", "first_name", "last_name"]]
+        .merge(course_ids, on=["subject", "catalog_num"])
+        .merge(term_ids, on=["session_code", "year"])
+        .merge(section_ids, on=["course_id", "term_id", "section_num"])
+        .merge(instructor_ids, on=["first_name", "last_name"])
+    )
+    return frame_to_params(links[["section_id", "instructor_id"]].drop_duplicates())
+
+def fill_instructor_names(df):
     # ---------- replace missing instructor names with TBA (BIG fix) ----------
     df["first_name"] = df["first_name"].fillna("TBA")                       # fix 1, null vals
     df["last_name"]  = df["last_name"].fillna("TBA")
     df["first_name"] = df["first_name"].replace(r"^\s*$", "TBA", regex=True)# fix 2, empty/white space
     df["last_name"]  = df["last_name"].replace(r"^\s*$", "TBA", regex=True)
+    return df
 
-    # ---------- caches reduce time searching for id's to add foreign keys ----------
-    term_cache = {}
-    dept_cache = {}
-    course_cache = {}
-    instructor_cache = {}
-    section_cache = {}
+def refresh_search_documents(cursor, section_ids):
+    # ---------- SEARCH DOCUMENTS (only once schema.sql's full-text objects exist) ----------
+    cursor.execute("SELECT to_regproc('refresh_section_search_document') IS NOT NULL;")
+    if cursor.fetchone()[0]:
+        cursor.execute("SELECT refresh_section_search_document(%s);", (list(section_ids),))
+
+def refresh_search_view(cursor):
+    # ---------- SEARCH VIEW (denormalized section_search, only once schema.sql created it) ----------
+    cursor.execute("SELECT to_regclass('section_search') IS NOT NULL;")
+    if cursor.fetchone()[0]:
+        cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY section_search;")
+
+def bump_catalog_version(cursor):
+    # ---------- CATALOG VERSION (tells the app to drop its cached search data) ----------
+    cursor.execute("""
+        INSERT INTO catalog_version (id, version, updated_at)
+        VALUES (1, 1, now())
+        ON CONFLICT (id) DO UPDATE
+        SET version = catalog_version.version + 1, updated_at = now();
+    """)
+
+def refresh_term_search_documents(cursor, term_ids):
+    cursor.execute("SELECT id FROM section WHERE term_id = ANY(%s);", (sorted(set(term_ids)),))
+    refresh_search_documents(cursor, [row[0] for row in cursor.fetchall()])
+
+def finish_load(cursor, loaded_term_ids):
+    refresh_term_search_documents(cursor, loaded_term_ids)
+    refresh_search_view(cursor)
+    bump_catalog_version(cursor)
+
+def load_to_db(df, conn):
+    cursor = conn.cursor()                  # cursor allows for executing SQL
+    df = fill_instructor_names(df)
+
+    # ---------- id frames (read back after each insert) are merged in to add foreign keys ----------
 
     # ---------- TERMS ----------
     terms = df[["session_code", "year", "start_date", "end_date"]].drop_duplicates()
@@ -106,11 +214,10 @@ def load_to_db(df):
         INSERT INTO term (session_code, year, start_date, end_date)
         VALUES (%s, %s, %s, %s)
         ON CONFLICT (session_code, year) DO NOTHING;
-    """, list(terms.itertuples(index=False, name=None)))
+    """, frame_to_params(terms))
 
-    cursor.execute("SELECT id, session_code, year FROM term;")
-    for term_id, session_code, year in cursor.fetchall():
-        term_cache[(session_code, year)] = term_id
+    term_ids = fetch_frame(cursor, "SELECT id, session_code, year FROM term;",
+                           ["term_id", "session_code", "year"])
 
     # ---------- DEPARTMENTS ----------
     departments = df[["college", "department_code"]].drop_duplicates()
@@ -119,34 +226,22 @@ def load_to_db(df):
         INSERT INTO department (college, department_code)
         VALUES (%s, %s)
         ON CONFLICT (department_code) DO NOTHING;
-    """, list(departments.itertuples(index=False, name=None)))
+    """, frame_to_params(departments))
 
-    cursor.execute("SELECT id, department_code FROM department;")
-    for dept_id, dept_code in cursor.fetchall():
-        dept_cache[dept_code] = dept_id
+    dept_ids = fetch_frame(cursor, "SELECT id, department_code FROM department;",
+                           ["department_id", "department_code"])
 
     # ---------- COURSES ----------
     courses = df[["department_code", "subject", "catalog_num", "title", "units"]].drop_duplicates()
 
-    course_params = []
-    for _, row in courses.iterrows():
-        course_params.append((
-            dept_cache[row.department_code],
-            row.subject,
-            row.catalog_num,
-            row.title,
-            row.units
-        ))
-
     execute_batch(cursor, """
         INSERT INTO course (department_id, subject, catalog_num, title, units)
         VALUES (%s, %s, %s, %s, %s)
         ON CONFLICT (subject, catalog_num) DO NOTHING;
-    """, course_params)
+    """, build_course_params(courses, dept_ids))
 
-    cursor.execute("SELECT id, subject, catalog_num FROM course;")
-    for cid, subj, catalog in cursor.fetchall():
-        course_cache[(subj, catalog)] = cid
+    course_ids = fetch_frame(cursor, "SELECT id, subject, catalog_num FROM course;",
+                             ["course_id", "subject", "catalog_num"])
 
     # ---------- INSTRUCTORS ----------
     instructors = df[["first_name", "last_name"]].drop_duplicates()
@@ -155,11 +250,10 @@ def load_to_db(df):
         INSERT INTO instructor (first_name, last_name)
         VALUES (%s, %s)
         ON CONFLICT (first_name, last_name) DO NOTHING;
-    """, list(instructors.itertuples(index=False, name=None)))
+    """, frame_to_params(instructors))
 
-    cursor.execute("SELECT id, first_name, last_name FROM instructor;")
-    for iid, fn, ln in cursor.fetchall():
-        instructor_cache[(fn, ln)] = iid
+    instructor_ids = fetch_frame(cursor, "SELECT id, first_name, last_name FROM instructor;",
+                                 ["instructor_id", "first_name", "last_name"])
 
     # ---------- SECTIONS ----------
     sections = df[["subject", "catalog_num", "session_code", "year",
@@ -167,52 +261,419 @@ def load_to_db(df):
                    "class_days", "start_time", "end_time", "combined",
                    "class_status", "enrollment_capacity", "room_code"]]
 
-    section_params = []
-    for _, row in sections.iterrows():
-        section_params.append((
-            course_cache[(row.subject, row.catalog_num)],
-            term_cache[(row.session_code, row.year)],
-            row.section_num,
-            row.component,
-            row.instruction_mode,
-            row.class_days,
-            row.start_time,
-            row.end_time,
-            row.combined,
-            row.class_status,
-            row.enrollment_capacity,
-            row.room_code
-        ))
-
     execute_batch(cursor, """
         INSERT INTO section (course_id, term_id, section_num, component,
                              instruction_mode, class_days, start_time, end_time,
                              combined, class_status, enrollment_capacity, room_code)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         ON CONFLICT (course_id, term_id, section_num) DO NOTHING;
-    """, section_params)
+    """, build_section_params(sections, course_ids, term_ids))
 
-    cursor.execute("SELECT id, course_id, term_id, section_num FROM section;")
-    for sid, cid, tid, snum in cursor.fetchall():
-        section_cache[(cid, tid, snum)] = sid
+    section_ids = fetch_frame(cursor, "SELECT id, course_id, term_id, section_num FROM section;",
+                              ["section_id", "course_id", "term_id", "section_num"])
 
     # ---------- SECTION_INSTRUCTOR ----------
-    sect_instructor_params = []
-    for _, row in df.iterrows():
-        term_id = term_cache[(row.session_code, row.year)]
-        course_id = course_cache[(row.subject, row.catalog_num)]
-        section_id = section_cache[(course_id, term_id, row.section_num)]
-        instructor_id = instructor_cache[(row.first_name, row.last_name)]
-
-        sect_instructor_params.append((section_id, instructor_id))
-
     execute_batch(cursor, """
         INSERT INTO section_instructor (section_id, instructor_id)
         VALUES (%s, %s)
         ON CONFLICT DO NOTHING;
-    """, sect_instructor_params)
+    """, build_section_instructor_params(df, course_ids, term_ids, section_ids, instructor_ids))
+
+    loaded_terms = terms[["session_code", "year"]].merge(term_ids, on=["session_code", "year"])
+    finish_load(cursor, loaded_terms["term_id"].tolist())
 
     conn.commit()
 
-load_to_db(df)
-print("working...")
\ No newline at end of file
+# ------------------ Bulk load (COPY into staging tables) ------------------
+SECTION_COLUMNS = ["course_id", "term_id", "section_num", "component",
+                   "instruction_mode", "class_days", "start_time", "end_time",
+                   "combined", "class_status", "enrollment_capacity", "room_code"]
+
+def stage_frame(cursor, frame, table):
+    # ---------- COPY a frame into a temp copy of table's columns (temp tables skip the WAL, dropped on commit) ----------
+    columns = ", ".join(frame.columns)
+    cursor.execute(f"DROP TABLE IF EXISTS stage_{table};")     # left over from the previous chunk
+    cursor.execute(f"""
+        CREATE TEMP TABLE stage_{table} ON COMMIT DROP AS
+        SELECT {columns} FROM {table} WITH NO DATA;
+    """)
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False)     # NaN / None / <NA> -> empty field -> NULL
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY stage_{table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def merge_stage(cursor, table, columns, key, id_column):
+    # ---------- one INSERT ... SELECT ... ON CONFLICT per table, ids come back only for the staged keys ----------
+    column_list = ", ".join(columns)
+    key_list = ", ".join(key)
+    cursor.execute(f"""
+        WITH inserted AS (
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM stage_{table}
+            ON CONFLICT ({key_list}) DO NOTHING
+            RETURNING id, {key_list}
+        )
+        SELECT id, {key_list} FROM inserted
+        UNION ALL
+        SELECT t.id, {", ".join(f"t.{k}" for k in key)}
+        FROM {table} t
+        JOIN stage_{table} s USING ({key_list});
+    """)
+    return pd.DataFrame(cursor.fetchall(), columns=[id_column] + list(key))
+
+def load_dimensions_bulk(cursor, df):
+    # ---------- terms, departments, courses, instructors -> id frames for the section merge ----------
+
+    # ---------- TERMS ----------
+    terms = df[["session_code", "year", "start_date", "end_date"]].drop_duplicates(subset=["session_code", "year"])
+    stage_frame(cursor, terms, "term")
+    term_ids = merge_stage(cursor, "term", terms.columns, ["session_code", "year"], "term_id")
+
+    # ---------- DEPARTMENTS ----------
+    departments = df[["college", "department_code"]].drop_duplicates(subset=["department_code"])
+    stage_frame(cursor, departments, "department")
+    dept_ids = merge_stage(cursor, "department", departments.columns, ["department_code"], "department_id")
+
+    # ---------- COURSES ----------
+    courses = (
+        df[["department_code", "subject", "catalog_num", "title", "units"]]
+        .drop_duplicates(subset=["subject", "catalog_num"])
+        .merge(dept_ids, on="department_code")
+    )
+    # ---------- SMALLINT text for COPY, rounding halves up like postgres does (0.5 -> 1) ----------
+    courses["units"] = np.floor(pd.to_numeric(courses["units"]) + 0.5).astype("Int64")
+    courses = courses[["department_id", "subject", "catalog_num", "title", "units"]]
+    stage_frame(cursor, courses, "course")
+    course_ids = merge_stage(cursor, "course", courses.columns, ["subject", "catalog_num"], "course_id")
+
+    # ---------- INSTRUCTORS ----------
+    instructors = df[["first_name", "last_name"]].drop_duplicates()
+    stage_frame(cursor, instructors, "instructor")
+    instructor_ids = merge_stage(cursor, "instructor", instructors.columns, ["first_name", "last_name"], "instructor_id")
+
+    return term_ids, course_ids, instructor_ids
+
+def loaded_term_ids(df, term_ids):
+    # ---------- ids of the terms that actually appear in df ----------
+    terms = df[["session_code", "year"]].drop_duplicates().merge(term_ids, on=["session_code", "year"])
+    return terms["term_id"].tolist()
+
+def load_sections_bulk(cursor, df, term_ids, course_ids, instructor_ids):
+    # ---------- SECTIONS ----------
+    sections = (
+        df.merge(course_ids, on=["subject", "catalog_num"])
+        .merge(term_ids, on=["session_code", "year"])
+        .drop_duplicates(subset=["course_id", "term_id", "section_num"])
+    )
+    sections = sections[SECTION_COLUMNS]
+    stage_frame(cursor, sections, "section")
+    section_ids = merge_stage(cursor, "section", sections.columns, ["course_id", "term_id", "section_num"], "section_id")
+
+    # ---------- SECTION_INSTRUCTOR ----------
+    links = pd.DataFrame(
+        build_section_instructor_params(df, course_ids, term_ids, section_ids, instructor_ids),
+        columns=["section_id", "instructor_id"]
+    )
+    stage_frame(cursor, links, "section_instructor")
+    cursor.execute("""
+        INSERT INTO section_instructor (section_id, instructor_id)
+        SELECT section_id, instructor_id FROM stage_section_instructor
+        ON CONFLICT DO NOTHING;
+    """)
+    return loaded_term_ids(df, term_ids)
+
+def load_chunk_bulk(cursor, df):
+    df = fill_instructor_names(df)
+    return load_sections_bulk(cursor, df, *load_dimensions_bulk(cursor, df))
+
+def load_chunks_bulk(chunks, conn):
+    # ---------- chunks share one transaction, readers never see a half loaded schedule ----------
+    cursor = conn.cursor()
+    term_ids = set()
+    for df in chunks:
+        term_ids.update(load_chunk_bulk(cursor, df))
+
+    finish_load(cursor, term_ids)
+    conn.commit()
+
+def load_to_db_bulk(df, conn):
+    load_chunks_bulk([df], conn)
+
+# ------------------ Incremental load (only changed sections are written) ------------------
+SECTION_KEY = ["subject", "catalog_num", "session_code", "year", "section_num"]
+HASHED_COLUMNS = ["component", "instruction_mode", "class_days", "start_time", "end_time",
+                  "combined", "class_status", "enrollment_capacity", "room_code", "instructors"]
+
+def section_row_hashes(df):
+    # ---------- one fingerprint per section: its fields + sorted instructor names ----------
+    names = (df["last_name"].astype(str) + ", " + df["first_name"].astype(str)).rename("instructors")
+    instructors = (
+        pd.concat([df[SECTION_KEY], names], axis=1)
+        .drop_duplicates()
+        .sort_values("instructors")
+        .groupby(SECTION_KEY, sort=False)["instructors"]
+        .agg("; ".join)
+        .reset_index()
+    )
+    sections = df.drop_duplicates(subset=SECTION_KEY).drop(columns=["instructors"], errors="ignore")
+    sections = sections.merge(instructors, on=SECTION_KEY)
+
+    # ---------- text form so NaN / None hash the same, stored as signed BIGINT ----------
+    hashed = sections[HASHED_COLUMNS].copy()
+    hashed = hashed.astype(object)
+    hashed = hashed.where(hashed.notna(), "").astype(str)
+    sections["row_hash"] = pd.util.hash_pandas_object(hashed, index=False).to_numpy().view(np.int64)
+    return sections
+
+def load_sections_incremental(cursor, df, term_ids, course_ids, instructor_ids):
+    # ---------- SECTIONS (natural key = subject, catalog_num, term, section_num) ----------
+    sections = (
+        section_row_hashes(df)
+        .merge(course_ids, on=["subject", "catalog_num"])
+        .merge(term_ids, on=["session_code", "year"])
+        .drop_duplicates(subset=["course_id", "term_id", "section_num"])
+    )
+    sections = sections[SECTION_COLUMNS + ["row_hash"]]
+    stage_frame(cursor, sections, "section")
+
+    # ---------- upsert, rows whose hash didn't change are skipped by the WHERE ----------
+    updates = ",\n            ".join(f"{column} = EXCLUDED.{column}" for column in SECTION_COLUMNS[3:] + ["row_hash"])
+    cursor.execute(f"""
+        INSERT INTO section ({", ".join(sections.columns)})
+        SELECT {", ".join(sections.columns)} FROM stage_section
+        ON CONFLICT (course_id, term_id, section_num) DO UPDATE
+        SET {updates}
+        WHERE section.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+        RETURNING id, course_id, term_id, section_num, (xmax = 0) AS inserted;
+    """)
+    changed = pd.DataFrame(cursor.fetchall(), columns=["section_id", "course_id", "term_id", "section_num", "inserted"])
+
+    # ---------- remember every section seen so the ones missing from the file can be deleted at the end ----------
+    cursor.execute("""
+        INSERT INTO seen_section (id)
+        SELECT s.id FROM section s
+        JOIN stage_section st USING (course_id, term_id, section_num);
+    """)
+
+    # ---------- SECTION_INSTRUCTOR (re-linked for changed sections only) ----------
+    if not changed.empty:
+        changed_ids = changed["section_id"].tolist()
+        cursor.execute("DELETE FROM section_instructor WHERE section_id = ANY(%s);", (changed_ids,))
+        links = pd.DataFrame(
+            build_section_instructor_params(df, course_ids, term_ids, changed[["section_id", "course_id", "term_id", "section_num"]], instructor_ids),
+            columns=["section_id", "instructor_id"]
+        )
+        stage_frame(cursor, links, "section_instructor")
+        cursor.execute("""
+            INSERT INTO section_instructor (section_id, instructor_id)
+            SELECT section_id, instructor_id FROM stage_section_instructor
+            ON CONFLICT DO NOTHING;
+        """)
+        refresh_search_documents(cursor, changed_ids)
+
+    inserted = changed["inserted"].astype(bool)
+    counts = {
+        "inserted": int(inserted.sum()),
+        "updated": int((~inserted).sum()),
+        "unchanged": len(sections) - len(changed),
+    }
+    return loaded_term_ids(df, term_ids), counts
+
+def load_chunk_incremental(cursor, df):
+    df = fill_instructor_names(df)
+    return load_sections_incremental(cursor, df, *load_dimensions_bulk(cursor, df))
+
+def create_seen_sections(cursor):
+    cursor.execute("CREATE TEMP TABLE seen_section (id INT) ON COMMIT DROP;")
+
+def finish_incremental(cursor, term_ids, summary):
+    # ---------- sections of the loaded terms that are no longer in the spreadsheet ----------
+    cursor.execute("""
+        DELETE FROM section s
+        WHERE s.term_id = ANY(%s)
+          AND NOT EXISTS (SELECT 1 FROM seen_section seen WHERE seen.id = s.id)
+        RETURNING s.id;
+    """, (sorted(term_ids),))
+    summary["deleted"] = cursor.rowcount
+
+    # ---------- only invalidate app caches when something actually changed ----------
+    if summary["inserted"] or summary["updated"] or summary["deleted"]:
+        refresh_search_view(cursor)
+        bump_catalog_version(cursor)
+
+    print("sections: {inserted} inserted, {updated} updated, {deleted} deleted, {unchanged} unchanged".format(**summary))
+    return summary
+
+def add_counts(summary, counts):
+    for name, count in counts.items():
+        summary[name] = summary.get(name, 0) + count
+    return summary
+
+def load_chunks_incremental(chunks, conn):
+    cursor = conn.cursor()
+    create_seen_sections(cursor)
+
+    term_ids = set()
+    summary = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    for df in chunks:
+        chunk_term_ids, counts = load_chunk_incremental(cursor, df)
+        term_ids.update(chunk_term_ids)
+        add_counts(summary, counts)
+
+    finish_incremental(cursor, term_ids, summary)
+    conn.commit()
+    return summary
+
+def load_to_db_incremental(df, conn):
+    return load_chunks_incremental([df], conn)
+
+# batch = execute_batch INSERTs, bulk = COPY + staged merges (far fewer round trips),
+# incremental = bulk + row hashes so only new / changed / removed sections are written
+LOAD_MODES = {
+    "batch": load_to_db,
+    "bulk": load_to_db_bulk,
+    "incremental": load_to_db_incremental,
+}
+
+# same loaders fed one chunk at a time from iter_excel_chunks (ETL_CHUNKSIZE rows, bounded memory)
+STREAM_LOAD_MODES = {
+    "bulk": load_chunks_bulk,
+    "incremental": load_chunks_incremental,
+}
+
+# ------------------ Orchestrator (many workbooks) ------------------
+DIMENSION_COLUMNS = ["session_code", "year", "start_date", "end_date", "college", "department_code",
+                     "subject", "catalog_num", "title", "units", "first_name", "last_name"]
+
+def find_workbooks(paths):
+    # ---------- files as given, folders expanded to their .xlsx files (skipping excel ~$ lock files) ----------
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.xlsx"))))
+        else:
+            files.append(path)
+    return [f for f in files if not os.path.basename(f).startswith("~$")]
+
+def extract_and_transform(file_name):
+    # ---------- runs in a worker process, the transformed frame is pickled back ----------
+    return fill_instructor_names(transform_data(extract_excel(file_name)))
+
+def load_file_sections(database_url, mode, df, ids):
+    # ---------- one thread per workbook, each on its own connection + transaction ----------
+    conn = psycopg2.connect(database_url)
+    try:
+        cursor = conn.cursor()
+        if mode == "incremental":
+            create_seen_sections(cursor)
+            term_ids, counts = load_sections_incremental(cursor, df, *ids)
+            cursor.execute("SELECT id FROM seen_section;")
+            seen = [row[0] for row in cursor.fetchall()]
+        else:
+            term_ids = load_sections_bulk(cursor, df, *ids)
+            refresh_term_search_documents(cursor, term_ids)
+            counts, seen = {}, []
+        conn.commit()
+        return term_ids, counts, seen
+    finally:
+        conn.close()
+
+def run_parallel(files, database_url, mode="bulk", workers=None):
+    workers = workers or os.cpu_count() or 1
+
+    # ---------- 1. parse + transform every workbook in a process pool ----------
+    start = timer.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        frames = list(pool.map(extract_and_transform, files))
+    print(f"extract + transform: {len(files)} workbook(s) in {timer.perf_counter() - start:.2f}s")
+
+    conn = psycopg2.connect(database_url)
+    try:
+        cursor = conn.cursor()
+
+        # ---------- 2. dimensions from ONE connection so term/course/instructor ids never race ----------
+        start = timer.perf_counter()
+        dimensions = pd.concat([df[DIMENSION_COLUMNS] for df in frames], ignore_index=True)
+        ids = load_dimensions_bulk(cursor, dimensions)
+        conn.commit()
+        print(f"dimensions: {timer.perf_counter() - start:.2f}s")
+
+        # ---------- 3. section facts per workbook in parallel over separate connections ----------
+        start = timer.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda df: load_file_sections(database_url, mode, df, ids), frames))
+        print(f"sections: {timer.perf_counter() - start:.2f}s")
+
+        # ---------- 4. one version bump (and the incremental delete) after every workbook is in ----------
+        term_ids = {term_id for result in results for term_id in result[0]}
+        if mode == "incremental":
+            summary = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+            for _, counts, _ in results:
+                add_counts(summary, counts)
+            create_seen_sections(cursor)
+            seen = "\n".join(str(section_id) for result in results for section_id in result[2])
+            cursor.copy_expert("COPY seen_section (id) FROM STDIN", io.StringIO(seen))
+            finish_incremental(cursor, term_ids, summary)
+        else:
+            refresh_search_view(cursor)
+            bump_catalog_version(cursor)
+        conn.commit()
+    finally:
+        conn.close()
+
+def run_etl(paths, database_url, mode="bulk", workers=None, chunksize=None):
+    files = find_workbooks(paths)
+    if not files:
+        raise ValueError("No workbooks found\n")
+
+    if chunksize:
+        # ---------- streaming: one file / chunk at a time, bounded memory, one transaction ----------
+        chunks = (
+            transform_data(chunk)
+            for chunk in itertools.chain.from_iterable(iter_excel_chunks(f, chunksize) for f in files)
+        )
+        conn = psycopg2.connect(database_url)
+        try:
+            STREAM_LOAD_MODES[mode](chunks, conn)
+        finally:
+            conn.close()
+    elif mode == "batch":
+        # ---------- batch mode reads whole id tables back, so it can't share dimensions across workers ----------
+        conn = psycopg2.connect(database_url)
+        try:
+            for file_name in files:
+                load_to_db(extract_and_transform(file_name), conn)
+        finally:
+            conn.close()
+    else:
+        run_parallel(files, database_url, mode, workers)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load master schedule workbooks into the class search database")
+    parser.add_argument("paths", nargs="+", help="workbooks or folders of workbooks (.xlsx), the year comes from each file name")
+    parser.add_argument("--mode", choices=sorted(LOAD_MODES), default=os.getenv("ETL_LOAD_MODE", "bulk"),
+                        help="batch = row INSERTs, bulk = COPY (default), incremental = only write changed sections")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for parsing and connections for loading (default: cpu count)")
+    parser.add_argument("--chunksize", type=int, default=os.getenv("ETL_CHUNKSIZE"),
+                        help="stream workbooks this many rows at a time instead of in parallel")
+    parser.add_argument("--database-url", default=None, help="defaults to DATABASE_URL from .env")
+    args = parser.parse_args(argv)
+
+    if args.chunksize and args.mode not in STREAM_LOAD_MODES:
+        parser.error(f"--chunksize needs --mode {' or '.join(sorted(STREAM_LOAD_MODES))}")
+
+    load_dotenv()                               # read the .env file
+    args.database_url = args.database_url or os.getenv("DATABASE_URL")
+    if not args.database_url:
+        parser.error("DATABASE_URL is not set")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = timer.perf_counter()
+    run_etl(args.paths, args.database_url, args.mode, args.workers, args.chunksize)
+    print(f"done in {timer.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
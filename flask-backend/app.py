@@ -1,17 +1,21 @@
 import os
-import psycopg2
+import atexit
 import traceback
+from config import Config
 from database import db
 from flask_cors import CORS
 from models.user import User
 from dotenv import load_dotenv
 from flask_wtf import CSRFProtect
 from flask_mail import Mail, Message
+from services.mail_queue import MailQueue, MailSpool, sink_factory
 from flask_wtf.csrf import generate_csrf
 from itsdangerous import URLSafeTimedSerializer
-from flask import Flask, redirect, request, jsonify
+from flask import Flask, Response, redirect, request, jsonify, stream_with_context
 from dbconnect.connection import DatabaseConnection
-from werkzeug.security import generate_password_hash, check_password_hash
+from services.password_hasher import PasswordHasher
+from services.user_cache import UserCache
+from services.search_view_refresher import SearchViewRefresher
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 
 load_dotenv()  # load variables from .env
@@ -21,6 +25,7 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
 
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = Config.get_engine_options(app.config['SQLALCHEMY_DATABASE_URI']) # same DB_POOL_* settings as dbconnect's pool
 #app.config['SQLALCHEMY_ECHO'] = True #Remove later after done converting for debug
 
 app.config['SESSION_PROTECTION'] = 'strong'
@@ -34,18 +39,75 @@ app.config['MAIL_USE_TLS'] = True
 app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
 app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
+# send signup / verification mail from background workers through a SQLite spool instead of in the request
+app.config['MAIL_QUEUE_ENABLED'] = os.getenv('MAIL_QUEUE_ENABLED', 'True') == 'True'
+app.config['MAIL_QUEUE_WORKERS'] = int(os.getenv('MAIL_QUEUE_WORKERS', '2'))
+app.config['MAIL_SPOOL_PATH'] = os.getenv('MAIL_SPOOL_PATH', os.path.join(app.instance_path, 'mail_spool.sqlite3'))
+# where queued mail goes: "smtp" (the MAIL_* server above), "console", or "file:<path>" for testing
+app.config['MAIL_SINK'] = os.getenv('MAIL_SINK', 'smtp')
+
+# werkzeug method for new password hashes ("scrypt", "scrypt:16384:8:1", "pbkdf2:sha256:600000"),
+# older hashes are rehashed on the user's next login; a pool size > 0 hashes in that many processes
+app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+app.config['PASSWORD_HASH_POOL_SIZE'] = int(os.getenv('PASSWORD_HASH_POOL_SIZE', '0'))
+
+# seconds / entries for the user records Flask-Login loads on every authenticated request (0 turns it off)
+app.config['USER_CACHE_TTL'] = int(os.getenv('USER_CACHE_TTL', '30'))
+app.config['USER_CACHE_SIZE'] = int(os.getenv('USER_CACHE_SIZE', '10000'))
+
+# serve term scoped /courses/search calls from the in-memory section index
+app.config['SEARCH_INDEX_ENABLED'] = os.getenv('SEARCH_INDEX_ENABLED', 'False') == 'True'
+# match search_query against section_search_document (needs the pg_trgm / tsvector objects from schema.sql)
+app.config['FULL_TEXT_SEARCH_ENABLED'] = os.getenv('FULL_TEXT_SEARCH_ENABLED', 'False') == 'True'
+# build /courses/search pages from a column projection instead of Section objects
+app.config['SEARCH_PROJECTION_ENABLED'] = os.getenv('SEARCH_PROJECTION_ENABLED', 'True') == 'True'
+# filter the section_search materialized view instead of joining section/course/department/term
+# (needs the view from schema.sql, admin section writes refresh it when on)
+app.config['SEARCH_VIEW_ENABLED'] = os.getenv('SEARCH_VIEW_ENABLED', 'False') == 'True'
+# seconds after an admin section write before the view is refreshed, writes within it share one refresh
+app.config['SEARCH_VIEW_REFRESH_DELAY'] = float(os.getenv('SEARCH_VIEW_REFRESH_DELAY', '5'))
+# cache /courses/search pages by normalized filters (in-process, or shared through a Redis compatible
+# server at SEARCH_CACHE_URL which needs the redis package), entries also drop on catalog version bumps
+app.config['SEARCH_CACHE_ENABLED'] = os.getenv('SEARCH_CACHE_ENABLED', 'True') == 'True'
+app.config['SEARCH_CACHE_URL'] = os.getenv('SEARCH_CACHE_URL')
+app.config['SEARCH_CACHE_TTL'] = int(os.getenv('SEARCH_CACHE_TTL', '60'))
+app.config['SEARCH_CACHE_MAX_BYTES'] = int(os.getenv('SEARCH_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+# Cache-Control max-age (seconds) for the cached reference lists (/departments, /terms, ...)
+app.config['REFERENCE_CACHE_MAX_AGE'] = int(os.getenv('REFERENCE_CACHE_MAX_AGE', '60'))
 
 db.init_app(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
 csrf = CSRFProtect(app)
 mail = Mail(app)
+mail_queue = MailQueue(
+    MailSpool(app.config['MAIL_SPOOL_PATH']),
+    sink_factory(app.config),
+    workers=app.config['MAIL_QUEUE_WORKERS']
+)
+if app.config['MAIL_QUEUE_ENABLED']:
+    mail_queue.start()      # sends what an earlier run left in the spool without waiting for new mail
+password_hasher = PasswordHasher(
+    app.config['PASSWORD_HASH_METHOD'],
+    pool_size=app.config['PASSWORD_HASH_POOL_SIZE']
+)
+user_cache = UserCache(ttl=app.config['USER_CACHE_TTL'], max_size=app.config['USER_CACHE_SIZE'])
+search_view_refresher = SearchViewRefresher(app, delay=app.config['SEARCH_VIEW_REFRESH_DELAY'])
+atexit.register(search_view_refresher.flush)     # a refresh still waiting on its timer isn't lost at shutdown
 timedSerializer = URLSafeTimedSerializer(app.config['SECRET_KEY'])
 CORS(app, supports_credentials=True) #, origins=["https://ncs.unr.dev"] for the VPS
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 def get_connection():
-    return psycopg2.connect(DATABASE_URL)
+    #Pooled connection, use as: with get_connection() as conn
+    return DatabaseConnection.connection()
+
+def send_mail(msg):
+    #Queues msg for the mail workers (or sends it right away when the queue is off)
+    if app.config['MAIL_QUEUE_ENABLED']:
+        mail_queue.enqueue(msg)
+    else:
+        mail.send(msg)
 
 @login_manager.unauthorized_handler
 def unauthorized():
@@ -68,15 +130,29 @@ def NCS_db():
     except Exception as e:
         return {"status": "error", "message": str(e)}, 500
 
+@app.route("/db/pool-stats")
+@login_required
+def db_pool_stats():
+    #Connection pool sizing data for both the psycopg2 pool and the SQLAlchemy engine
+    engine_pool = db.engine.pool
+    return {
+        "status": "success",
+        "dbconnect": DatabaseConnection.pool_stats(),
+        "sqlalchemy": {
+            "size": engine_pool.size(),
+            "checked_out": engine_pool.checkedout(),
+            "checked_in": engine_pool.checkedin(),
+            "overflow": engine_pool.overflow(),
+        },
+    }
+
 @app.route("/courses")
 def get_courses():
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT id, name, code, credits FROM courses;")
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT id, name, code, credits FROM courses;")
+                rows = cur.fetchall()
 
         # Convert to list of dicts for JSON
         courses = [
@@ -96,7 +172,8 @@ def get_csrf_token():
 
 @login_manager.user_loader
 def load_user(user_id):
-    return db.session.get(User, int(user_id))
+    # CachedUser record (id, email, names, role, is_verified), not a User instance
+    return user_cache.get(int(user_id))
     #return User.query.get(int(user_id)) #deprecated
     
 @app.route('/signup', methods=['POST'])
@@ -122,7 +199,7 @@ def signup():
             print("doesnt exist")
         
         #add email and hashed password to DB
-        hashed_password = generate_password_hash(password)
+        hashed_password = password_hasher.hash(password)
         new_user = User(
             first_name=first_name,
             last_name=last_name,
@@ -139,7 +216,7 @@ def signup():
         verify_url = f"http://localhost:5000/verify-email/{token}"
         msg = Message('Verify your NCS email', recipients=[email])
         msg.body = f"Hi {first_name}, \n\nClick the link in order to verify your account:\n{verify_url}\n" #\nLink expires in 1 hour.
-        mail.send(msg)
+        send_mail(msg)
         
         return jsonify({'message': 'User created successfully'}), 201
         
@@ -166,6 +243,7 @@ def verify_email(token):
 
     user.is_verified = True
     db.session.commit()
+    user_cache.invalidate(user.id)
     
     #ADD PROPER PAGE ROUTING TO LOGIN VERIFIED IN THE FUTURE
     return redirect("http://localhost:8080")
@@ -184,7 +262,7 @@ def resend_verification():
     verify_url = f"http://localhost:5000/verify-email/{token}"
     msg = Message('Verify your NCS email', recipients=[email])
     msg.body = f"New verification link:\n{verify_url}\n\nExpires in 1 hour."
-    mail.send(msg)
+    send_mail(msg)
 
     return jsonify({'message': 'Verification email resent'}), 200
 
@@ -203,8 +281,16 @@ def login():
         user = db.session.execute(db.select(User).filter_by(email=email)).scalar_one_or_none()
         
         # Check if user exists and password matches
-        if not user or not check_password_hash(user.password, password):
+        if not user:
             return jsonify({'error': 'Invalid email or password'}), 401
+        matches, new_hash = password_hasher.verify_and_update(user.password, password)
+        if not matches:
+            return jsonify({'error': 'Invalid email or password'}), 401
+
+        # hash made with older settings, store it again with the current ones
+        if new_hash:
+            user.password = new_hash
+            db.session.commit()
         
         #Prevent login unless verified
         if not user.is_verified:
@@ -212,6 +298,7 @@ def login():
         
         #Logs out on browser closer prevents csrf issues will be fixed in the future
         login_user(user, remember=False)
+        user_cache.invalidate(user.id)     # the next request loads the fields just checked
         
         print("Authenticated: " + str(current_user.is_authenticated))
         print("ID: " + str(current_user.id))
@@ -237,6 +324,7 @@ def login():
 @app.route('/logout', methods=['POST'])
 @login_required
 def logout():
+    user_cache.invalidate(current_user.id)
     logout_user()
     print("Authenticated: " + str(current_user.is_authenticated))
     return jsonify({'message': 'Logged out successfully'}), 200
@@ -256,25 +344,34 @@ def auth_status():
         }), 200
     return jsonify({'authenticated': False}), 200
 
+from services.response_cache import ResponseCache
+# reference lists only change on ETL runs / admin writes, serialized once per catalog version
+reference_cache = ResponseCache(max_age=app.config['REFERENCE_CACHE_MAX_AGE'])
+
 from models.department import Department
 @app.route("/departments")
 def get_departments():
     try:
-        departments = Department.get_all()
-        return {"status": "success", "departments": [d.format() for d in departments]}
+        return reference_cache.respond("departments", lambda: {
+            "status": "success",
+            "departments": [d.format() for d in Department.get_all()]
+        })
     except Exception as e:
         return {"status": "error", "mesasage": str(e)}, 500     
 
 from models.course import Course
+def courses_payload():
+    courses = Course.get_all()
+    return {
+        "status": "success", 
+        "courses": [c.format() for c in courses],
+        "count": len(courses)
+    }
+
 @app.route("/courses-test")
 def get_courses_test():
     try:
-        courses = Course.get_all()
-        return {
-            "status": "success", 
-            "courses": [c.format() for c in courses],
-            "count": len(courses)
-        }
+        return reference_cache.respond("courses", courses_payload)
     except Exception as e:
         return {"status": "error", "message": str(e)}, 500
 
@@ -282,7 +379,7 @@ def get_courses_test():
 def get_course_detail(course_id):
     #Get detailed information about a specific course
     try:
-        course = Course.get_by_id(course_id)
+        course = Course.get_by_id(course_id, include_department=True)
         if not course:
             return {"status": "error", "message": "Course not found"}, 404
         
@@ -297,8 +394,10 @@ from models.instructor import Instructor
 @app.route("/instructors")
 def get_instructors():
     try:
-        instructors = Instructor.get_all()
-        return {"status": "success", "instructors": [i.format() for i in instructors]}
+        return reference_cache.respond("instructors", lambda: {
+            "status": "success",
+            "instructors": [i.format() for i in Instructor.get_all()]
+        })
     except Exception as e:
         return {"status": "error", "message": str(e)}, 500
 
@@ -306,8 +405,10 @@ from models.term import Term
 @app.route("/terms")
 def get_terms():
     try:
-        terms = Term.get_all()
-        return {"status": "success", "terms": [t.format() for t in terms]}
+        return reference_cache.respond("terms", lambda: {
+            "status": "success",
+            "terms": [t.format() for t in Term.get_all()]
+        })
     except Exception as e:
         return {"status": "error", "message": str(e)}, 500
 
@@ -315,7 +416,7 @@ from models.section import Section
 @app.route("/sections/<int:section_id>")
 def get_section_details(section_id):
     try:
-        section = Section.get_by_id(section_id)
+        section = Section.get_by_id(section_id, include_course=True, include_term=True, include_instructors=True)
         if not section:
             return {"status": "error", "message": "Section not found"}, 404
         
@@ -328,39 +429,90 @@ def get_section_details(section_id):
         return {"status": "error", "message": str(e)}, 500
 
 from services.search_service import SearchService
+from services.search_cache import MemoryBackend, RedisBackend, SearchCache
+
+search_cache = None
+if app.config['SEARCH_CACHE_ENABLED']:
+    search_cache = SearchCache(
+        RedisBackend(app.config['SEARCH_CACHE_URL']) if app.config['SEARCH_CACHE_URL']
+        else MemoryBackend(max_bytes=app.config['SEARCH_CACHE_MAX_BYTES']),
+        ttl=app.config['SEARCH_CACHE_TTL']
+    )
+
+# SearchService filter name -> query parameter name
+SEARCH_FILTER_PARAMS = {
+    'subject': 'subject',
+    'college': 'department',
+    'catalog_num': 'catalog_num',
+    'title': 'title',
+    'instructor': 'instructor',
+    'days': 'days',
+    'days_only': 'days_only',
+    'start_after': 'start_after',
+    'end_before': 'end_before',
+    'term': 'term',
+    'units': 'units',
+    'units_operator': 'units_operator',
+    'min_units': 'min_units',
+    'max_units': 'max_units',
+    'instruction_mode': 'instruction_mode',
+    'component': 'component',
+    'status': 'status',
+    'search_query': 'search_query',
+    'course_career': 'course_career',
+    'level': 'level',
+    'room': 'room',
+}
+
+def search_from_request():
+    #Builds a SearchService with every filter present in the query string
+    search = SearchService(
+        use_index=app.config['SEARCH_INDEX_ENABLED'],
+        use_full_text=app.config['FULL_TEXT_SEARCH_ENABLED'],
+        use_projection=app.config['SEARCH_PROJECTION_ENABLED'],
+        use_view=app.config['SEARCH_VIEW_ENABLED'],
+        cache=search_cache
+    )
+    for filter_name, param in SEARCH_FILTER_PARAMS.items():
+        search.add_filter(filter_name, request.args.get(param))
+    return search
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_stream():
+    #?stream=1 or an Accept header preferring NDJSON over plain JSON
+    if request.args.get('stream') == '1':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
 @app.route("/courses/search")
 def search_courses():
-    """Search for sections matching criteria - returns summary data"""
+    """Search for sections matching criteria - returns summary data one page at a time"""
     try:
-        search = SearchService()
+        search = search_from_request()
+
+        # streaming mode: every matching section, one JSON object per line (limit is ignored)
+        if wants_stream():
+            chunks = search.stream_ndjson(cursor=request.args.get('cursor'))
+            return Response(stream_with_context(chunks), mimetype=NDJSON_MIMETYPE)
         
-        # Add all possible filters from query parameters
-        search.add_filter('subject', request.args.get('subject'))
-        search.add_filter('college', request.args.get('department'))
-        search.add_filter('catalog_num', request.args.get('catalog_num'))
-        search.add_filter('title', request.args.get('title'))
-        search.add_filter('instructor', request.args.get('instructor'))
-        search.add_filter('days', request.args.get('days'))
-        search.add_filter('term', request.args.get('term'))
-        search.add_filter('units', request.args.get('units'))
-        search.add_filter('min_units', request.args.get('min_units'))
-        search.add_filter('max_units', request.args.get('max_units'))
-        search.add_filter('instruction_mode', request.args.get('instruction_mode'))
-        search.add_filter('component', request.args.get('component'))
-        search.add_filter('status', request.args.get('status'))
-        search.add_filter('search_query', request.args.get('search_query'))
-        search.add_filter('course_career', request.args.get('course_career'))
-        search.add_filter('level', request.args.get('level'))
-        search.add_filter('room', request.args.get('room'))
-        # Execute search
-        search.execute_search()
+        # Execute search (limit/cursor page through results, pass next_cursor back as cursor;
+        # with neither, every match comes back like before paging existed)
+        search.execute_search(
+            limit=request.args.get('limit'),
+            cursor=request.args.get('cursor')
+        )
         
         return {
             "status": "success",
             "sections": search.get_results_as_dict(),
             "count": search.get_result_count(),
+            "limit": search.limit,
+            "next_cursor": search.next_cursor,
             "filters_used": search.filters
         }
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
     except Exception as e:
         import traceback
         print("=" * 50)
@@ -369,21 +521,143 @@ def search_courses():
         print("=" * 50)
         return {"status": "error", "message": str(e)}, 500
 
+from services.suggest_index import SuggestIndex
+@app.route("/suggest")
+def suggest():
+    """Typeahead completions for course codes, titles and instructor names (served from memory)"""
+    try:
+        query = request.args.get('q', '')
+        return {
+            "status": "success",
+            "query": query,
+            "suggestions": SuggestIndex.current().suggest(query, request.args.get('limit'))
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}, 500
+
+@app.route("/cache-stats")
+@login_required
+def cache_stats():
+    #Hit / miss counters and sizes of this worker's caches
+    return {
+        "status": "success",
+        "search": search_cache.stats() if search_cache is not None else None,
+        "reference": reference_cache.stats(),
+        "user": user_cache.stats(),
+        "search_view_refresh": search_view_refresher.stats(),
+    }
+
+@app.route("/mail-stats")
+@login_required
+def mail_stats():
+    #Spool depth (all workers on this host) and this worker's send counters
+    return {"status": "success", "mail": mail_queue.stats()}
+
+@app.route("/courses/search/count")
+def search_courses_count():
+    """Total number of sections matching the filters (no rows loaded)"""
+    try:
+        search = search_from_request()
+        return {
+            "status": "success",
+            "total": search.get_total_count(),
+            "filters_used": search.filters
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}, 500
+
+@app.route("/courses/search/facets")
+def search_courses_facets():
+    """Result counts per subject, component, instruction_mode, status, level and units for the filters"""
+    try:
+        search = search_from_request()
+        facets = search.get_facets()
+        return {
+            "status": "success",
+            "total": facets["total"],
+            "facets": facets["facets"],
+            "filters_used": search.filters
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}, 500
+
+from services.schedule_generator import ScheduleGenerator
+@app.route('/schedules/generate', methods=['POST'])
+def generate_schedules():
+    #Top N conflict-free schedules for a list of courses in one term
+    data = request.get_json(silent=True) or {}
+    term = data.get('term')
+    courses = data.get('courses') or []
+    constraints = data.get('constraints') or {}
+
+    if not term or not courses:
+        return jsonify({'error': 'term and courses are required'}), 400
+    if len(courses) > ScheduleGenerator.MAX_COURSES:
+        return jsonify({'error': f'At most {ScheduleGenerator.MAX_COURSES} courses per request'}), 400
+    if any(not isinstance(c, dict) or not c.get('subject') or not c.get('catalog_num') for c in courses):
+        return jsonify({'error': 'Each course needs a subject and catalog_num'}), 400
+
+    try:
+        generator = ScheduleGenerator(
+            term,
+            courses,
+            earliest_start=constraints.get('earliest_start'),
+            latest_end=constraints.get('latest_end'),
+            allowed_days=constraints.get('allowed_days', constraints.get('days')),     # "days" is the old name
+            instruction_mode=constraints.get('instruction_mode'),
+            open_only=constraints.get('open_only', True),
+            limit=data.get('limit'),
+        )
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid constraints (times are HH:MM, allowed_days are day letters, limit is a number)'}), 400
+
+    try:
+        schedules = generator.generate()
+        if generator.missing_courses:
+            return jsonify({
+                'error': 'Courses not offered in this term',
+                'missing_courses': generator.missing_courses
+            }), 404
+
+        return jsonify({
+            'status': 'success',
+            'schedules': [ScheduleGenerator.format_schedule(options) for options in schedules],
+            'count': len(schedules),
+            'unschedulable': generator.empty_components,   # components with no section left after the constraints
+            'explored': generator.nodes,
+            'truncated': generator.truncated,
+        }), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+from services.conflict_service import ConflictService
+from services.planner_store import PlannerStore
 @app.route('/planner/section', methods=['POST'])
 @login_required
 def add_to_planner():
     try:
         data = request.get_json()
         section_id = data.get('section_id')
-        
-        section = db.session.get(Section, section_id)
-        if not section:
+
+        # optional: refuse sections that overlap something already planned
+        if data.get('check_conflicts'):
+            section = Section.get_by_id(section_id, include_term=True)
+            if not section:
+                return jsonify({'error': 'Section not found'}), 404
+            planned = Section.get_planned_by_user(current_user.id, include_term=True)
+            conflicts = ConflictService.check_candidate(section, planned)
+            if conflicts:
+                return jsonify({
+                    'error': 'Section conflicts with planned sections',
+                    'conflicts': conflicts
+                }), 409
+
+        result = PlannerStore.add(current_user.id, [section_id])
+        if result['not_found']:
             return jsonify({'error': 'Section not found'}), 404
-        
-        if section in current_user.planned_sections:
+        if result['already_planned']:
             return jsonify({'error': 'Section already in planner'}), 400
-        
-        current_user.planned_sections.append(section)
         db.session.commit()
         
         return jsonify({'message': 'Section added to planner'}), 200
@@ -398,14 +672,12 @@ def add_to_planner():
 @login_required
 def remove_from_planner(section_id):
     try:
-        section = db.session.get(Section, section_id)
-        if not section:
-            return jsonify({'error': 'Section not found'}), 404
-        
-        if section not in current_user.planned_sections:
+        result = PlannerStore.remove(current_user.id, [section_id])
+        if not result['removed']:
+            # nothing deleted, only now tell a missing section from one that isn't planned
+            if not db.session.get(Section, section_id):
+                return jsonify({'error': 'Section not found'}), 404
             return jsonify({'error': 'Section not in planner'}), 400
-        
-        current_user.planned_sections.remove(section)
         db.session.commit()
         
         return jsonify({'message': 'Section removed from planner'}), 200
@@ -414,20 +686,71 @@ def remove_from_planner(section_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/planner/sections', methods=['POST'])
+@login_required
+def bulk_update_planner():
+    #Adds and removes many sections in one transaction: {"add": [ids], "remove": [ids]}
+    data = request.get_json(silent=True) or {}
+    add_ids = data.get('add') or []
+    remove_ids = data.get('remove') or []
+
+    if not isinstance(add_ids, list) or not isinstance(remove_ids, list) or any(
+        not isinstance(i, int) or isinstance(i, bool) for i in add_ids + remove_ids
+    ):
+        return jsonify({'error': 'add and remove must be lists of section ids'}), 400
+    if not add_ids and not remove_ids:
+        return jsonify({'error': 'Nothing to add or remove'}), 400
+    if len(add_ids) + len(remove_ids) > PlannerStore.MAX_BULK:
+        return jsonify({'error': f'At most {PlannerStore.MAX_BULK} section ids per request'}), 400
+    if set(add_ids) & set(remove_ids):
+        return jsonify({'error': 'A section can not be both added and removed'}), 400
+
+    try:
+        removed = PlannerStore.remove(current_user.id, remove_ids)
+        added = PlannerStore.add(current_user.id, add_ids)
+        db.session.commit()
+        return jsonify({'status': 'success', **added, **removed}), 200
+    except Exception as e:
+        traceback.print_exc()
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/planner', methods=['GET'])
 @login_required
 def get_planner():
     try:
-        sections = current_user.planned_sections
+        # term is loaded too, the conflict check needs its dates
+        sections = Section.get_planned_by_user(
+            current_user.id, include_course=True, include_term=True, include_instructors=True
+        )
         return jsonify({
             'status': 'success',
             'sections': [s.format(include_course=True, include_instructors=True) for s in sections],
-            'count': len(sections)
+            'count': len(sections),
+            **ConflictService.summarize(sections)
         }), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/planner/conflicts', methods=['GET'])
+@login_required
+def get_planner_conflicts():
+    #Conflicts for a list of section ids (?section_ids=1,2,3), used after local planner swaps
+    try:
+        section_ids = [int(i) for i in request.args.get('section_ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({'error': 'section_ids must be comma separated integers'}), 400
+    if len(section_ids) > PlannerStore.MAX_BULK:
+        return jsonify({'error': f'At most {PlannerStore.MAX_BULK} section ids per request'}), 400
+
+    try:
+        sections = Section.get_by_ids(section_ids, include_term=True) if section_ids else []
+        return jsonify({'status': 'success', **ConflictService.summarize(sections)}), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
 # helpers for adding section
 def empty_to_none(value):
     if value is None:
@@ -437,6 +760,10 @@ def empty_to_none(value):
     return value
     
 from models.section import section_instructor
+from models.catalog_version import CatalogVersion
+from services.text_search import SectionTextSearch
+from services.meeting_times import days_string, parse_days
+from services.section_import import SectionImport, parse_csv, split_instructor_name
 @app.route('/admin/sections', methods=['POST'])
 @login_required
 def create_section():
@@ -477,6 +804,11 @@ def create_section():
         ):
             return jsonify({'error': 'All fields are required'}), 400
 
+        # store the catalog's day letters ("M Tu Th" -> "MTR") so the generated days_mask is right
+        class_days = days_string(parse_days(class_days))
+        if not class_days:
+            return jsonify({'error': 'Invalid class days'}), 400
+
         course = db.session.get(Course, course_id)
         if not course:
             return jsonify({'error': 'Course not found'}), 404
@@ -504,11 +836,7 @@ def create_section():
         db.session.flush()
 
         for full_name in instructor_names:
-            full_name = full_name.strip()
-
-            parts = full_name.split(maxsplit=1)
-            first_name = parts[0]
-            last_name = parts[1] if len(parts) > 1 else "TBA"
+            first_name, last_name = split_instructor_name(full_name)
 
             instructor = db.session.execute(
                 db.select(Instructor).filter_by(
@@ -525,7 +853,15 @@ def create_section():
             if instructor not in new_section.instructors:
                 new_section.instructors.append(instructor)
 
+        db.session.flush()
+        # documents are kept current even while searches don't use them, so turning the flag on finds every section
+        SectionTextSearch.refresh([new_section.id])
+
+        # invalidates the section index (and other catalog caches) in every worker
+        CatalogVersion.bump()
         db.session.commit()
+        if app.config['SEARCH_VIEW_ENABLED']:
+            search_view_refresher.schedule()     # after the commit, the refresh runs on another connection
 
         return jsonify({
             'status': 'success',
@@ -537,6 +873,47 @@ def create_section():
         traceback.print_exc()
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
-     
+
+@app.route('/admin/sections/bulk', methods=['POST'])
+@login_required
+def import_sections():
+    #Creates many sections at once from a JSON array (or {"sections": [...]}) or a CSV body / "file" upload
+    try:
+        if 'file' in request.files:
+            rows = parse_csv(request.files['file'].read().decode('utf-8-sig'))
+        elif request.mimetype == 'text/csv':
+            rows = parse_csv(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True)
+            rows = data.get('sections') if isinstance(data, dict) else data
+            if not isinstance(rows, list):
+                return jsonify({'error': 'Expected a JSON array of sections or a CSV file'}), 400
+
+        section_import = SectionImport(rows)
+        if not section_import.validate():
+            return jsonify({
+                'error': 'Some sections are invalid, nothing was imported',
+                'errors': section_import.errors
+            }), 400
+
+        section_ids = section_import.insert()
+        SectionTextSearch.refresh(section_ids)
+
+        CatalogVersion.bump()
+        db.session.commit()
+        if app.config['SEARCH_VIEW_ENABLED']:
+            search_view_refresher.schedule()     # one refresh for the whole import
+
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(section_ids)} sections created',
+            'section_ids': section_ids
+        }), 201
+
+    except Exception as e:
+        traceback.print_exc()
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Benchmark: row-wise vs vectorized ETL transform and parameter building
+
+Run from flask-backend/:
+    python benchmarks/bench_etl_transform.py ["ETL/Fall 2025 Master Schedule.xlsx"] [repeats]
+
+No database needed, ids are faked from the distinct keys in the workbook.
+"""
+import os
+import sys
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ETL"))
+from etl_pipeline import (extract_excel, transform_data, build_course_params,
+                          build_section_params, build_section_instructor_params)
+
+DEFAULT_WORKBOOK = os.path.join("ETL", "Fall 2025 Master Schedule.xlsx")
+
+
+# ------------------ previous row-wise implementation (baseline) ------------------
+def legacy_float_to_time(value):
+    if pd.isnull(value):
+        return None
+    hour = int(value)
+    minute = int(round((value - hour) * 100))
+    return pd.to_datetime(f"{hour}:{minute:02d}:00").time()
+
+def legacy_string_to_bool(value):
+    if pd.isnull(value):
+        return None
+    value = str(value).lower()
+    if value == "yes":
+        return True
+    elif value == "no":
+        return False
+    return None
+
+def legacy_transform(df):
+    df = df.rename(columns={"Class Start Time": "start_time", "Class End Time": "end_time", "Combined?": "combined"})
+    df["start_time"] = df["start_time"].apply(legacy_float_to_time)
+    df["end_time"] = df["end_time"].apply(legacy_float_to_time)
+    df["combined"] = df["combined"].apply(legacy_string_to_bool)
+    return df
+
+def legacy_params(df, dept_cache, course_cache, term_cache, section_cache, instructor_cache):
+    courses = df[["department_code", "subject", "catalog_num", "title", "units"]].drop_duplicates()
+    course_params = []
+    for _, row in courses.iterrows():
+        course_params.append((dept_cache[row.department_code], row.subject, row.catalog_num, row.title, row.units))
+
+    section_params = []
+    for _, row in df.iterrows():
+        section_params.append((course_cache[(row.subject, row.catalog_num)], term_cache[(row.session_code, row.year)],
+                               row.section_num, row.component, row.instruction_mode, row.class_days,
+                               row.start_time, row.end_time, row.combined, row.class_status,
+                               row.enrollment_capacity, row.room_code))
+
+    links = []
+    for _, row in df.iterrows():
+        term_id = term_cache[(row.session_code, row.year)]
+        course_id = course_cache[(row.subject, row.catalog_num)]
+        links.append((section_cache[(course_id, term_id, row.section_num)],
+                      instructor_cache[(row.first_name, row.last_name)]))
+    return course_params, section_params, links
+
+
+# ------------------ fake id frames / caches ------------------
+def fake_ids(frame, id_column):
+    frame = frame.drop_duplicates().reset_index(drop=True)
+    frame.insert(0, id_column, range(1, len(frame) + 1))
+    return frame
+
+def build_ids(df):
+    ids = {
+        "dept": fake_ids(df[["department_code"]], "department_id"),
+        "course": fake_ids(df[["subject", "catalog_num"]], "course_id"),
+        "term": fake_ids(df[["session_code", "year"]], "term_id"),
+        "instructor": fake_ids(df[["first_name", "last_name"]], "instructor_id"),
+    }
+    keyed = df.merge(ids["course"], on=["subject", "catalog_num"]).merge(ids["term"], on=["session_code", "year"])
+    ids["section"] = fake_ids(keyed[["course_id", "term_id", "section_num"]], "section_id")
+    return ids
+
+def as_cache(frame, id_column):
+    keys = [c for c in frame.columns if c != id_column]
+    if len(keys) == 1:
+        return dict(zip(frame[keys[0]], frame[id_column]))
+    return dict(zip(zip(*(frame[k] for k in keys)), frame[id_column]))
+
+
+def best_of(repeats, func):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    workbook = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_WORKBOOK
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    start = time.perf_counter()
+    raw = extract_excel(workbook)
+    print(f"extract: {time.perf_counter() - start:.3f}s ({len(raw)} rows)")
+
+    legacy_seconds = best_of(repeats, lambda: legacy_transform(raw.copy()))
+    vector_seconds = best_of(repeats, lambda: transform_data(raw.copy()))
+    print(f"transform  row-wise: {legacy_seconds:.3f}s  vectorized: {vector_seconds:.3f}s  "
+          f"({legacy_seconds / vector_seconds:.0f}x)")
+
+    df = transform_data(raw.copy())
+    df["first_name"] = df["first_name"].fillna("TBA")
+    df["last_name"] = df["last_name"].fillna("TBA")
+    ids = build_ids(df)
+    caches = (
+        as_cache(ids["dept"], "department_id"),
+        as_cache(ids["course"], "course_id"),
+        as_cache(ids["term"], "term_id"),
+        as_cache(ids["section"], "section_id"),
+        as_cache(ids["instructor"], "instructor_id"),
+    )
+
+    def vectorized_params():
+        courses = df[["department_code", "subject", "catalog_num", "title", "units"]].drop_duplicates()
+        build_course_params(courses, ids["dept"])
+        build_section_params(df, ids["course"], ids["term"])
+        build_section_instructor_params(df, ids["course"], ids["term"], ids["section"], ids["instructor"])
+
+    legacy_seconds = best_of(repeats, lambda: legacy_params(df, *caches))
+    vector_seconds = best_of(repeats, vectorized_params)
+    print(f"params     row-wise: {legacy_seconds:.3f}s  vectorized: {vector_seconds:.3f}s  "
+          f"({legacy_seconds / vector_seconds:.0f}x)")
+
+if __name__ == "__main__":
+    main()
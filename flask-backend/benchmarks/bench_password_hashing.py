@@ -0,0 +1,65 @@
+"""
+Benchmark: login password checks per second per core for a few hashing methods
+
+Run from flask-backend/:
+    python benchmarks/bench_password_hashing.py [seconds per case] [method ...]
+
+For every method it measures one thread, then as many threads as cores hashing on the request
+threads (pool size 0), then the same threads with PasswordHasher's process pool (one process per
+core). No database needed.
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.password_hasher import PasswordHasher
+
+DEFAULT_METHODS = ["pbkdf2:sha256:600000", "scrypt:16384:8:1", "scrypt"]
+PASSWORD = "correct horse battery staple"
+
+
+def logins_per_second(hasher, password_hash, threads, seconds):
+    # every thread checks the password until time runs out, returns total checks per second
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def worker(i):
+        while time.perf_counter() < deadline:
+            hasher.verify(password_hash, PASSWORD)
+            counts[i] += 1
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    methods = sys.argv[2:] or DEFAULT_METHODS
+    cores = os.cpu_count() or 1
+
+    print(f"{cores} cores, {seconds:.0f}s per case\n")
+    print(f"{'method':<24}{'ms/check':>10}{'1 thread':>12}{'threads':>12}{'pool':>12}   (logins/s per core)")
+    for method in methods:
+        inline = PasswordHasher(method)
+        pool = PasswordHasher(method, pool_size=cores)
+        password_hash = inline.hash(PASSWORD)
+        pool.verify(password_hash, PASSWORD)     # start the worker processes outside the timing
+
+        single = logins_per_second(inline, password_hash, 1, seconds)
+        threaded = logins_per_second(inline, password_hash, cores, seconds)
+        pooled = logins_per_second(pool, password_hash, cores * 2, seconds)
+        pool.shutdown()
+
+        print(f"{inline.prefix:<24}{1000 / single:>10.1f}{single:>12.1f}"
+              f"{threaded / cores:>12.1f}{pooled / cores:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
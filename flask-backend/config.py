@@ -1,5 +1,7 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 
 load_dotenv()
 
@@ -12,6 +14,14 @@ class Config:
     # Flask configuration. May be required later for user sign-in
     DEBUG = os.getenv("DEBUG", "True") == "True"
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
+
+    # Connection pool configuration (shared by dbconnect's pool and the SQLAlchemy engine)
+    DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))                 # seconds to wait for a free connection
+    DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))     # recycle connections older than this
+    DB_POOL_HEALTH_CHECK = os.getenv("DB_POOL_HEALTH_CHECK", "True") == "True"  # ping connections on checkout
+    DB_POOL_CHECK_IDLE_AFTER = float(os.getenv("DB_POOL_CHECK_IDLE_AFTER", "10"))  # only ping if idle this long
     
     @staticmethod
     def get_db_url():
@@ -20,6 +30,29 @@ class Config:
             raise ValueError("DATABASE_URL not set in environment variables")
         return Config.DATABASE_URL
     
+    @staticmethod
+    def get_engine_options(url=None):
+        #SQLALCHEMY_ENGINE_OPTIONS matching the psycopg2 pool settings
+        options = {
+            "pool_recycle": int(Config.DB_POOL_MAX_LIFETIME),
+            "pool_pre_ping": Config.DB_POOL_HEALTH_CHECK,
+        }
+        url = url or Config.DATABASE_URL
+        if url:
+            # SingletonThreadPool / StaticPool (sqlite://, in-memory test databases) take no size or timeout
+            url = make_url(url)
+            if not issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+                return options
+
+        # QueuePool opens connections lazily and keeps up to pool_size of them, like our pool
+        # (overflow connections would be closed on return, paying the TLS handshake again)
+        options.update({
+            "pool_size": Config.DB_POOL_MAX_SIZE,
+            "max_overflow": 0,
+            "pool_timeout": Config.DB_POOL_TIMEOUT,
+        })
+        return options
+
     @staticmethod
     def validate_config():
         #Validate that required configuration exists
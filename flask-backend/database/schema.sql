@@ -50,4 +50,131 @@ CREATE TABLE section_instructor (
     section_id INT REFERENCES section(id) ON DELETE CASCADE,
     instructor_id INT REFERENCES instructor(id) ON DELETE CASCADE,
     PRIMARY KEY(section_id, instructor_id)
-);
\ No newline at end of file
+);
+
+-- Version stamp bumped by the ETL and admin section writes, in-process search caches reload when it changes
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+INSERT INTO catalog_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
+
+
+-- Free-text search documents, one per section (course code, title, instructor names)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS section_search_document (
+    section_id INT PRIMARY KEY REFERENCES section(id) ON DELETE CASCADE,
+    search_text TEXT NOT NULL,
+    document TSVECTOR NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS section_search_document_document_idx ON section_search_document USING GIN (document);
+CREATE INDEX IF NOT EXISTS section_search_document_text_trgm_idx ON section_search_document USING GIN (search_text gin_trgm_ops);
+
+-- Rebuilds the documents for the given sections (every section when NULL), called by the ETL and admin writes
+CREATE OR REPLACE FUNCTION refresh_section_search_document(section_ids INT[] DEFAULT NULL)
+RETURNS INT
+LANGUAGE sql
+AS $$
+    WITH docs AS (
+        SELECT s.id AS section_id,
+               c.subject,
+               trim(c.catalog_num) AS catalog_num,
+               coalesce(c.title, '') AS title,
+               coalesce(string_agg(i.first_name || ' ' || i.last_name, ' '), '') AS instructor_names
+        FROM section s
+        JOIN course c ON c.id = s.course_id
+        LEFT JOIN section_instructor si ON si.section_id = s.id
+        LEFT JOIN instructor i ON i.id = si.instructor_id
+        WHERE section_ids IS NULL OR s.id = ANY(section_ids)
+        GROUP BY s.id, c.subject, c.catalog_num, c.title
+    ), upserted AS (
+        INSERT INTO section_search_document (section_id, search_text, document)
+        SELECT section_id,
+               concat_ws(' ', subject, catalog_num, subject || catalog_num, title, instructor_names),
+               setweight(to_tsvector('simple', concat_ws(' ', subject, catalog_num, subject || catalog_num)), 'A') ||
+               setweight(to_tsvector('simple', title), 'B') ||
+               setweight(to_tsvector('simple', instructor_names), 'C')
+        FROM docs
+        ON CONFLICT (section_id) DO UPDATE
+        SET search_text = EXCLUDED.search_text,
+            document = EXCLUDED.document
+        RETURNING 1
+    )
+    SELECT count(*)::int FROM upserted;
+$$;
+
+-- Fingerprint of each section's source row, the incremental ETL only rewrites sections whose hash changed
+ALTER TABLE section ADD COLUMN IF NOT EXISTS row_hash BIGINT;
+
+-- Meeting days as a bitmask (U=1, M=2, T=4, W=8, R=16, F=32, S=64, 0 = no meeting days) and start/end
+-- as minutes since midnight. Generated from class_days / start_time / end_time so every writer
+-- (ETL, admin) keeps them in sync; the day and time search filters compare these instead of class_days.
+ALTER TABLE section
+    ADD COLUMN IF NOT EXISTS days_mask SMALLINT GENERATED ALWAYS AS (
+        (CASE WHEN strpos(upper(class_days), 'U') > 0 THEN 1 ELSE 0 END) +
+        (CASE WHEN strpos(upper(class_days), 'M') > 0 THEN 2 ELSE 0 END) +
+        (CASE WHEN strpos(upper(class_days), 'T') > 0 THEN 4 ELSE 0 END) +
+        (CASE WHEN strpos(upper(class_days), 'W') > 0 THEN 8 ELSE 0 END) +
+        (CASE WHEN strpos(upper(class_days), 'R') > 0 THEN 16 ELSE 0 END) +
+        (CASE WHEN strpos(upper(class_days), 'F') > 0 THEN 32 ELSE 0 END) +
+        (CASE WHEN strpos(upper(class_days), 'S') > 0 THEN 64 ELSE 0 END)
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS start_min SMALLINT GENERATED ALWAYS AS (
+        (extract(hour FROM start_time) * 60 + extract(minute FROM start_time))::smallint
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS end_min SMALLINT GENERATED ALWAYS AS (
+        (extract(hour FROM end_time) * 60 + extract(minute FROM end_time))::smallint
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS section_term_days_mask_idx ON section (term_id, days_mask);
+CREATE INDEX IF NOT EXISTS section_term_start_min_idx ON section (term_id, start_min);
+CREATE INDEX IF NOT EXISTS section_term_end_min_idx ON section (term_id, end_min);
+
+-- Denormalized search rows, one per section: the section -> course -> department -> term joins and the
+-- instructor names done once per catalog change instead of per request (SearchService use_view).
+-- Refreshed CONCURRENTLY by the ETL and admin section writes, which needs the unique section_id index.
+CREATE MATERIALIZED VIEW IF NOT EXISTS section_search AS
+SELECT s.id AS section_id,
+       s.term_id,
+       t.session_code AS term,
+       c.subject,
+       c.catalog_num,
+       c.catalog_num_int,
+       c.subject || ' ' || c.catalog_num AS course_code,
+       c.title,
+       c.units,
+       d.college,
+       s.section_num,
+       s.component,
+       s.instruction_mode,
+       s.class_days,
+       s.days_mask,
+       s.start_time,
+       s.end_time,
+       s.start_min,
+       s.end_min,
+       s.class_status,
+       s.enrollment_capacity,
+       s.room_code,
+       (SELECT string_agg(i.first_name || ' ' || i.last_name, ', ' ORDER BY i.id)
+        FROM section_instructor si
+        JOIN instructor i ON i.id = si.instructor_id
+        WHERE si.section_id = s.id) AS instructor_names
+FROM section s
+JOIN course c ON c.id = s.course_id
+JOIN department d ON d.id = c.department_id
+JOIN term t ON t.id = s.term_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS section_search_section_id_idx ON section_search (section_id);
+-- keyset order of /courses/search, term scoped and unscoped
+CREATE INDEX IF NOT EXISTS section_search_term_order_idx ON section_search (term, subject, catalog_num, section_num, section_id);
+CREATE INDEX IF NOT EXISTS section_search_order_idx ON section_search (subject, catalog_num, section_num, section_id);
+CREATE INDEX IF NOT EXISTS section_search_term_days_mask_idx ON section_search (term, days_mask);
+CREATE INDEX IF NOT EXISTS section_search_term_start_min_idx ON section_search (term, start_min);
+CREATE INDEX IF NOT EXISTS section_search_term_end_min_idx ON section_search (term, end_min);
+CREATE INDEX IF NOT EXISTS section_search_title_trgm_idx ON section_search USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS section_search_room_trgm_idx ON section_search USING GIN (room_code gin_trgm_ops);
@@ -1,17 +1,35 @@
 import psycopg2
+from contextlib import contextmanager
 from config import Config
+from dbconnect.pool import get_pool
 
 class DatabaseConnection:
     """Handles all database connection and query execution"""
     
     @staticmethod
     def get_connection():
-        """Create and return a database connection"""
+        """Create and return a new unpooled database connection (caller closes it)"""
         try:
             return psycopg2.connect(Config.get_db_url())
         except psycopg2.Error as e:
             raise Exception(f"Database connection failed: {str(e)}")
     
+    @staticmethod
+    @contextmanager
+    def connection():
+        """
+        Check out a pooled connection for the duration of a with block
+        
+        Uncommitted work is rolled back when the connection goes back to the pool
+        """
+        with get_pool().connection() as conn:
+            yield conn
+    
+    @staticmethod
+    def pool_stats():
+        """Checkout statistics for the shared pool (in use, waiting, latency)"""
+        return get_pool().stats()
+    
     @staticmethod
     def execute_query(query, params=None):
         """
@@ -24,21 +42,13 @@ class DatabaseConnection:
         Returns:
             list: List of tuples containing query results
         """
-        conn = None
-        cur = None
         try:
-            conn = DatabaseConnection.get_connection()
-            cur = conn.cursor()
-            cur.execute(query, params or [])
-            results = cur.fetchall()
-            return results
+            with DatabaseConnection.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, params or [])
+                    return cur.fetchall()
         except psycopg2.Error as e:
             raise Exception(f"Query execution failed: {str(e)}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
     
     @staticmethod
     def execute_single(query, params=None):
@@ -52,18 +62,10 @@ class DatabaseConnection:
         Returns:
             tuple: Single row result or None
         """
-        conn = None
-        cur = None
         try:
-            conn = DatabaseConnection.get_connection()
-            cur = conn.cursor()
-            cur.execute(query, params or [])
-            result = cur.fetchone()
-            return result
+            with DatabaseConnection.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, params or [])
+                    return cur.fetchone()
         except psycopg2.Error as e:
             raise Exception(f"Query execution failed: {str(e)}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
\ No newline at end of file
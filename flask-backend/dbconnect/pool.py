@@ -0,0 +1,265 @@
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+import psycopg2
+import psycopg2.extensions
+from config import Config
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up before the checkout timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections with health checks and lifetime recycling"""
+
+    def __init__(self, dsn, min_size=1, max_size=10, timeout=30.0,
+                 max_lifetime=1800.0, health_check=True, check_idle_after=10.0):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        self.check_idle_after = check_idle_after
+
+        self._cond = threading.Condition()
+        self._idle = deque()        # (conn, created_at, idle_since)
+        self._created_at = {}       # id(conn) -> created_at for checked out connections
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._pid = os.getpid()
+
+        # statistics
+        self._checkouts = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._failed_checks = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # ------------------ connection lifecycle ------------------
+    def _connect(self):
+        try:
+            return psycopg2.connect(self.dsn)
+        except psycopg2.Error as e:
+            raise Exception(f"Database connection failed: {str(e)}")
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _expired(self, created_at, now):
+        return self.max_lifetime and now - created_at >= self.max_lifetime
+
+    def _healthy(self, conn, idle_since, now):
+        #Cheap closed flag check, plus a round trip if the connection sat idle for a while
+        if conn.closed:
+            return False
+        if not self.health_check or now - idle_since < self.check_idle_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _reset_after_fork(self):
+        # connections can't be shared with a parent process (e.g. gunicorn --preload)
+        if os.getpid() != self._pid:
+            with self._cond:
+                self._idle.clear()
+                self._created_at.clear()
+                self._size = 0
+                self._in_use = 0
+                self._waiting = 0
+                self._pid = os.getpid()
+
+    def fill(self):
+        #Opens connections until min_size are idle or in use
+        self._reset_after_fork()
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            now = time.monotonic()
+            with self._cond:
+                self._idle.append((conn, now, now))
+                self._cond.notify()
+
+    # ------------------ checkout / return ------------------
+    def getconn(self):
+        """
+        Check out a connection, waiting up to timeout seconds for one to free up
+
+        Returns:
+            connection: psycopg2 connection, give it back with putconn()
+        """
+        self._reset_after_fork()
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        conn = None
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        conn, created_at, idle_since = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection available after {self.timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+        now = time.monotonic()
+        if conn is not None:
+            if self._expired(created_at, now):
+                self._close(conn)
+                conn = None
+                with self._cond:
+                    self._recycled += 1
+            elif not self._healthy(conn, idle_since, now):
+                self._close(conn)
+                conn = None
+                with self._cond:
+                    self._failed_checks += 1
+
+        if conn is None:
+            # the slot is already counted in _size, open a replacement for it
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            created_at = time.monotonic()
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._created_at[id(conn)] = created_at
+        return conn
+
+    def putconn(self, conn, close=False):
+        #Returns a connection to the pool, rolling back anything left uncommitted
+        with self._cond:
+            created_at = self._created_at.pop(id(conn), None)
+            if created_at is None:
+                # not ours (or checked out before a fork), just close it
+                self._close(conn)
+                return
+            self._in_use -= 1
+
+        now = time.monotonic()
+        if not close and not conn.closed:
+            try:
+                if conn.status != psycopg2.extensions.STATUS_READY:
+                    conn.rollback()
+            except psycopg2.Error:
+                close = True
+
+        if close or conn.closed or self._expired(created_at, now):
+            self._close(conn)
+            with self._cond:
+                self._size -= 1
+                if not close:
+                    self._recycled += 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._idle.append((conn, created_at, now))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        #with pool.connection() as conn: ... (commit yourself when writing)
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken or conn.closed)
+
+    def close_all(self):
+        #Closes idle connections (checked out ones close when returned)
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for conn, _, _ in idle:
+            self._close(conn)
+
+    # ------------------ statistics ------------------
+    def stats(self):
+        with self._cond:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'waiting': self._waiting,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'recycled': self._recycled,
+                'failed_health_checks': self._failed_checks,
+                'avg_checkout_ms': round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'max_checkout_ms': round(self._wait_max * 1000, 3),
+            }
+
+    def __repr__(self):
+        return f"ConnectionPool(size={self._size}, in_use={self._in_use}, max_size={self.max_size})"
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    #Shared process wide pool built from Config on first use
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    Config.get_db_url(),
+                    min_size=Config.DB_POOL_MIN_SIZE,
+                    max_size=Config.DB_POOL_MAX_SIZE,
+                    timeout=Config.DB_POOL_TIMEOUT,
+                    max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                    health_check=Config.DB_POOL_HEALTH_CHECK,
+                    check_idle_after=Config.DB_POOL_CHECK_IDLE_AFTER,
+                )
+                _pool.fill()
+    return _pool
@@ -0,0 +1,73 @@
+import time
+from datetime import datetime, UTC
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from database import db
+
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_version'
+
+    # single row table (id = 1) bumped by the ETL and admin writes
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(UTC), server_default=db.func.now(), nullable=False)
+
+    # how often (seconds) a process re-reads the version from the database
+    CHECK_INTERVAL = 5.0
+
+    _cached_version = None
+    _checked_at = 0.0
+
+    #Static methods for database operations
+    @staticmethod
+    def get_current():
+        #Reads the version straight from the database (0 if never bumped)
+        row = db.session.get(CatalogVersion, 1)
+        return row.version if row else 0
+
+    @staticmethod
+    def cached_version():
+        #Version seen by this process, re-read at most every CHECK_INTERVAL seconds
+        now = time.monotonic()
+        if (
+            CatalogVersion._cached_version is None or
+            now - CatalogVersion._checked_at >= CatalogVersion.CHECK_INTERVAL
+        ):
+            CatalogVersion._cached_version = CatalogVersion.get_current()
+            CatalogVersion._checked_at = now
+        return CatalogVersion._cached_version
+
+    @staticmethod
+    def bump():
+        #Increments the version inside the caller's transaction (caller commits)
+        new_version = db.session.execute(
+            db.update(CatalogVersion)
+            .where(CatalogVersion.id == 1)
+            .values(version=CatalogVersion.version + 1, updated_at=datetime.now(UTC))
+            .returning(CatalogVersion.version)
+        ).scalar_one_or_none()
+
+        if new_version is None:
+            db.session.add(CatalogVersion(id=1, version=1, updated_at=datetime.now(UTC)))
+            new_version = 1
+
+        # the cached version is dropped once the bump is committed (see after_commit below), resetting it
+        # now would let another request re-read and keep the old version until CHECK_INTERVAL passes
+        db.session.info['catalog_version_bumped'] = True
+        return new_version
+
+    #Magic methods
+    def __repr__(self):
+        return f"CatalogVersion(version={self.version})"
+
+
+@event.listens_for(Session, 'after_commit')
+def _reset_cached_version(session):
+    #Forces the next cached_version() call to re-read once a bump() is committed
+    if session.info.pop('catalog_version_bumped', False):
+        CatalogVersion._checked_at = 0.0
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_bump(session):
+    session.info.pop('catalog_version_bumped', None)
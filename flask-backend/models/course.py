@@ -1,4 +1,5 @@
 from database import db
+from sqlalchemy.orm import joinedload
 
 
 class Course(db.Model):
@@ -90,16 +91,23 @@ class Course(db.Model):
 
         return data
 
+    #Eager loading profile matching format()'s include flags
+    @staticmethod
+    def load_options(include_department=False):
+        return [joinedload(Course.department)] if include_department else []
+
     #Static methods to test database operations
     @staticmethod
-    def get_all():
+    def get_all(**includes):
         return db.session.execute(
-            db.select(Course).order_by(Course.subject, Course.catalog_num)
+            db.select(Course)
+            .options(*Course.load_options(**includes))
+            .order_by(Course.subject, Course.catalog_num)
         ).scalars().all()
     
     @staticmethod
-    def get_by_id(course_id):
-        return db.session.get(Course, course_id)
+    def get_by_id(course_id, **includes):
+        return db.session.get(Course, course_id, options=Course.load_options(**includes))
     
     def get_by_subject(subject):
         return db.session.execute(
@@ -0,0 +1,14 @@
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from database import db
+
+class SectionSearchDocument(db.Model):
+    __tablename__ = 'section_search_document'
+
+    # one precomputed document per section, rebuilt by refresh_section_search_document() in schema.sql
+    section_id = db.Column(db.Integer, db.ForeignKey('section.id', ondelete='CASCADE'), primary_key=True)
+    search_text = db.Column(db.Text, nullable=False)   # "CS 135 CS135 Computer Science I Jane Doe", trigram indexed
+    document = db.Column(TSVECTOR, nullable=False)      # weighted: course code A, title B, instructors C
+
+    #Magic methods
+    def __repr__(self):
+        return f"SectionSearchDocument(section_id={self.section_id})"
@@ -1,4 +1,6 @@
 from database import db
+from sqlalchemy import FetchedValue
+from sqlalchemy.orm import joinedload, selectinload
 
 section_instructor = db.Table(
     'section_instructor', 
@@ -21,6 +23,12 @@ class Section(db.Model):
     class_status = db.Column(db.String(10), nullable=False)
     enrollment_capacity = db.Column(db.Integer)
     room_code = db.Column(db.String(20))
+    row_hash = db.Column(db.BigInteger)  # set by the incremental ETL
+
+    # generated by Postgres from class_days / start_time / end_time (see schema.sql), never written here
+    days_mask = db.Column(db.SmallInteger, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    start_min = db.Column(db.SmallInteger, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    end_min = db.Column(db.SmallInteger, server_default=FetchedValue(), server_onupdate=FetchedValue())
     
     course = db.relationship('Course', backref='sections')
     term = db.relationship('Term', backref='sections')
@@ -60,10 +68,42 @@ class Section(db.Model):
         
         return data
 
+    #Eager loading profile matching format()'s include flags (one round trip per collection, none per row)
+    @staticmethod
+    def load_options(include_course=False, include_term=False, include_instructors=False):
+        options = []
+        if include_course:
+            options.append(joinedload(Section.course))
+        if include_term:
+            options.append(joinedload(Section.term))
+        if include_instructors:
+            options.append(selectinload(Section.instructors))
+        return options
+
     #Static methods to test database operations
     @staticmethod
-    def get_by_id(section_id):
-        return db.session.get(Section, section_id)
+    def get_by_id(section_id, **includes):
+        return db.session.get(Section, section_id, options=Section.load_options(**includes))
+
+    @staticmethod
+    def get_by_ids(section_ids, **includes):
+        return db.session.execute(
+            db.select(Section)
+            .where(Section.id.in_(section_ids))
+            .options(*Section.load_options(**includes))
+        ).scalars().all()
+
+    @staticmethod
+    def get_planned_by_user(user_id, **includes):
+        #A user's planner in the order sections were added
+        from models.user import user_planned_section
+        return db.session.execute(
+            db.select(Section)
+            .join(user_planned_section, user_planned_section.c.section_id == Section.id)
+            .where(user_planned_section.c.user_id == user_id)
+            .options(*Section.load_options(**includes))
+            .order_by(user_planned_section.c.added_at, Section.id)
+        ).scalars().all()
     
     @staticmethod
     def get_by_course_id(course_id):
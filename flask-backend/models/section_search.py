@@ -0,0 +1,40 @@
+from sqlalchemy import text
+from database import db
+
+class SectionSearch(db.Model):
+    __tablename__ = 'section_search'
+
+    # read only: a materialized view in schema.sql with one denormalized row per section
+    section_id = db.Column(db.Integer, primary_key=True)
+    term_id = db.Column(db.Integer)
+    term = db.Column(db.String(10))             # term.session_code
+    subject = db.Column(db.String(50))
+    catalog_num = db.Column(db.String(10))
+    catalog_num_int = db.Column(db.Integer)
+    course_code = db.Column(db.String(61))      # "CS  135"
+    title = db.Column(db.String(100))
+    units = db.Column(db.SmallInteger)
+    college = db.Column(db.String(50))
+    section_num = db.Column(db.String(10))
+    component = db.Column(db.String(20))
+    instruction_mode = db.Column(db.String(10))
+    class_days = db.Column(db.String(10))
+    days_mask = db.Column(db.SmallInteger)
+    start_time = db.Column(db.Time)
+    end_time = db.Column(db.Time)
+    start_min = db.Column(db.SmallInteger)
+    end_min = db.Column(db.SmallInteger)
+    class_status = db.Column(db.String(10))
+    enrollment_capacity = db.Column(db.Integer)
+    room_code = db.Column(db.String(20))
+    instructor_names = db.Column(db.Text)       # "Jane Doe, John Roe", NULL when no instructor
+
+    #Static methods for database operations
+    @staticmethod
+    def refresh():
+        #Rebuilds the view without blocking readers, runs in the caller's transaction (caller commits)
+        db.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY section_search"))
+
+    #Magic methods
+    def __repr__(self):
+        return f"SectionSearch(section_id={self.section_id}, course_code='{self.course_code}')"
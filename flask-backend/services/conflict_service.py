@@ -0,0 +1,106 @@
+import heapq
+from services.meeting_times import weekly_intervals
+
+class ConflictService:
+    """Finds sections whose meeting times overlap (sweep line over minute-of-week intervals)"""
+
+    @staticmethod
+    def _term_dates(section):
+        term = getattr(section, 'term', None)
+        if term is None:
+            return (None, None)
+        return (term.start_date, term.end_date)
+
+    @staticmethod
+    def _dates_overlap(a, b):
+        #Sections of different sessions only clash if the sessions run at the same time
+        if None in a or None in b:
+            return True
+        return a[0] <= b[1] and b[0] <= a[1]
+
+    @staticmethod
+    def _blocks(section):
+        dates = ConflictService._term_dates(section)
+        return [
+            (start, end, section.id, dates)
+            for start, end in weekly_intervals(section.class_days, section.start_time, section.end_time)
+        ]
+
+    @staticmethod
+    def find_conflicts(sections):
+        """
+        Every pair of sections with overlapping meetings
+
+        Args:
+            sections: Section objects (or anything with id, class_days, start_time, end_time, term)
+
+        Returns:
+            list: sorted [(section_id, section_id), ...] with the smaller id first
+        """
+        blocks = []
+        for section in sections:
+            blocks.extend(ConflictService._blocks(section))
+        blocks.sort()
+
+        pairs = set()
+        active = []     # min-heap of (end, section_id, dates) for meetings still in progress
+        for start, end, section_id, dates in blocks:
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, other_id, other_dates in active:
+                if other_id != section_id and ConflictService._dates_overlap(dates, other_dates):
+                    pairs.add((min(section_id, other_id), max(section_id, other_id)))
+            heapq.heappush(active, (end, section_id, dates))
+
+        return sorted(pairs)
+
+    @staticmethod
+    def conflict_groups(pairs):
+        #Joins conflict pairs into groups (A-B and B-C -> [A, B, C]) with union-find
+        parent = {}
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for a, b in pairs:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        groups = {}
+        for section_id in parent:
+            groups.setdefault(find(section_id), []).append(section_id)
+        return sorted(sorted(group) for group in groups.values())
+
+    @staticmethod
+    def check_candidate(candidate, sections):
+        #Ids of the sections that would clash with candidate if it were added
+        candidate_blocks = ConflictService._blocks(candidate)
+        if not candidate_blocks:
+            return []
+
+        conflicts = []
+        for section in sections:
+            if section.id == candidate.id:
+                continue
+            for start, end, _, dates in ConflictService._blocks(section):
+                if any(
+                    start < c_end and c_start < end and ConflictService._dates_overlap(dates, c_dates)
+                    for c_start, c_end, _, c_dates in candidate_blocks
+                ):
+                    conflicts.append(section.id)
+                    break
+        return sorted(conflicts)
+
+    @staticmethod
+    def summarize(sections):
+        #Conflict pairs + groups in the shape the /planner endpoints return
+        pairs = ConflictService.find_conflicts(sections)
+        return {
+            'conflicts': [list(pair) for pair in pairs],
+            'conflict_groups': ConflictService.conflict_groups(pairs),
+        }
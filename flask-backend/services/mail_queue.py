@@ -0,0 +1,359 @@
+import json
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+
+class MailSpool:
+    """
+    Durable outbox in a local SQLite file, shared by every worker process on the host
+
+    A message stays in the spool until a sink accepted it. Workers claim due messages for a
+    lease (renewed before every send), so a worker that dies mid-send only delays them; failed
+    sends come back after an exponential backoff and are kept as dead after MAX_ATTEMPTS.
+    The file and table are created on first use.
+    """
+
+    MAX_ATTEMPTS = 8
+    BACKOFF_BASE = 30           # seconds before the first retry, doubled every attempt
+    BACKOFF_MAX = 60 * 60
+    LEASE = 120                 # seconds a claimed message is hidden from other workers, > one send
+
+    def __init__(self, path):
+        self.path = path
+        self._created = False
+        self._create_lock = threading.Lock()
+
+    def _create(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _Closing(sqlite3.connect(self.path, timeout=30, isolation_level=None)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sender TEXT,
+                    recipients TEXT NOT NULL,       -- JSON list
+                    subject TEXT,
+                    body TEXT,
+                    html TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    claimed_until REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    dead INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS outbox_due_idx ON outbox (dead, next_attempt_at)")
+
+    def _connect(self):
+        # one short lived connection per call, sqlite connections can't be shared across threads
+        if not self._created:
+            with self._create_lock:
+                if not self._created:
+                    self._create()
+                    self._created = True
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _Closing(conn)
+
+    def add(self, recipients, subject, body, html=None, sender=None):
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO outbox (sender, recipients, subject, body, html, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sender, json.dumps(list(recipients)), subject, body, html, now, now)
+            )
+            return cursor.lastrowid
+
+    def claim(self, limit):
+        #Leases up to limit due messages to the caller, oldest first
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")     # write lock, two workers never claim the same row
+            rows = conn.execute(
+                "SELECT * FROM outbox WHERE dead = 0 AND next_attempt_at <= ? AND claimed_until <= ? "
+                "ORDER BY id LIMIT ?",
+                (now, now, limit)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE outbox SET claimed_until = ? WHERE id = ?",
+                    [(now + self.LEASE, row['id']) for row in rows]
+                )
+            conn.execute("COMMIT")
+        return [dict(row, recipients=json.loads(row['recipients'])) for row in rows]
+
+    def renew(self, message_ids):
+        #Restarts the lease on messages this worker still holds
+        if not message_ids:
+            return
+        claimed_until = time.time() + self.LEASE
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE outbox SET claimed_until = ? WHERE id = ?",
+                [(claimed_until, message_id) for message_id in message_ids]
+            )
+
+    def delete(self, message_ids):
+        if not message_ids:
+            return
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(message_id,) for message_id in message_ids])
+
+    def retry_later(self, message, error):
+        #Schedules the next attempt with exponential backoff, gives up after MAX_ATTEMPTS
+        attempts = message['attempts'] + 1
+        delay = min(self.BACKOFF_BASE * 2 ** (attempts - 1), self.BACKOFF_MAX)
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, claimed_until = 0, last_error = ?, dead = ? "
+                "WHERE id = ?",
+                (attempts, time.time() + delay, str(error)[:500], int(attempts >= self.MAX_ATTEMPTS), message['id'])
+            )
+
+    def stats(self):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT count(*) FILTER (WHERE dead = 0) AS queued, "
+                "count(*) FILTER (WHERE dead = 0 AND attempts > 0) AS retrying, "
+                "count(*) FILTER (WHERE dead = 1) AS dead, "
+                "min(created_at) FILTER (WHERE dead = 0) AS oldest FROM outbox"
+            ).fetchone()
+        oldest = row['oldest']
+        return {
+            'queued': row['queued'],
+            'retrying': row['retrying'],
+            'dead': row['dead'],
+            'oldest_age': round(time.time() - oldest, 1) if oldest else None,
+        }
+
+
+class _Closing:
+    # sqlite3's own context manager only ends the transaction, this also closes the connection
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+
+def build_email(message, default_sender):
+    email = EmailMessage()
+    email['From'] = message.get('sender') or default_sender
+    email['To'] = ', '.join(message['recipients'])
+    email['Subject'] = message.get('subject') or ''
+    email.set_content(message.get('body') or '')
+    if message.get('html'):
+        email.add_alternative(message['html'], subtype='html')
+    return email
+
+
+class SMTPSink:
+    """Sends over one SMTP connection that stays open between messages (one sink per worker thread)"""
+
+    def __init__(self, host, port, use_tls=False, use_ssl=False, username=None, password=None,
+                 default_sender=None, timeout=30):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.default_sender = default_sender
+        self.timeout = timeout
+        self._smtp = None
+
+    @staticmethod
+    def from_config(config):
+        #Same MAIL_* settings Flask-Mail reads
+        return SMTPSink(
+            config['MAIL_SERVER'],
+            config['MAIL_PORT'],
+            use_tls=config.get('MAIL_USE_TLS', False),
+            use_ssl=config.get('MAIL_USE_SSL', False),
+            username=config.get('MAIL_USERNAME'),
+            password=config.get('MAIL_PASSWORD'),
+            default_sender=config.get('MAIL_DEFAULT_SENDER'),
+        )
+
+    def _connect(self):
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username and self.password:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def send(self, message):
+        if self._smtp is None:
+            self._smtp = self._connect()
+        self._smtp.send_message(build_email(message, self.default_sender))
+
+    def close(self):
+        #Drops the connection, the next send opens a new one
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                pass
+
+
+class FileSink:
+    """Writes messages to a file (or stdout for "-") instead of sending them, for development and tests"""
+
+    _lock = threading.Lock()
+
+    def __init__(self, path='-', default_sender=None):
+        self.path = path
+        self.default_sender = default_sender
+
+    def send(self, message):
+        text = build_email(message, self.default_sender).as_string()
+        with FileSink._lock:
+            if self.path == '-':
+                print(text, flush=True)
+            else:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(text + '\n')
+
+    def close(self):
+        pass
+
+
+def sink_factory(config):
+    #MAIL_SINK: "smtp" (default), "console", or "file:<path>"
+    sink = config.get('MAIL_SINK') or 'smtp'
+    sender = config.get('MAIL_DEFAULT_SENDER')
+    if sink == 'console':
+        return lambda: FileSink('-', sender)
+    if sink.startswith('file:'):
+        return lambda: FileSink(sink[len('file:'):], sender)
+    return lambda: SMTPSink.from_config(config)
+
+
+class MailQueue:
+    """
+    Hands mail to a pool of background workers through the spool, so requests never wait on SMTP
+
+    start() runs the workers (enqueue starts them too, also in a process forked after start).
+    Each one drains the spool in batches over its own sink and closes the SMTP connection after
+    idle_timeout seconds without mail.
+    """
+
+    def __init__(self, spool, make_sink, workers=2, batch_size=20, poll_interval=5.0, idle_timeout=30.0):
+        self.spool = spool
+        self.make_sink = make_sink
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval      # also picks up retries and other processes' mail
+        self.idle_timeout = idle_timeout
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._pid = None                        # process the threads run in, they don't survive a fork
+        self._start_lock = threading.Lock()
+
+        # statistics (this process)
+        self.sent = 0
+        self.failed = 0
+
+    def enqueue(self, message):
+        """
+        Spools a Flask-Mail Message for the workers
+
+        Returns:
+            int: spool id of the message
+        """
+        message_id = self.spool.add(
+            message.recipients, message.subject, message.body, html=message.html, sender=message.sender
+        )
+        self.start()
+        self._wake.set()
+        return message_id
+
+    def start(self):
+        if self._threads and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._threads and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'mail-worker-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def process_batch(self, sink):
+        #Sends one claimed batch over sink, returns how many messages were claimed
+        batch = self.spool.claim(self.batch_size)
+        sent = []
+        for i, message in enumerate(batch):
+            if i:
+                # a slow server must not let the rest of the batch (or the sent but not yet deleted
+                # messages) go to another worker mid-batch
+                self.spool.renew(sent + [m['id'] for m in batch[i:]])
+            try:
+                sink.send(message)
+                sent.append(message['id'])
+            except Exception as e:
+                logger.warning("Mail to %s failed (attempt %d): %s", message['recipients'], message['attempts'] + 1, e)
+                self.spool.retry_later(message, e)
+                self.failed += 1
+                sink.close()        # the connection may be broken, reconnect for the next message
+        self.spool.delete(sent)
+        self.sent += len(sent)
+        return len(batch)
+
+    def drain(self, sink=None):
+        #Sends everything due right now on the calling thread (tests, management scripts)
+        sink = sink or self.make_sink()
+        try:
+            while self.process_batch(sink):
+                pass
+        finally:
+            sink.close()
+
+    def _run(self):
+        sink = self.make_sink()
+        idle_since = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                if self.process_batch(sink):
+                    idle_since = time.monotonic()
+                    continue
+            except Exception:
+                logger.exception("Mail worker error")
+            if time.monotonic() - idle_since > self.idle_timeout:
+                sink.close()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+        sink.close()
+
+    def stats(self):
+        return {'sent': self.sent, 'failed': self.failed, 'workers': len(self._threads), **self.spool.stats()}
@@ -0,0 +1,120 @@
+from datetime import time
+
+# class_days letters in week order (U=Sun ... S=Sat, R=Thursday)
+DAYS = "UMTWRFS"
+
+# class_days letter -> bit in a day mask
+DAY_BITS = {letter: 1 << i for i, letter in enumerate(DAYS)}
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def day_mask(class_days):
+    #Converts a class_days string like "MWF" into a bitmask
+    mask = 0
+    for letter in (class_days or "").upper():
+        mask |= DAY_BITS.get(letter, 0)
+    return mask
+
+
+# two letter abbreviations accepted in day filters and admin input, the second letter must be
+# lowercase so "TU" still reads as Tuesday + Sunday like the stored single letter codes
+DAY_ABBREVIATIONS = {'Su': 'U', 'Tu': 'T', 'Th': 'R', 'Sa': 'S'}
+
+
+def parse_days(value):
+    #Day filter / admin input like "MW", "tr" or "M, Tu, Th" -> day mask, other characters are ignored
+    mask = 0
+    value = value or ""
+    i = 0
+    while i < len(value):
+        pair = value[i:i + 2]
+        if len(pair) == 2 and pair[1].islower() and pair.capitalize() in DAY_ABBREVIATIONS:
+            mask |= DAY_BITS[DAY_ABBREVIATIONS[pair.capitalize()]]
+            i += 2
+            continue
+        mask |= DAY_BITS.get(value[i].upper(), 0)
+        i += 1
+    return mask
+
+
+def days_string(mask):
+    #Day mask -> class_days letters in the order the catalog writes them (Sunday last, "MTWRFSU")
+    return "".join(letter for letter in DAYS[1:] + DAYS[0] if mask & DAY_BITS[letter])
+
+
+def submasks(mask):
+    #Every non-empty mask made of mask's bits ("MW" -> M, W, MW), the sections meeting only on those days
+    sub = mask
+    while sub:
+        yield sub
+        sub = (sub - 1) & mask
+
+
+def day_indexes(class_days):
+    #"MWF" -> [1, 3, 5] (0 = Sunday), unknown letters and TBA are skipped
+    mask = day_mask(class_days)
+    return [i for i in range(len(DAYS)) if mask & (1 << i)]
+
+
+def minute_of_day(value):
+    #datetime.time or "HH:MM[:SS]" -> minutes since midnight (None stays None)
+    if value is None:
+        return None
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    hours, minutes = str(value).split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def parse_minutes(value):
+    #"HH:MM" from a query string -> minutes since midnight, None for missing or invalid input
+    try:
+        minutes = minute_of_day(value)
+    except ValueError:
+        return None
+    if minutes is None or not 0 <= minutes < MINUTES_PER_DAY:
+        return None
+    return minutes
+
+
+def weekly_intervals(class_days, start_time, end_time):
+    """
+    Meeting times of a section as minute-of-week intervals
+
+    Args:
+        class_days: day letters like "TR"
+        start_time / end_time: datetime.time or "HH:MM:SS"
+
+    Returns:
+        list: [(start, end), ...] half open, Sunday 00:00 = 0 (empty for TBA sections)
+    """
+    start = minute_of_day(start_time)
+    end = minute_of_day(end_time)
+    if start is None or end is None or end <= start:
+        return []
+    return [
+        (day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end)
+        for day in day_indexes(class_days)
+    ]
+
+
+# schedule generator time grid: 5 minute slots, one bit per slot over the week
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+DAY_SLOTS = (1 << SLOTS_PER_DAY) - 1
+
+
+def slot_mask(class_days, start_time, end_time):
+    #Week bitmask of the 5 minute slots a section occupies (0 for TBA), overlap check is a & b
+    mask = 0
+    for start, end in weekly_intervals(class_days, start_time, end_time):
+        first = start // SLOT_MINUTES
+        last = -(-end // SLOT_MINUTES)      # round up so 9:50 - 9:52 still takes a slot
+        mask |= ((1 << (last - first)) - 1) << first
+    return mask
+
+
+def day_slots(mask, day):
+    #The slots of one day (0 = Sunday) out of a week mask
+    return (mask >> (day * SLOTS_PER_DAY)) & DAY_SLOTS
@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+def hash_prefix(password_hash):
+    #"scrypt:32768:8:1$salt$hash" -> "scrypt:32768:8:1", the method and cost a hash was made with
+    return password_hash.split('$', 1)[0]
+
+
+class PasswordHasher:
+    """
+    Werkzeug password hashing with a configurable method / cost
+
+    method is any werkzeug method string ("scrypt", "scrypt:16384:8:1", "pbkdf2:sha256:600000").
+    Hashes made with other parameters still verify, and verify_and_update returns a new hash for
+    them so logins move users onto the current settings.
+
+    With pool_size > 0 hashing runs in that many worker processes: request threads wait without
+    holding the GIL, and a login spike can use at most pool_size cores.
+    """
+
+    def __init__(self, method='scrypt', salt_length=16, pool_size=0):
+        self.method = method
+        self.salt_length = salt_length
+        self.pool_size = pool_size
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        # werkzeug fills in defaults ("scrypt" -> "scrypt:32768:8:1"), take the full prefix from a real hash
+        # (this also fails at startup on a bad method)
+        self.prefix = hash_prefix(generate_password_hash('', method=method, salt_length=salt_length))
+
+    def _run(self, function, *args):
+        if not self.pool_size:
+            return function(*args)
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.pool_size)
+        return self._pool.submit(function, *args).result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        return hash_prefix(password_hash) != self.prefix
+
+    def verify_and_update(self, password_hash, password):
+        """
+        Checks password and rehashes it when password_hash uses old parameters
+
+        Returns:
+            tuple: (matches, new hash to store or None)
+        """
+        if not self.verify(password_hash, password):
+            return False, None
+        if self.needs_rehash(password_hash):
+            return True, self.hash(password)
+        return True, None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,85 @@
+from datetime import datetime, UTC
+from sqlalchemy import literal
+from sqlalchemy.dialects.postgresql import insert
+from database import db
+from models.section import Section
+from models.user import user_planned_section
+
+
+class PlannerStore:
+    """
+    Planner writes straight against user_planned_section, one statement per operation
+
+    Nothing here loads User.planned_sections, membership is decided by the primary key
+    (ON CONFLICT / DELETE ... RETURNING). Callers commit.
+    """
+
+    # most section ids accepted by one bulk call
+    MAX_BULK = 200
+
+    @staticmethod
+    def add(user_id, section_ids):
+        """
+        Plans every existing section of section_ids for the user
+
+        Returns:
+            dict: {"added": [...], "already_planned": [...], "not_found": [...]} (sorted ids)
+        """
+        section_ids = sorted(set(section_ids))
+        if not section_ids:
+            return {'added': [], 'already_planned': [], 'not_found': []}
+
+        # one statement: find the sections, insert the missing links, report which rows were new
+        existing = (
+            db.select(Section.id.label('section_id'))
+            .where(Section.id.in_(section_ids))
+            .cte('existing')
+        )
+        inserted = (
+            insert(user_planned_section)
+            .from_select(
+                ['user_id', 'section_id', 'added_at'],
+                db.select(literal(user_id), existing.c.section_id, literal(datetime.now(UTC)))
+            )
+            .on_conflict_do_nothing()
+            .returning(user_planned_section.c.section_id)
+            .cte('inserted')
+        )
+        rows = db.session.execute(
+            db.select(existing.c.section_id, inserted.c.section_id.is_not(None))
+            .select_from(existing.outerjoin(inserted, inserted.c.section_id == existing.c.section_id))
+        ).all()
+
+        added = sorted(section_id for section_id, is_new in rows if is_new)
+        already_planned = sorted(section_id for section_id, is_new in rows if not is_new)
+        found = {section_id for section_id, _ in rows}
+        return {
+            'added': added,
+            'already_planned': already_planned,
+            'not_found': [section_id for section_id in section_ids if section_id not in found],
+        }
+
+    @staticmethod
+    def remove(user_id, section_ids):
+        """
+        Removes section_ids from the user's planner
+
+        Returns:
+            dict: {"removed": [...], "not_planned": [...]} (sorted ids)
+        """
+        section_ids = sorted(set(section_ids))
+        if not section_ids:
+            return {'removed': [], 'not_planned': []}
+
+        removed = set(db.session.execute(
+            db.delete(user_planned_section)
+            .where(
+                user_planned_section.c.user_id == user_id,
+                user_planned_section.c.section_id.in_(section_ids)
+            )
+            .returning(user_planned_section.c.section_id)
+        ).scalars())
+        return {
+            'removed': sorted(removed),
+            'not_planned': [section_id for section_id in section_ids if section_id not in removed],
+        }
@@ -0,0 +1,108 @@
+import gzip
+import hashlib
+import threading
+from flask import Response, current_app, request
+from models.catalog_version import CatalogVersion
+
+class CachedBody:
+    #One pre-serialized JSON body (plus its gzip copy) for a catalog version
+    __slots__ = ('version', 'body', 'gzip_body', 'etag')
+
+    def __init__(self, version, body, gzip_body, etag):
+        self.version = version
+        self.body = body
+        self.gzip_body = gzip_body
+        self.etag = etag
+
+
+class ResponseCache:
+    """
+    Serves reference lists (departments, terms, ...) from bodies serialized once per catalog version
+
+    Bodies are rebuilt when the ETL or an admin write bumps the catalog version.
+    Clients get an ETag and Cache-Control so repeat loads are answered with 304 Not Modified.
+    """
+
+    # bodies smaller than this aren't worth compressing
+    GZIP_MIN_SIZE = 1024
+
+    def __init__(self, max_age=60, use_gzip=True):
+        self.max_age = max_age
+        self.use_gzip = use_gzip
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def _build(self, key, version, build_payload):
+        body = current_app.json.dumps(build_payload()).encode('utf-8')
+        gzip_body = None
+        if self.use_gzip and len(body) >= self.GZIP_MIN_SIZE:
+            gzip_body = gzip.compress(body, compresslevel=6)
+
+        # weak ETag because the identity and gzip bodies share it
+        digest = hashlib.sha1(body).hexdigest()[:16]
+        etag = f'{version}-{digest}'
+        return CachedBody(version, body, gzip_body, etag)
+
+    def get(self, key, build_payload):
+        #Returns the CachedBody for key, building it if missing or from an older catalog version
+        version = CatalogVersion.cached_version()
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry
+
+        # one request rebuilds, the others wait for it instead of all querying at once
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                entry = self._build(key, version, build_payload)
+                self._entries[key] = entry
+            else:
+                self.hits += 1
+        return entry
+
+    def respond(self, key, build_payload):
+        """
+        Response for key, honoring If-None-Match and Accept-Encoding
+
+        Args:
+            key: cache key, one per endpoint
+            build_payload: called on a miss, returns the dict to serialize
+
+        Returns:
+            Response: 200 with the cached body or 304 Not Modified
+        """
+        entry = self.get(key, build_payload)
+
+        if request.if_none_match.contains_weak(entry.etag):
+            self.not_modified += 1
+            response = Response(status=304)
+        elif entry.gzip_body is not None and request.accept_encodings['gzip']:
+            response = Response(entry.gzip_body, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(entry.body, mimetype='application/json')
+
+        response.set_etag(entry.etag, weak=True)
+        response.headers['Cache-Control'] = f'public, max-age={self.max_age}'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': sum(len(e.body) + len(e.gzip_body or b'') for e in list(self._entries.values())),
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+        }
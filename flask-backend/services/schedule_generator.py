@@ -0,0 +1,245 @@
+import heapq
+import time
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import contains_eager, selectinload
+from database import db
+from models.section import Section
+from models.course import Course
+from models.term import Term
+from services.meeting_times import (
+    DAYS, SLOT_MINUTES, day_mask, day_slots, minute_of_day, parse_days, slot_mask
+)
+
+
+class ScheduleOption:
+    #Sections of one (course, component) that meet at exactly the same times, interchangeable for the search
+    __slots__ = ('mask', 'days', 'sections')
+
+    def __init__(self, mask, sections):
+        self.mask = mask
+        self.days = day_mask(sections[0].class_days) if mask else 0
+        self.sections = sections
+
+
+class ScheduleGenerator:
+    """
+    Builds conflict-free schedules from a list of wanted courses
+
+    Every (course, component) pair is a variable that needs one section (a lecture, a lab, ...).
+    Meeting times are week bitmasks of 5 minute slots so a clash check is one AND.
+    The search picks the variable with the fewest options left (MRV) and after each pick
+    removes clashing options from the remaining variables (forward checking), backing up
+    as soon as one runs out.
+    """
+
+    MAX_COURSES = 10
+    DEFAULT_RESULTS = 10
+    MAX_RESULTS = 50
+
+    # seconds / search nodes before giving up and returning the best schedules found so far
+    TIME_BUDGET = 0.5
+    NODE_BUDGET = 500000
+
+    def __init__(self, term, courses, earliest_start=None, latest_end=None, allowed_days=None,
+                 instruction_mode=None, open_only=True, limit=None):
+        self.term = term
+        self.courses = [(c['subject'].strip().upper(), str(c['catalog_num']).strip()) for c in courses]
+        self.earliest_start = minute_of_day(earliest_start) if earliest_start else None
+        self.latest_end = minute_of_day(latest_end) if latest_end else None
+        # hard constraint, sections meeting on any other day are left out ("MW", "M, Tu, Th")
+        self.allowed_days = parse_days(allowed_days) if allowed_days else None
+        if self.allowed_days == 0:
+            raise ValueError("No days in allowed_days")
+        self.instruction_mode = instruction_mode
+        self.open_only = open_only
+        self.limit = max(1, min(int(limit or self.DEFAULT_RESULTS), self.MAX_RESULTS))
+
+        self.missing_courses = []
+        self.empty_components = []
+        self.nodes = 0
+        self.truncated = False
+        self._deadline = None
+        self._best = []      # heap of (-score, counter, options) holding the best `limit` schedules
+        self._counter = 0
+
+    # ------------------ loading ------------------
+    def _load_sections(self):
+        #One query for every section of the wanted courses in the term
+        query = (
+            db.select(Section)
+            .join(Section.course)
+            .join(Section.term)
+            .where(Term.session_code == self.term)
+            .where(tuple_(Course.subject, func.trim(Course.catalog_num)).in_(self.courses))
+            .options(contains_eager(Section.course), selectinload(Section.instructors))
+            .order_by(Course.subject, Course.catalog_num, Section.section_num)
+        )
+        return db.session.execute(query).scalars().all()
+
+    def _allowed(self, section):
+        #Hard constraints, sections without meeting times (online / TBA) always pass the time ones
+        if self.open_only and section.class_status != 'A':
+            return False
+        if self.instruction_mode and section.instruction_mode != self.instruction_mode:
+            return False
+
+        start = minute_of_day(section.start_time)
+        end = minute_of_day(section.end_time)
+        if start is None or end is None:
+            return True
+        if self.earliest_start is not None and start < self.earliest_start:
+            return False
+        if self.latest_end is not None and end > self.latest_end:
+            return False
+        if self.allowed_days is not None and day_mask(section.class_days) & ~self.allowed_days:
+            return False
+        return True
+
+    def build_domains(self, sections):
+        """
+        Options per (course, component) variable
+
+        Returns:
+            dict: {(subject, catalog_num, component): [ScheduleOption, ...]}, an empty list
+            means no section of that component passes the constraints
+        """
+        found = set()
+        domains = {}
+        for section in sections:
+            key = (section.course.subject, section.course.catalog_num.strip())
+            found.add(key)
+            variable = key + (section.component,)
+            options = domains.setdefault(variable, {})
+            if not self._allowed(section):
+                continue
+            mask = slot_mask(section.class_days, section.start_time, section.end_time)
+            options.setdefault(mask, []).append(section)
+
+        self.missing_courses = [f"{s} {c}" for s, c in self.courses if (s, c) not in found]
+
+        # fewest slots first so compact options are tried early
+        return {
+            variable: sorted(
+                (ScheduleOption(mask, same_time) for mask, same_time in by_mask.items()),
+                key=lambda o: o.mask.bit_count()
+            )
+            for variable, by_mask in domains.items()
+        }
+
+    # ------------------ scoring ------------------
+    @staticmethod
+    def score(mask):
+        #Lower is better: an hour per day on campus plus minutes of gaps between classes
+        score = 0
+        for day in range(len(DAYS)):
+            slots = day_slots(mask, day)
+            if not slots:
+                continue
+            first = (slots & -slots).bit_length() - 1
+            last = slots.bit_length() - 1
+            gap_slots = (last - first + 1) - slots.bit_count()
+            score += 60 + gap_slots * SLOT_MINUTES
+        return score
+
+    def _record(self, used, chosen):
+        score = self.score(used)
+        self._counter += 1
+        entry = (-score, self._counter, list(chosen))
+        if len(self._best) < self.limit:
+            heapq.heappush(self._best, entry)
+        elif entry[0] > self._best[0][0]:
+            heapq.heapreplace(self._best, entry)
+
+    def _worst_kept(self):
+        #Score a schedule must beat to make the top N (None until N are found)
+        return -self._best[0][0] if len(self._best) >= self.limit else None
+
+    # ------------------ search ------------------
+    def _search(self, domains, used, used_days, chosen):
+        self.nodes += 1
+        if self.nodes > self.NODE_BUDGET or (not self.nodes & 1023 and time.monotonic() > self._deadline):
+            self.truncated = True
+            return
+        if not domains:
+            self._record(used, chosen)
+            return
+
+        # MRV: branch on the variable with the fewest options left,
+        # trying options that add the fewest new days first
+        variable = min(domains, key=lambda v: len(domains[v]))
+        options = sorted(
+            domains[variable],
+            key=lambda o: ((used_days | o.days).bit_count(), self.score(used | o.mask))
+        )
+        for option in options:
+            new_days = used_days | option.days
+
+            # bound: days on campus never go down and each costs 60, so this branch can't beat the kept ones
+            worst = self._worst_kept()
+            if worst is not None and new_days.bit_count() * 60 >= worst:
+                break
+
+            new_used = used | option.mask
+
+            # forward checking: drop options that clash with the new pick
+            remaining = {}
+            for other, options in domains.items():
+                if other == variable:
+                    continue
+                left = [o for o in options if not o.mask & new_used]
+                if not left:
+                    break
+                remaining[other] = left
+            else:
+                chosen.append(option)
+                self._search(remaining, new_used, new_days, chosen)
+                chosen.pop()
+
+            if self.truncated:
+                return
+
+    def solve(self, domains):
+        """
+        Runs the search over build_domains() output
+
+        Returns:
+            list: the best schedules, each a list of ScheduleOption (one per course component), best first
+        """
+        self.empty_components = [
+            f"{subject} {catalog_num} {component}"
+            for (subject, catalog_num, component), options in domains.items() if not options
+        ]
+        if self.empty_components:
+            return []
+
+        self._deadline = time.monotonic() + self.TIME_BUDGET
+        self._search(domains, 0, 0, [])
+        return [options for _, _, options in sorted(self._best, key=lambda e: (-e[0], e[1]))]
+
+    def generate(self):
+        #Loads the term's sections of the wanted courses and solves (empty when a course isn't offered)
+        domains = self.build_domains(self._load_sections())
+        if self.missing_courses:
+            return []
+        return self.solve(domains)
+
+    @staticmethod
+    def format_schedule(options):
+        used = 0
+        for option in options:
+            used |= option.mask
+        days = "".join(letter for i, letter in enumerate(DAYS) if day_slots(used, i))
+        return {
+            "score": ScheduleGenerator.score(used),
+            "days": days,
+            "sections": [
+                option.sections[0].format(include_course=True, include_instructors=True)
+                for option in options
+            ],
+            # other sections meeting at the same times, any of them can be swapped in
+            "alternatives": {
+                str(option.sections[0].id): [s.id for s in option.sections[1:]]
+                for option in options if len(option.sections) > 1
+            },
+        }
+
@@ -0,0 +1,138 @@
+import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from models.catalog_version import CatalogVersion
+
+
+class MemoryBackend:
+    """In-process LRU store with a per-entry TTL and a bound on the total bytes kept"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()     # key -> (expires_at, value bytes), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self.bytes += len(value)
+            while self.bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self.bytes -= len(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {'backend': 'memory', 'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes}
+
+
+class RedisBackend:
+    """
+    Store shared by every worker in a Redis compatible server (Redis, Valkey, KeyDB, ...)
+
+    Entries expire through the server's TTLs; the byte bound and LRU eviction come from the
+    server's maxmemory / maxmemory-policy allkeys-lru settings.
+    """
+
+    PREFIX = 'search:'
+
+    def __init__(self, url):
+        # optional dependency, only needed when SEARCH_CACHE_URL is set
+        import redis
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get(self.PREFIX + key)
+
+    def set(self, key, value, ttl):
+        self._client.set(self.PREFIX + key, value, px=int(ttl * 1000))
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.PREFIX + '*', count=1000):
+            self._client.delete(key)
+
+    def stats(self):
+        return {'backend': 'redis', 'used_memory': self._client.info('memory').get('used_memory')}
+
+
+class SearchCache:
+    """
+    Caches /courses/search pages by their normalized filters (SearchService.cache_key_filters)
+
+    The catalog version is part of every key, so an ETL run or admin write that bumps it makes
+    every older entry unreachable; the memory backend is also emptied then to free the space.
+    """
+
+    def __init__(self, backend=None, ttl=60, max_entry_bytes=1024 * 1024):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        # pages bigger than this are answered but not stored, so one export can't flush the cache
+        self.max_entry_bytes = max_entry_bytes
+        self._version = None
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def key(self, parts):
+        #Stable key for a dict of normalized filters / paging values under the current catalog version
+        version = CatalogVersion.cached_version()
+        if version != self._version:
+            if self._version is not None and isinstance(self.backend, MemoryBackend):
+                self.backend.clear()
+            self._version = version
+        raw = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+        return f"{version}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def get(self, key):
+        #Cached page (dict) or None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, page):
+        value = json.dumps(page, separators=(',', ':')).encode('utf-8')
+        if len(value) > self.max_entry_bytes:
+            self.skipped += 1
+            return
+        self.backend.set(key, value, self.ttl)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'skipped': self.skipped,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            **self.backend.stats(),
+        }
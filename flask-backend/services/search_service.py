@@ -1,21 +1,173 @@
+import json
+import base64
+from types import SimpleNamespace
 from models.section import Section, section_instructor
 from models.course import Course
 from models.instructor import Instructor
 from models.department import Department
 from models.term import Term
-from sqlalchemy import and_, or_, func
+from models.search_document import SectionSearchDocument
+from models.section_search import SectionSearch
+from services.section_index import LEVEL_RANGES, SectionIndex
+from services.text_search import SectionTextSearch
+from services.meeting_times import days_string, parse_days, parse_minutes, submasks
+from sqlalchemy import and_, or_, case, func, tuple_
 from database import db
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager, selectinload
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+
+def encode_cursor(sort_key):
+    #Opaque keyset cursor for ([-relevance,] subject, catalog_num, section_num, id)
+    raw = json.dumps(list(sort_key), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    #Inverse of encode_cursor, raises ValueError for anything malformed
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(sort_key, list) or len(sort_key) not in (4, 5) or not isinstance(sort_key[-1], int):
+        raise ValueError("Invalid cursor")
+    return tuple(sort_key)
+
+
+# keys of the summary view, in the order the projection selects them
+SUMMARY_KEYS = (
+    "section_id", "course_code", "course_title", "section_num", "days", "start_time", "end_time",
+    "units", "instructor", "status", "room", "component", "instruction_mode", "catalog_num",
+    "enrollment_cap",
+)
+
+
+def ndjson_lines(rows):
+    #Projection rows -> one compact summary JSON object per line
+    return "".join(json.dumps(dict(zip(SUMMARY_KEYS, row)), separators=(',', ':')) + "\n" for row in rows)
+
+
+def table_columns():
+    #Search columns over the normalized tables (joined in _apply_filters), instructor names in a subquery
+    instructor_names = (
+        db.select(func.string_agg(
+            func.concat(Instructor.first_name, ' ', Instructor.last_name),
+            aggregate_order_by(', ', Instructor.id)
+        ))
+        .select_from(section_instructor)
+        .join(Instructor, section_instructor.c.instructor_id == Instructor.id)
+        .where(section_instructor.c.section_id == Section.id)
+        .scalar_subquery()
+    )
+    return SimpleNamespace(
+        section_id=Section.id,
+        term=Term.session_code,
+        subject=Course.subject,
+        catalog_num=Course.catalog_num,
+        catalog_num_int=Course.catalog_num_int,
+        course_code=func.concat(Course.subject, ' ', Course.catalog_num),
+        title=Course.title,
+        units=Course.units,
+        college=Department.college,
+        section_num=Section.section_num,
+        component=Section.component,
+        instruction_mode=Section.instruction_mode,
+        class_days=Section.class_days,
+        days_mask=Section.days_mask,
+        start_time=Section.start_time,
+        end_time=Section.end_time,
+        start_min=Section.start_min,
+        end_min=Section.end_min,
+        class_status=Section.class_status,
+        enrollment_capacity=Section.enrollment_capacity,
+        room_code=Section.room_code,
+        instructor_names=instructor_names,
+    )
+
+
+def view_columns():
+    #The same names read straight off the section_search materialized view
+    return SimpleNamespace(**{
+        column.name: getattr(SectionSearch, column.name) for column in SectionSearch.__table__.columns
+    })
+
+
+def summary_columns(c):
+    #Columns behind SUMMARY_KEYS (labeled with them), rows come back JSON ready
+    return tuple(
+        column.label(key)
+        for key, column in zip(SUMMARY_KEYS, (
+            c.section_id,
+            c.course_code,
+            c.title,
+            c.section_num,
+            c.class_days,
+            func.to_char(c.start_time, 'HH24:MI:SS'),
+            func.to_char(c.end_time, 'HH24:MI:SS'),
+            c.units,
+            func.coalesce(c.instructor_names, 'TBA'),
+            c.class_status,
+            c.room_code,
+            c.component,
+            c.instruction_mode,
+            c.catalog_num,
+            c.enrollment_capacity,
+        ))
+    )
+
+
+# facets counted by get_facets, named after the filter each one feeds
+FACETS = ('subject', 'component', 'instruction_mode', 'status', 'level', 'units')
+
+
+def level_column(catalog_num_int):
+    #catalog_num_int -> the 'level' filter value (1-5), NULL outside every level
+    return case(*[
+        (catalog_num_int >= low if high is None else catalog_num_int.between(low, high), level)
+        for level, (low, high) in LEVEL_RANGES.items()
+    ])
+
+
+def facet_list(counts):
+    #{value: count} -> [{"value", "count"}] in value order, the shape /courses/search/facets returns
+    return [{"value": value, "count": counts[value]} for value in sorted(counts)]
+
 
 class SearchService:
     """Handles complex search operations with multiple criteria"""
 
-    # uncomment this and the limit line in execute search for limited results
-    #DEFAULT_RESULT_LIMIT = 100
+    # page size when the caller pages with a cursor but doesn't give a limit, and the most a caller can ask for
+    # (no limit and no cursor returns every match, the search page doesn't page yet)
+    DEFAULT_RESULT_LIMIT = 100
+    MAX_RESULT_LIMIT = 500
+    # rows per server-side cursor fetch when streaming whole result sets
+    STREAM_BATCH_SIZE = 1000
+
+    # filters matched case-insensitively (ILIKE / full-text) and filters parsed as ints, for cache keys
+    CASE_INSENSITIVE_FILTERS = ('title', 'instructor', 'room', 'search_query')
+    INT_FILTERS = ('units', 'min_units', 'max_units', 'level')
     
-    def __init__(self):
+    def __init__(self, use_index=False, use_full_text=False, use_projection=False, use_view=False, cache=None):
         self.filters = {}
         self.results = []
+        self.limit = self.DEFAULT_RESULT_LIMIT
+        self.next_cursor = None
+        # answer term scoped searches from the in-memory SectionIndex instead of Postgres
+        self.use_index = use_index
+        # match search_query against section_search_document and rank by relevance
+        self.use_full_text = use_full_text
+        # select only the summary columns as plain tuples instead of hydrating Section objects,
+        # results are then rows in SUMMARY_KEYS order (followed by the keyset sort values)
+        self.use_projection = use_projection
+        # filter the denormalized section_search materialized view instead of joining the tables,
+        # implies use_projection
+        self.use_view = use_view
+        self._columns = view_columns() if use_view else table_columns()
+        # SearchCache for execute_search pages (None = always query)
+        self.cache = cache
+        self._cached_rows = None
+        self._index = None
     
     def add_filter(self, filter_name, filter_value):
         #Add a filter to the search query
@@ -26,6 +178,9 @@ class SearchService:
         #Clears all filterse
         self.filters = {}
         self.results = []
+        self.next_cursor = None
+        self._cached_rows = None
+        self._index = None
 
     # url gives raw strings -> need to safely convert int values
     def parse_int(self, value):
@@ -34,98 +189,166 @@ class SearchService:
         except (TypeError, ValueError):
             return None
     
-    def _build_query(self):
-        #Builds the search query based on filters
-        query = (
-            db.session.query(Section)
-            .join(Course, Section.course_id == Course.id)
-            .join(Department, Course.department_id == Department.id)
-            .join(Term, Section.term_id == Term.id)
-            # added eager loading to prevent extra querries
-            .options(
-                joinedload(Section.course),
-                joinedload(Section.instructors)
-            )
-        )
+    def clamp_limit(self, limit):
+        #Page size from a raw query param, bounded to MAX_RESULT_LIMIT
+        limit = self.parse_int(limit)
+        if limit is None or limit < 1:
+            return self.DEFAULT_RESULT_LIMIT
+        return min(limit, self.MAX_RESULT_LIMIT)
+
+    def cache_key_filters(self):
+        """
+        The filters in canonical form, searches that must return the same rows get equal dicts:
+        uppercase subject, day letters in catalog order, ints / times parsed, ILIKE text lowercased
+        and values the query would ignore dropped
+        """
+        canonical = {}
+        for name, value in self.filters.items():
+            if name == 'subject':
+                value = value.upper()
+            elif name in ('days', 'days_only'):
+                value = days_string(parse_days(value))
+            elif name in ('start_after', 'end_before'):
+                value = parse_minutes(value)
+            elif name in self.INT_FILTERS:
+                value = self.parse_int(value)
+            elif name in self.CASE_INSENSITIVE_FILTERS:
+                value = value.lower()
+            if value is not None and value != '':
+                canonical[name] = value
+
+        # the operator only matters next to units, and 'exact' is its default
+        if 'units' not in canonical or canonical.get('units_operator') == 'exact':
+            canonical.pop('units_operator', None)
+        return canonical
+
+    def _sort_columns(self):
+        #Stable keyset order, section id breaks ties (most relevant first for full-text searches)
+        c = self._columns
+        columns = (c.subject, c.catalog_num, c.section_num, c.section_id)
+        if self._use_full_text():
+            _, rank = SectionTextSearch.match(self.filters['search_query'])
+            return (-rank,) + columns
+        return columns
+
+    def _use_index(self):
+        return self.use_index and 'term' in self.filters
+
+    def _use_full_text(self):
+        return self.use_full_text and 'search_query' in self.filters
+
+    def _base(self):
+        return SectionSearch if self.use_view else Section
 
-        # Only join instructor tables when needed for filtering 
-        need_instructor_join = (
-            'instructor' in self.filters or
-            'search_query' in self.filters
+    def _instructor_exists(self, condition):
+        #EXISTS over the section's instructors so a section with several instructors stays a single row
+        return (
+            db.select(section_instructor.c.section_id)
+            .join(Instructor, section_instructor.c.instructor_id == Instructor.id)
+            .where(section_instructor.c.section_id == self._columns.section_id, condition)
+            .exists()
         )
 
-        if need_instructor_join:
-            query = query.outerjoin(
-                section_instructor,
-                Section.id == section_instructor.c.section_id
-            ).outerjoin(
-                Instructor,
-                section_instructor.c.instructor_id == Instructor.id
+    def _apply_filters(self, query):
+        #Adds the joins (none over the section_search view) and WHERE clauses for the current filters
+        c = self._columns
+        if not self.use_view:
+            query = (
+                query
+                .join(Course, Section.course_id == Course.id)
+                .join(Department, Course.department_id == Department.id)
+                .join(Term, Section.term_id == Term.id)
             )
-        
+
         # Add filters dynamically based on what was provided
         if 'subject' in self.filters:
-            query = query.filter(Course.subject == self.filters['subject'].upper())
+            query = query.filter(c.subject == self.filters['subject'].upper())
 
         if 'catalog_num' in self.filters:
-            query = query.filter(Course.catalog_num == self.filters['catalog_num'])
+            query = query.filter(c.catalog_num == self.filters['catalog_num'])
 
         if 'college' in self.filters:
-            query = query.filter(Department.college == self.filters['college'])
+            query = query.filter(c.college == self.filters['college'])
         
-        if 'search_query' in self.filters:
+        # full-text path: precomputed per-section documents (see models/search_document.py)
+        if self._use_full_text():
+            condition, _ = SectionTextSearch.match(self.filters['search_query'])
+            query = query.join(
+                SectionSearchDocument,
+                SectionSearchDocument.section_id == c.section_id
+            ).filter(condition)
+        # ILIKE path: instructor matches use EXISTS so a section with several instructors stays a single row
+        elif 'search_query' in self.filters:
             search_term = f"%{self.filters['search_query']}%"
             split_search_term = self.filters['search_query'].split()
             if len(split_search_term) == 2:
-                query = query.filter( 
-                    or_(
-                            Course.title.ilike(search_term),
-                            and_(
-                                Instructor.first_name.ilike(f"%{split_search_term[0]}%"),
-                                Instructor.last_name.ilike(f"%{split_search_term[-1]}%"),
-                            ),
-                            func.concat(Course.subject, ' ', Course.catalog_num).ilike(search_term)
-                        )
+                instructor_match = self._instructor_exists(
+                    and_(
+                        Instructor.first_name.ilike(f"%{split_search_term[0]}%"),
+                        Instructor.last_name.ilike(f"%{split_search_term[-1]}%"),
+                    )
                 )
-            else:  
-                query = query.filter(
+            else:
+                instructor_match = self._instructor_exists(
                     or_(
-                        Course.title.ilike(search_term),
                         Instructor.first_name.ilike(search_term),
                         Instructor.last_name.ilike(search_term),
-                        func.concat(Course.subject, ' ', Course.catalog_num).ilike(search_term)
                     )
-                )   
+                )
+            query = query.filter(
+                or_(
+                    c.title.ilike(search_term),
+                    instructor_match,
+                    c.course_code.ilike(search_term)
+                )
+            )
+
         if 'title' in self.filters:
-            query = query.filter(Course.title.ilike(f"%{self.filters['title']}%"))
+            query = query.filter(c.title.ilike(f"%{self.filters['title']}%"))
         
         if 'instructor' in self.filters:
             names = self.filters['instructor'].split()
             if len(names) >= 2:
                 query = query.filter(
-                    Instructor.first_name.ilike(f"%{names[0]}%"),
-                    Instructor.last_name.ilike(f"%{names[-1]}%")
+                    self._instructor_exists(
+                        and_(
+                            Instructor.first_name.ilike(f"%{names[0]}%"),
+                            Instructor.last_name.ilike(f"%{names[-1]}%")
+                        )
                     )
+                )
             else:
                 query = query.filter(
-                    or_(
-                        Instructor.first_name.ilike(f"%{names[0]}%"),
-                        Instructor.last_name.ilike(f"%{names[0]}%")
+                    self._instructor_exists(
+                        or_(
+                            Instructor.first_name.ilike(f"%{names[0]}%"),
+                            Instructor.last_name.ilike(f"%{names[0]}%")
+                        )
                     )
                 )
         
-        if 'days' in self.filters:
-            days_filter = self.filters['days']
-            # Build a condition that checks if ANY of the selected days appears in class_days
-            # For example, if user selects "MW", we want to match "MWF", "MW", "M", "W", etc.
-            
-            # Create OR conditions for each day
-            day_conditions = [Section.class_days.ilike(f"%{day}%") for day in days_filter]
-            if day_conditions:
-                query = query.filter(or_(*day_conditions))
+        # Sections meeting on ANY of the selected days, "MW" matches "MWF", "MW", "M", "W", etc.
+        days = parse_days(self.filters.get('days'))
+        if days:
+            query = query.filter(c.days_mask.op('&')(days) != 0)
+
+        # Sections meeting ONLY on the selected days ("MW" matches "M", "W" and "MW" but not "MWF").
+        # Listing the allowed masks (at most 127) keeps it an index lookup on (term_id, days_mask)
+        days_only = parse_days(self.filters.get('days_only'))
+        if days_only:
+            query = query.filter(c.days_mask.in_(list(submasks(days_only))))
+
+        # Time filters only match sections with a meeting time
+        start_after = parse_minutes(self.filters.get('start_after'))
+        if start_after is not None:
+            query = query.filter(c.start_min >= start_after)
+
+        end_before = parse_minutes(self.filters.get('end_before'))
+        if end_before is not None:
+            query = query.filter(c.end_min <= end_before)
         
         if 'term' in self.filters:
-            query = query.filter(Term.session_code == self.filters['term'])
+            query = query.filter(c.term == self.filters['term'])
         
         # Units with operator support
         if 'units' in self.filters:
@@ -135,85 +358,303 @@ class SearchService:
             # ignore this filter if invalid input
             if units_value is not None:
                 if units_operator == 'exact':
-                    query = query.filter(Course.units == units_value)
+                    query = query.filter(c.units == units_value)
                 elif units_operator == 'greater':
-                    query = query.filter(Course.units > units_value)
+                    query = query.filter(c.units > units_value)
                 elif units_operator == 'less':
-                    query = query.filter(Course.units < units_value)
+                    query = query.filter(c.units < units_value)
                 elif units_operator == 'greater_equal':
-                    query = query.filter(Course.units >= units_value)
+                    query = query.filter(c.units >= units_value)
                 elif units_operator == 'less_equal':
-                    query = query.filter(Course.units <= units_value)
+                    query = query.filter(c.units <= units_value)
 
         min_units = self.parse_int(self.filters.get('min_units'))
         if min_units is not None:
-            query = query.filter(Course.units >= min_units)
+            query = query.filter(c.units >= min_units)
 
         max_units = self.parse_int(self.filters.get('max_units'))
         if max_units is not None:
-            query = query.filter(Course.units <= max_units)
+            query = query.filter(c.units <= max_units)
         
         if 'instruction_mode' in self.filters:
-            query = query.filter(Section.instruction_mode == self.filters['instruction_mode'])
+            query = query.filter(c.instruction_mode == self.filters['instruction_mode'])
         
         if 'component' in self.filters:
-            query = query.filter(Section.component == self.filters['component'])
+            query = query.filter(c.component == self.filters['component'])
         
         if 'status' in self.filters:
-            query = query.filter(Section.class_status == self.filters['status'])
+            query = query.filter(c.class_status == self.filters['status'])
         
         if 'course_career' in self.filters:
             grad_level = self.filters['course_career']
             if grad_level == 'Undergraduate':
-                query = query.filter(Course.catalog_num_int < 500)
+                query = query.filter(c.catalog_num_int < 500)
             elif grad_level == 'Graduate':
-                query = query.filter(Course.catalog_num_int > 599)
+                query = query.filter(c.catalog_num_int > 599)
             elif grad_level == 'Medical School':
-                query = query.filter(Course.catalog_num_int > 1000)
+                query = query.filter(c.catalog_num_int > 1000)
         
         level = self.parse_int(self.filters.get('level'))
         if level is not None:
             if level == 1:
-                query = query.filter(and_(Course.catalog_num_int >= 100, Course.catalog_num_int <= 199))
+                query = query.filter(and_(c.catalog_num_int >= 100, c.catalog_num_int <= 199))
             elif level == 2:
-                query = query.filter(and_(Course.catalog_num_int >= 200, Course.catalog_num_int <= 299))
+                query = query.filter(and_(c.catalog_num_int >= 200, c.catalog_num_int <= 299))
             elif level == 3:
-                query = query.filter(and_(Course.catalog_num_int >= 300, Course.catalog_num_int <= 399))
+                query = query.filter(and_(c.catalog_num_int >= 300, c.catalog_num_int <= 399))
             elif level == 4:
-                query = query.filter(and_(Course.catalog_num_int >= 400, Course.catalog_num_int <= 499))
+                query = query.filter(and_(c.catalog_num_int >= 400, c.catalog_num_int <= 499))
             elif level == 5:
-                query = query.filter(Course.catalog_num_int >= 600)
+                query = query.filter(c.catalog_num_int >= 600)
 
         if 'room' in self.filters:
             room_search = self.filters['room']
-            query = query.filter(Section.room_code.ilike(f"%{room_search}%"))
+            query = query.filter(c.room_code.ilike(f"%{room_search}%"))
 
-        # # Order results
-        # query = query.order_by(Course.subject, Course.catalog_num, Section.section_num)
-        
-        # Order results
-        if need_instructor_join:
-            query = (
-                query
-                .order_by(Section.id, Course.subject, Course.catalog_num, Section.section_num)
-                # keep a single section with multiple instructors
-                .distinct(Section.id)
+        return query
+
+    def _build_query(self):
+        #Builds the search query based on filters
+        entities = [Section]
+        if self._use_full_text():
+            # relevance comes back with each row for the next_cursor
+            entities.append(self._sort_columns()[0].label('neg_rank'))
+        return (
+            self._apply_filters(db.session.query(*entities))
+            # course comes from the filter join, instructors in one extra IN query per page
+            .options(
+                contains_eager(Section.course),
+                selectinload(Section.instructors)
             )
-        else:
-            query = query.order_by(Course.subject, Course.catalog_num, Section.section_num)
+            .order_by(*self._sort_columns())
+        )
+    
+    def _build_projection_query(self):
+        #Same filters and order as _build_query, but a Core select of summary columns + subject (+ neg_rank)
+        columns = summary_columns(self._columns) + (self._columns.subject.label('subject'),)
+        if self._use_full_text():
+            columns += (self._sort_columns()[0].label('neg_rank'),)
+        return (
+            self._apply_filters(db.select(*columns).select_from(self._base()))
+            .order_by(*self._sort_columns())
+        )
 
+    def _projection_query_after(self, after):
+        #Projection query starting after a decoded keyset cursor (None = from the start)
+        sort_columns = self._sort_columns()
+        query = self._build_projection_query()
+        if after is not None:
+            if len(after) != len(sort_columns):
+                raise ValueError("Invalid cursor")
+            query = query.where(tuple_(*sort_columns) > tuple_(*after))
         return query
-    
-    def execute_search(self):
-        """Execute the search with current filters"""
+
+    def _fetch_limit(self):
+        # one extra row tells us whether another page exists, None = unpaged
+        return None if self.limit is None else self.limit + 1
+
+    def _has_more(self, rows):
+        return self.limit is not None and len(rows) > self.limit
+
+    def _execute_projection(self, after):
+        ranked = self._use_full_text()
+        query = self._projection_query_after(after)
+
+        # plain tuples, no identity map or relationship loading
+        rows = db.session.execute(query.limit(self._fetch_limit())).all()
+        self.results = rows[:self.limit]
+        if self._has_more(rows):
+            last = self.results[-1]
+            sort_key = (last.subject, last.catalog_num, last.section_num, last.section_id)
+            if ranked:
+                sort_key = (last.neg_rank,) + sort_key
+            self.next_cursor = encode_cursor(sort_key)
+        return self.results
+
+    def execute_search(self, limit=None, cursor=None):
+        """
+        Execute the search with current filters, one keyset page at a time
+
+        Args:
+            limit: page size (raw query param ok), defaults to DEFAULT_RESULT_LIMIT when a cursor
+                is given; with neither limit nor cursor every match is returned in one page
+            cursor (str): next_cursor from the previous page
+
+        Returns:
+            list: results for this page (row tuples when use_projection is set, summary dicts
+            when a cache is set), next_cursor is set if more remain
+        """
+        unpaged = (limit is None or limit == '') and not cursor
+        self.limit = None if unpaged else self.clamp_limit(limit)
+        after = decode_cursor(cursor) if cursor else None
+        self.next_cursor = None
+        self._cached_rows = None
+
+        if self.cache is None:
+            return self._run_search(after)
+
+        key = self.cache.key({
+            'filters': self.cache_key_filters(),
+            'limit': self.limit,
+            'cursor': list(after) if after else None,
+            'full_text': self._use_full_text(),
+        })
+        page = self.cache.get(key)
+        if page is None:
+            self._run_search(after)
+            page = {'sections': self.get_results_as_dict(), 'next_cursor': self.next_cursor}
+            self.cache.set(key, page)
+
+        self.results = self._cached_rows = page['sections']
+        self.next_cursor = page['next_cursor']
+        return self.results
+
+    def _run_search(self, after):
+        #One page from the index, the projection or the ORM query (results + next_cursor)
+        if self._use_index():
+            self._index = SectionIndex.for_term(self.filters['term'])
+            positions = self._index.search(self.filters, self.parse_int)
+            self.results, has_more = self._index.page(positions, after, self.limit)
+            if has_more:
+                self.next_cursor = encode_cursor(self._index.sort_key(self.results[-1]))
+            return self.results
+
+        self._index = None
+        if self.use_projection or self.use_view:
+            return self._execute_projection(after)
+
+        ranked = self._use_full_text()
+        sort_columns = self._sort_columns()
         query = self._build_query()
-        self.results = query.all()
-        #self.results = query.limit(self.DEFAULT_RESULT_LIMIT).all()
+        if after is not None:
+            if len(after) != len(sort_columns):
+                raise ValueError("Invalid cursor")
+            query = query.filter(tuple_(*sort_columns) > tuple_(*after))
+
+        rows = query.limit(self._fetch_limit()).all()
+        page = rows[:self.limit]
+        self.results = [row[0] for row in page] if ranked else page
+        if self._has_more(rows):
+            last = self.results[-1]
+            sort_key = (last.course.subject, last.course.catalog_num, last.section_num, last.id)
+            if ranked:
+                sort_key = (page[-1].neg_rank,) + sort_key
+            self.next_cursor = encode_cursor(sort_key)
 
         return self.results
+
+    def stream_ndjson(self, cursor=None, batch_size=None):
+        """
+        Every matching section as newline delimited JSON, read through a server-side cursor
+
+        Rows are fetched batch_size at a time so memory stays flat however big the result is.
+        The query runs and its first batch is fetched here, before the response starts, so a bad
+        cursor or a failing query still gets an error status. A failure after that can only end
+        the stream, with a last {"error": ...} line.
+
+        Args:
+            cursor (str): optional next_cursor to resume after
+            batch_size (int): rows per fetch and per yielded chunk, defaults to STREAM_BATCH_SIZE
+
+        Returns:
+            generator: str chunks, one summary dict (get_results_as_dict shape) per line
+        """
+        after = decode_cursor(cursor) if cursor else None
+        query = self._projection_query_after(after)
+
+        # own connection, the request's session is closed when the view returns and before the
+        # body is sent; yield_per runs the query on a named (server-side) cursor, batch_size rows a fetch
+        batch_size = batch_size or self.STREAM_BATCH_SIZE
+        conn = db.engine.connect()
+        try:
+            result = conn.execute(query, execution_options={'yield_per': batch_size})
+            partitions = result.partitions(batch_size)
+            first = next(partitions, [])
+        except Exception:
+            conn.close()
+            raise
+        return self._stream_rows(conn, partitions, first)
+
+    @staticmethod
+    def _stream_rows(conn, partitions, first):
+        try:
+            yield ndjson_lines(first)
+            for rows in partitions:
+                yield ndjson_lines(rows)
+        except Exception as e:
+            # the 200 is already sent, tell the client the rows stopped short
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            conn.close()
+
+    def get_total_count(self):
+        """Count every section matching the filters without loading rows"""
+        if self._use_index():
+            return SectionIndex.for_term(self.filters['term']).count(self.filters, self.parse_int)
+
+        query = self._apply_filters(db.select(func.count()).select_from(self._base()))
+        return db.session.execute(query).scalar()
     
+    def get_facets(self):
+        """
+        Result counts per value of every facet for the current filters, in one pass
+
+        Postgres answers it with one GROUPING SETS query (a set per facet plus () for the
+        total), the in-memory index with bitmap intersections.
+
+        Returns:
+            dict: {"total": int, "facets": {facet: [{"value", "count"}, ...]}}
+        """
+        if self._use_index():
+            total, counts = SectionIndex.for_term(self.filters['term']).facets(self.filters, self.parse_int)
+            return {"total": total, "facets": {facet: facet_list(counts[facet]) for facet in FACETS}}
+
+        # label the facet columns in a subquery so GROUPING SETS and grouping() see plain columns
+        c = self._columns
+        matching = self._apply_filters(
+            db.select(
+                c.subject.label('subject'),
+                c.component.label('component'),
+                c.instruction_mode.label('instruction_mode'),
+                c.class_status.label('status'),
+                level_column(c.catalog_num_int).label('level'),
+                c.units.label('units'),
+            ).select_from(self._base())
+        ).subquery()
+        columns = [matching.c[facet] for facet in FACETS]
+
+        rows = db.session.execute(
+            db.select(*columns, func.grouping(*columns), func.count())
+            .group_by(func.grouping_sets(tuple_(), *columns))
+        ).all()
+
+        # grouping() has a 1 bit for every column not in the row's set (first column = highest bit)
+        all_bits = (1 << len(FACETS)) - 1
+        facet_of = {all_bits ^ (1 << (len(FACETS) - 1 - i)): i for i in range(len(FACETS))}
+
+        total = 0
+        counts = {facet: {} for facet in FACETS}
+        for row in rows:
+            grouping, count = row[-2], row[-1]
+            if grouping == all_bits:
+                total = count
+                continue
+            i = facet_of[grouping]
+            if row[i] is not None:
+                counts[FACETS[i]][row[i]] = count
+
+        return {"total": total, "facets": {facet: facet_list(counts[facet]) for facet in FACETS}}
+
     def get_results_as_dict(self):
         """Get search results as list of dictionaries (for summary view)"""
+        if self._cached_rows is not None:
+            return self._cached_rows
+        if self._index is not None:
+            return self._index.rows_as_dict(self.results)
+        if self.use_projection or self.use_view:
+            # zip stops at the summary keys, dropping the trailing sort values
+            return [dict(zip(SUMMARY_KEYS, row)) for row in self.results]
+
         results = []
 
         for s in self.results:
@@ -243,5 +684,5 @@ class SearchService:
         return results
     
     def get_result_count(self):
-        """Get number of results found"""
+        """Get number of results on this page"""
         return len(self.results)
\ No newline at end of file
@@ -0,0 +1,116 @@
+import logging
+import threading
+from database import db
+from models.catalog_version import CatalogVersion
+from models.section_search import SectionSearch
+
+logger = logging.getLogger(__name__)
+
+
+class SearchViewRefresher:
+    """
+    Coalesces section_search refreshes after admin section writes into one background refresh
+
+    A refresh rebuilds the whole view, so writers call schedule() after their commit instead of
+    refreshing in the request: the refresh runs delay seconds later on a timer thread and covers
+    every write scheduled until then. Writes during a running refresh get one more after it, and
+    a failed refresh is retried with exponential backoff until one succeeds. flush() (registered
+    at exit) runs a refresh still owed right away.
+    The catalog version is bumped again once the view is current, so search pages cached from the
+    old view are dropped.
+    """
+
+    RETRY_BASE = 5              # seconds before retrying a failed refresh, doubled every failure
+    RETRY_MAX = 5 * 60
+
+    def __init__(self, app, delay=5.0):
+        self.app = app
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._timer = None
+        self._running = False
+        self._pending = False       # a write since the last successful refresh started
+        self._idle = threading.Event()
+        self._idle.set()
+
+        # statistics (this process)
+        self.scheduled = 0
+        self.refreshes = 0
+        self.failures = 0           # in a row, reset by a successful refresh
+
+    def schedule(self):
+        with self._lock:
+            self.scheduled += 1
+            self._pending = True
+            if not self._running and self._timer is None:
+                self._start_timer(self.delay)
+
+    def _start_timer(self, delay):
+        # caller holds the lock
+        self._timer = threading.Timer(delay, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _retry_delay(self):
+        return min(self.RETRY_BASE * 2 ** (self.failures - 1), self.RETRY_MAX)
+
+    def _run(self):
+        with self._lock:
+            if self._running:
+                return
+            self._timer = None
+            self._running = True
+            self._pending = False       # this refresh covers every write committed before it
+            self._idle.clear()
+        refreshed = False
+        try:
+            self.refresh()
+            refreshed = True
+        except Exception:
+            logger.exception("section_search refresh failed")
+        finally:
+            with self._lock:
+                self._running = False
+                self._idle.set()
+                if refreshed:
+                    self.failures = 0
+                else:
+                    self.failures += 1
+                    self._pending = True
+                if self._pending and self._timer is None:
+                    self._start_timer(self.delay if refreshed else self._retry_delay())
+
+    def refresh(self):
+        #Refreshes the view now, in its own app context and transaction
+        with self.app.app_context():
+            SectionSearch.refresh()
+            CatalogVersion.bump()
+            db.session.commit()
+        self.refreshes += 1
+
+    def flush(self, timeout=60):
+        #Runs a refresh still owed on the calling thread instead of waiting for the timer (shutdown, tests)
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self._idle.wait(timeout)        # a refresh already running finishes first
+
+        with self._lock:
+            if not self._pending or self._running:
+                return
+            self._pending = False
+        try:
+            self.refresh()
+            self.failures = 0
+        except Exception:
+            self._pending = True
+            logger.exception("section_search refresh failed")
+
+    def stats(self):
+        return {
+            'scheduled': self.scheduled,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'pending': self._pending,
+        }
@@ -0,0 +1,227 @@
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from database import db
+from models.section import Section, section_instructor
+from models.course import Course
+from models.term import Term
+from models.instructor import Instructor
+from services.meeting_times import days_string, parse_days
+
+# fields every row needs, same payload keys as POST /admin/sections
+REQUIRED_FIELDS = ['course_id', 'term_id', 'section_num', 'component', 'instruction_mode', 'days',
+                   'start_time', 'end_time', 'combined', 'status', 'capacity', 'room', 'instructors']
+
+TRUE_VALUES = {'true', 't', 'yes', 'y', '1'}
+FALSE_VALUES = {'false', 'f', 'no', 'n', '0'}
+
+
+def split_instructor_name(full_name):
+    #"Jane Ann Doe" -> ("Jane", "Ann Doe"), a single name gets the catalog's "TBA" last name
+    parts = full_name.strip().split(maxsplit=1)
+    return parts[0], parts[1] if len(parts) > 1 else "TBA"
+
+
+def parse_csv(text):
+    #CSV with a header row of the payload keys, instructors separated by ";"
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        row = {key.strip(): value for key, value in row.items() if key}
+        if isinstance(row.get('instructors'), str):
+            row['instructors'] = [name for name in row['instructors'].split(';') if name.strip()]
+        rows.append(row)
+    return rows
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _int(value):
+    if isinstance(value, bool):
+        raise ValueError
+    return int(str(value).strip())
+
+
+def _bool(value):
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError
+
+
+def _time(value):
+    value = str(value).strip()
+    for fmt in ('%H:%M', '%H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            pass
+    raise ValueError
+
+
+class SectionImport:
+    """
+    Creates many sections in one transaction with a handful of set-based statements
+
+    Rows are validated first (fields, course / term ids, duplicates); nothing is written if any
+    row fails. Then instructors are upserted in one statement, sections are inserted in batches
+    and their instructor links after them.
+    """
+
+    MAX_ROWS = 2000
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.errors = []        # [{"row": 1, "error": "..."}], rows numbered from 1
+        self.sections = []      # validated column dicts, in row order
+        self.names = []         # per section, its list of (first_name, last_name)
+
+    def _error(self, row_num, message):
+        self.errors.append({'row': row_num, 'error': message})
+
+    # ------------------ validation ------------------
+    def _parse_row(self, row_num, row):
+        if not isinstance(row, dict):
+            return self._error(row_num, 'Row must be an object')
+
+        instructors = row.get('instructors')
+        if isinstance(instructors, str):
+            instructors = [instructors]
+        missing = [field for field in REQUIRED_FIELDS if field != 'instructors' and _text(row.get(field)) is None]
+        if not isinstance(instructors, list) or not instructors or any(
+            not isinstance(name, str) or not name.strip() for name in instructors
+        ):
+            missing.append('instructors')
+        if missing:
+            return self._error(row_num, f"Missing fields: {', '.join(missing)}")
+
+        try:
+            course_id = _int(row['course_id'])
+            term_id = _int(row['term_id'])
+            capacity = _int(row['capacity'])
+        except ValueError:
+            return self._error(row_num, 'course_id, term_id and capacity must be integers')
+        try:
+            combined = _bool(row['combined'])
+        except ValueError:
+            return self._error(row_num, 'combined must be true or false')
+        try:
+            start_time = _time(row['start_time'])
+            end_time = _time(row['end_time'])
+        except ValueError:
+            return self._error(row_num, 'Times must be HH:MM')
+        if end_time <= start_time:
+            return self._error(row_num, 'end_time must be after start_time')
+
+        class_days = days_string(parse_days(_text(row['days'])))
+        if not class_days:
+            return self._error(row_num, 'Invalid class days')
+
+        self.sections.append({
+            'row': row_num,
+            'course_id': course_id,
+            'term_id': term_id,
+            'section_num': _text(row['section_num']),
+            'component': _text(row['component']),
+            'instruction_mode': _text(row['instruction_mode']),
+            'class_days': class_days,
+            'start_time': start_time,
+            'end_time': end_time,
+            'combined': combined,
+            'class_status': _text(row['status']),
+            'enrollment_capacity': capacity,
+            'room_code': _text(row['room']),
+        })
+        # same name twice on one row is one link
+        self.names.append(list(dict.fromkeys(split_instructor_name(name) for name in instructors)))
+
+    def validate(self):
+        #Fills self.errors, returns True when every row can be inserted
+        if not self.rows:
+            self._error(0, 'No sections given')
+            return False
+        if len(self.rows) > self.MAX_ROWS:
+            self._error(0, f'At most {self.MAX_ROWS} sections per import')
+            return False
+
+        for row_num, row in enumerate(self.rows, start=1):
+            self._parse_row(row_num, row)
+
+        # ---------- course / term ids and existing sections, one query each ----------
+        course_ids = {section['course_id'] for section in self.sections}
+        term_ids = {section['term_id'] for section in self.sections}
+        keys = {(section['course_id'], section['term_id'], section['section_num']) for section in self.sections}
+
+        found_courses = set(db.session.execute(
+            db.select(Course.id).where(Course.id.in_(course_ids))
+        ).scalars()) if course_ids else set()
+        found_terms = set(db.session.execute(
+            db.select(Term.id).where(Term.id.in_(term_ids))
+        ).scalars()) if term_ids else set()
+        existing = set(db.session.execute(
+            db.select(Section.course_id, Section.term_id, Section.section_num)
+            .where(tuple_(Section.course_id, Section.term_id, Section.section_num).in_(keys))
+        ).tuples()) if keys else set()
+
+        seen = set()
+        for section in self.sections:
+            key = (section['course_id'], section['term_id'], section['section_num'])
+            if section['course_id'] not in found_courses:
+                self._error(section['row'], 'Course not found')
+            elif section['term_id'] not in found_terms:
+                self._error(section['row'], 'Term not found')
+            elif key in existing:
+                self._error(section['row'], 'Section already exists')
+            elif key in seen:
+                self._error(section['row'], 'Duplicate section in import')
+            seen.add(key)
+
+        self.errors.sort(key=lambda error: error['row'])
+        return not self.errors
+
+    # ------------------ writing ------------------
+    def _instructor_ids(self):
+        #Upserts every instructor name in one statement, then maps names to ids with one select
+        names = sorted({name for names in self.names for name in names})
+        db.session.execute(
+            insert(Instructor)
+            .values([{'first_name': first, 'last_name': last} for first, last in names])
+            .on_conflict_do_nothing(index_elements=['first_name', 'last_name'])
+        )
+        rows = db.session.execute(
+            db.select(Instructor.id, Instructor.first_name, Instructor.last_name)
+            .where(tuple_(Instructor.first_name, Instructor.last_name).in_(names))
+        ).all()
+        return {(first, last): instructor_id for instructor_id, first, last in rows}
+
+    def insert(self):
+        """
+        Writes the validated sections in the caller's transaction (caller commits)
+
+        Returns:
+            list: the new section ids, in row order
+        """
+        instructor_ids = self._instructor_ids()
+
+        # executemany, sent as multi-row INSERT ... RETURNING batches
+        section_ids = db.session.execute(
+            db.insert(Section).returning(Section.id, sort_by_parameter_order=True),
+            [{key: value for key, value in section.items() if key != 'row'} for section in self.sections]
+        ).scalars().all()
+
+        db.session.execute(section_instructor.insert(), [
+            {'section_id': section_id, 'instructor_id': instructor_ids[name]}
+            for section_id, names in zip(section_ids, self.names)
+            for name in names
+        ])
+        return section_ids
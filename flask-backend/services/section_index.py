@@ -0,0 +1,512 @@
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from database import db
+from models.section import Section, section_instructor
+from models.course import Course
+from models.instructor import Instructor
+from models.department import Department
+from models.term import Term
+from models.catalog_version import CatalogVersion
+from services.meeting_times import DAY_BITS, parse_days, parse_minutes, submasks
+
+# catalog_num_int ranges used by the 'level' filter
+LEVEL_RANGES = {
+    1: (100, 199),
+    2: (200, 299),
+    3: (300, 399),
+    4: (400, 499),
+    5: (600, None),
+}
+
+# fields with an exact match inverted index (filter name -> posting key)
+EXACT_FILTERS = {
+    'subject': 'subject',
+    'catalog_num': 'catalog_num',
+    'college': 'college',
+    'instruction_mode': 'instruction_mode',
+    'component': 'component',
+    'status': 'status',
+}
+
+# SearchService facets answered straight from postings (facet name -> postings field)
+FACET_POSTINGS = {
+    'subject': 'subject',
+    'component': 'component',
+    'instruction_mode': 'instruction_mode',
+    'status': 'status',
+    'units': 'units',
+}
+
+NULL_INT = -1
+
+
+def iter_bits(bitmap):
+    #Yields row positions of set bits in ascending order
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield (byte_index << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+def bitmap_from_positions(positions, size):
+    #Builds a bitmap in one pass instead of OR-ing one bit at a time
+    buffer = bytearray((size + 7) // 8)
+    for pos in positions:
+        buffer[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class SectionIndex:
+    """Columnar in-memory copy of one term's sections answering SearchService filters"""
+
+    # number of terms kept in memory per process
+    MAX_TERMS = 4
+
+    _indexes = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, term, version):
+        self.term = term
+        self.version = version
+        self.size = 0
+
+        # columns (one entry per section, sorted by subject, catalog_num, section_num)
+        self.section_ids = array('i')
+        self.units = array('h')
+        self.catalog_num_int = array('i')
+        self.enrollment_cap = array('i')
+        self.days_mask = array('B')
+        self.subject = []
+        self.catalog_num = []
+        self.title = []
+        self.section_num = []
+        self.class_days = []
+        self.start_time = []
+        self.end_time = []
+        self.status = []
+        self.room = []
+        self.component = []
+        self.instruction_mode = []
+        self.instructor_display = []
+
+        # section id -> row position, used to resume keyset pages
+        self._position_of = {}
+
+        # lowercase copies used for the ILIKE style filters
+        self._title_lower = []
+        self._room_lower = []
+        self._code_lower = []
+        self._instructors_lower = []
+
+        # inverted indexes: field -> value -> bitmap of row positions
+        self.postings = {field: {} for field in EXACT_FILTERS.values()}
+        self.postings['units'] = {}
+        self.postings['catalog_num_int'] = {}
+        self.postings['days_mask'] = {}
+        self.postings['start_min'] = {}
+        self.postings['end_min'] = {}
+        self.day_bitmaps = {letter: [] for letter in DAY_BITS}
+
+    # ------------------ loading ------------------
+    @staticmethod
+    def load(term, version):
+        #Builds the index for one term (session_code) from the database
+        index = SectionIndex(term, version)
+
+        rows = db.session.execute(
+            db.select(
+                Section.id,
+                Course.subject,
+                Course.catalog_num,
+                Course.catalog_num_int,
+                Course.title,
+                Course.units,
+                Department.college,
+                Section.section_num,
+                Section.class_days,
+                Section.start_time,
+                Section.end_time,
+                Section.class_status,
+                Section.room_code,
+                Section.component,
+                Section.instruction_mode,
+                Section.enrollment_capacity,
+                Section.days_mask,
+                Section.start_min,
+                Section.end_min,
+            )
+            .join(Course, Section.course_id == Course.id)
+            .join(Department, Course.department_id == Department.id)
+            .join(Term, Section.term_id == Term.id)
+            .where(Term.session_code == term)
+            .order_by(Course.subject, Course.catalog_num, Section.section_num, Section.id)
+        ).all()
+
+        instructors = {}
+        instructor_rows = db.session.execute(
+            db.select(section_instructor.c.section_id, Instructor.first_name, Instructor.last_name)
+            .join(Instructor, section_instructor.c.instructor_id == Instructor.id)
+            .join(Section, section_instructor.c.section_id == Section.id)
+            .join(Term, Section.term_id == Term.id)
+            .where(Term.session_code == term)
+        ).all()
+        for section_id, first_name, last_name in instructor_rows:
+            instructors.setdefault(section_id, []).append((first_name, last_name))
+
+        for row in rows:
+            index._append(row, instructors.get(row.id, []))
+        index._build_postings()
+
+        return index
+
+    def _append(self, row, instructors):
+        pos = self.size
+        self.size += 1
+
+        self.section_ids.append(row.id)
+        self._position_of[row.id] = pos
+        self.units.append(row.units if row.units is not None else NULL_INT)
+        self.catalog_num_int.append(row.catalog_num_int if row.catalog_num_int is not None else NULL_INT)
+        self.enrollment_cap.append(
+            row.enrollment_capacity if row.enrollment_capacity is not None else NULL_INT
+        )
+        self.days_mask.append(row.days_mask or 0)
+
+        self.subject.append(_intern(row.subject))
+        self.catalog_num.append(_intern(row.catalog_num))
+        self.title.append(_intern(row.title))
+        self.section_num.append(row.section_num)
+        self.class_days.append(_intern(row.class_days))
+        self.start_time.append(_intern(str(row.start_time)) if row.start_time else None)
+        self.end_time.append(_intern(str(row.end_time)) if row.end_time else None)
+        self.status.append(_intern(row.class_status))
+        self.room.append(_intern(row.room_code))
+        self.component.append(_intern(row.component))
+        self.instruction_mode.append(_intern(row.instruction_mode))
+        self.instructor_display.append(
+            ", ".join(f"{first} {last}" for first, last in instructors)
+        )
+
+        self._title_lower.append((row.title or "").lower())
+        self._room_lower.append(row.room_code.lower() if row.room_code else None)
+        self._code_lower.append(f"{row.subject} {row.catalog_num}".lower())
+        self._instructors_lower.append(
+            tuple(((first or "").lower(), (last or "").lower()) for first, last in instructors)
+        )
+
+        values = {
+            'subject': row.subject,
+            'catalog_num': row.catalog_num,
+            'college': row.college,
+            'instruction_mode': row.instruction_mode,
+            'component': row.component,
+            'status': row.class_status,
+            'units': row.units,
+            'catalog_num_int': row.catalog_num_int,
+            'days_mask': row.days_mask,
+            'start_min': row.start_min,
+            'end_min': row.end_min,
+        }
+        for field, value in values.items():
+            if value is not None:
+                self.postings[field].setdefault(value, []).append(pos)
+
+        for letter, bit in DAY_BITS.items():
+            if row.days_mask and row.days_mask & bit:
+                self.day_bitmaps[letter].append(pos)
+
+    def _build_postings(self):
+        #Turns the position lists collected by _append into bitmaps
+        for postings in self.postings.values():
+            for value, positions in postings.items():
+                postings[value] = bitmap_from_positions(positions, self.size)
+        for letter, positions in self.day_bitmaps.items():
+            self.day_bitmaps[letter] = bitmap_from_positions(positions, self.size)
+
+    # ------------------ registry ------------------
+    @staticmethod
+    def for_term(term):
+        #Returns the index for a term, rebuilding it when the catalog version changed
+        version = CatalogVersion.cached_version()
+        indexes = SectionIndex._indexes
+
+        index = indexes.get(term)
+        if index is not None and index.version == version:
+            with SectionIndex._lock:
+                if term in indexes:
+                    indexes.move_to_end(term)
+            return index
+
+        with SectionIndex._lock:
+            index = indexes.get(term)
+            if index is None or index.version != version:
+                index = SectionIndex.load(term, version)
+                indexes[term] = index
+            indexes.move_to_end(term)
+            while len(indexes) > SectionIndex.MAX_TERMS:
+                indexes.popitem(last=False)
+        return index
+
+    @staticmethod
+    def invalidate():
+        #Drops every loaded index in this process
+        with SectionIndex._lock:
+            SectionIndex._indexes.clear()
+
+    # ------------------ querying ------------------
+    def _all(self):
+        return (1 << self.size) - 1
+
+    def _range_bitmap(self, field, low=None, high=None):
+        #OR of the postings whose value falls inside [low, high]
+        bitmap = 0
+        for value, postings in self.postings[field].items():
+            if low is not None and value < low:
+                continue
+            if high is not None and value > high:
+                continue
+            bitmap |= postings
+        return bitmap
+
+    def _values_bitmap(self, field, values):
+        #OR of the postings for each of values
+        bitmap = 0
+        postings = self.postings[field]
+        for value in values:
+            bitmap |= postings.get(value, 0)
+        return bitmap
+
+    def _units_bitmap(self, operator, value):
+        if operator == 'greater':
+            return self._range_bitmap('units', low=value + 1)
+        if operator == 'less':
+            return self._range_bitmap('units', high=value - 1)
+        if operator == 'greater_equal':
+            return self._range_bitmap('units', low=value)
+        if operator == 'less_equal':
+            return self._range_bitmap('units', high=value)
+        if operator == 'exact':
+            return self.postings['units'].get(value, 0)
+        return self._all()
+
+    def _scan(self, bitmap, predicate):
+        #Keeps only the candidate rows matching a per-row predicate
+        return bitmap_from_positions(
+            (pos for pos in iter_bits(bitmap) if predicate(pos)),
+            self.size
+        )
+
+    def _instructor_matches(self, pos, first_part, last_part, require_both):
+        for first, last in self._instructors_lower[pos]:
+            if require_both:
+                if first_part in first and last_part in last:
+                    return True
+            elif first_part in first or first_part in last:
+                return True
+        return False
+
+    def match(self, filters, parse_int):
+        """
+        Evaluates SearchService filters against the index
+
+        Args:
+            filters (dict): SearchService.filters
+            parse_int (callable): SearchService.parse_int
+
+        Returns:
+            int: bitmap of matching row positions
+        """
+        bitmap = self._all()
+
+        # ---------- inverted index intersections ----------
+        for filter_name, field in EXACT_FILTERS.items():
+            if filter_name in filters:
+                value = filters[filter_name]
+                if filter_name == 'subject':
+                    value = value.upper()
+                bitmap &= self.postings[field].get(value, 0)
+
+        days = parse_days(filters.get('days'))
+        if days:
+            days_bitmap = 0
+            for letter, bit in DAY_BITS.items():
+                if days & bit:
+                    days_bitmap |= self.day_bitmaps[letter]
+            bitmap &= days_bitmap
+
+        days_only = parse_days(filters.get('days_only'))
+        if days_only:
+            bitmap &= self._values_bitmap('days_mask', submasks(days_only))
+
+        start_after = parse_minutes(filters.get('start_after'))
+        if start_after is not None:
+            bitmap &= self._range_bitmap('start_min', low=start_after)
+
+        end_before = parse_minutes(filters.get('end_before'))
+        if end_before is not None:
+            bitmap &= self._range_bitmap('end_min', high=end_before)
+
+        if 'units' in filters:
+            units_value = parse_int(filters['units'])
+            if units_value is not None:
+                operator = filters.get('units_operator', 'exact')
+                bitmap &= self._units_bitmap(operator, units_value)
+
+        min_units = parse_int(filters.get('min_units'))
+        max_units = parse_int(filters.get('max_units'))
+        if min_units is not None or max_units is not None:
+            bitmap &= self._range_bitmap('units', low=min_units, high=max_units)
+
+        if 'course_career' in filters:
+            grad_level = filters['course_career']
+            if grad_level == 'Undergraduate':
+                bitmap &= self._range_bitmap('catalog_num_int', high=499)
+            elif grad_level == 'Graduate':
+                bitmap &= self._range_bitmap('catalog_num_int', low=600)
+            elif grad_level == 'Medical School':
+                bitmap &= self._range_bitmap('catalog_num_int', low=1001)
+
+        level = parse_int(filters.get('level'))
+        if level in LEVEL_RANGES:
+            low, high = LEVEL_RANGES[level]
+            bitmap &= self._range_bitmap('catalog_num_int', low=low, high=high)
+
+        # ---------- substring filters, only over the remaining candidates ----------
+        if bitmap and 'title' in filters:
+            title = filters['title'].lower()
+            bitmap = self._scan(bitmap, lambda pos: title in self._title_lower[pos])
+
+        if bitmap and 'room' in filters:
+            room = filters['room'].lower()
+            bitmap = self._scan(
+                bitmap,
+                lambda pos: self._room_lower[pos] is not None and room in self._room_lower[pos]
+            )
+
+        if bitmap and 'instructor' in filters:
+            names = filters['instructor'].lower().split()
+            if names:
+                require_both = len(names) >= 2
+                bitmap = self._scan(
+                    bitmap,
+                    lambda pos: self._instructor_matches(pos, names[0], names[-1], require_both)
+                )
+
+        if bitmap and 'search_query' in filters:
+            search_term = filters['search_query'].lower()
+            words = search_term.split()
+
+            def search_matches(pos):
+                if search_term in self._title_lower[pos] or search_term in self._code_lower[pos]:
+                    return True
+                if len(words) == 2:
+                    return self._instructor_matches(pos, words[0], words[-1], True)
+                return self._instructor_matches(pos, search_term, search_term, False)
+
+            bitmap = self._scan(bitmap, search_matches)
+
+        return bitmap
+
+    def facets(self, filters, parse_int):
+        """
+        Facet counts for SearchService.get_facets, each value's postings ANDed with the matches
+
+        Returns:
+            tuple: (total matches, {facet: {value: count}})
+        """
+        bitmap = self.match(filters, parse_int)
+        counts = {}
+        for facet, field in FACET_POSTINGS.items():
+            counts[facet] = {}
+            for value, postings in self.postings[field].items():
+                count = (postings & bitmap).bit_count()
+                if count:
+                    counts[facet][value] = count
+
+        counts['level'] = {}
+        for level, (low, high) in LEVEL_RANGES.items():
+            count = (self._range_bitmap('catalog_num_int', low=low, high=high) & bitmap).bit_count()
+            if count:
+                counts['level'][level] = count
+
+        return bitmap.bit_count(), counts
+
+    def search(self, filters, parse_int):
+        #Returns matching row positions in result order
+        return list(iter_bits(self.match(filters, parse_int)))
+
+    def count(self, filters, parse_int):
+        #Number of matches without materializing row positions
+        return self.match(filters, parse_int).bit_count()
+
+    # types of sort_key's elements, what a cursor for this index has to hold
+    SORT_KEY_TYPES = (str, str, str, int)
+
+    def sort_key(self, pos):
+        #(subject, catalog_num, section_num, id), the SearchService keyset cursor
+        return (self.subject[pos], self.catalog_num[pos], self.section_num[pos], self.section_ids[pos])
+
+    def page(self, positions, after, limit):
+        """
+        Slices one keyset page out of ascending row positions (limit None = everything after the cursor)
+
+        Returns:
+            tuple: (positions on this page, whether more remain)
+        """
+        start = 0
+        if after is not None:
+            # a ranked full-text cursor or a crafted one can't be compared with this index's keys
+            if len(after) != len(self.SORT_KEY_TYPES) or any(
+                not isinstance(value, kind) or isinstance(value, bool)
+                for value, kind in zip(after, self.SORT_KEY_TYPES)
+            ):
+                raise ValueError("Invalid cursor")
+            pos = self._position_of.get(after[-1])
+            if pos is not None and self.sort_key(pos) == tuple(after):
+                start = bisect_right(positions, pos)
+            else:
+                # cursor row is gone (catalog reloaded), fall back to comparing keys
+                start = next(
+                    (i for i, p in enumerate(positions) if self.sort_key(p) > tuple(after)),
+                    len(positions)
+                )
+        if limit is None:
+            return positions[start:], False
+        page = positions[start:start + limit]
+        return page, start + limit < len(positions)
+
+    def rows_as_dict(self, positions):
+        #Same shape as SearchService.get_results_as_dict
+        results = []
+        for pos in positions:
+            enrollment_cap = self.enrollment_cap[pos]
+            results.append({
+                "section_id": self.section_ids[pos],
+                "course_code": f"{self.subject[pos]} {self.catalog_num[pos]}",
+                "course_title": self.title[pos],
+                "section_num": self.section_num[pos],
+                "days": self.class_days[pos],
+                "start_time": self.start_time[pos],
+                "end_time": self.end_time[pos],
+                "units": self.units[pos] if self.units[pos] != NULL_INT else None,
+                "instructor": self.instructor_display[pos] or "TBA",
+                "status": self.status[pos],
+                "room": self.room[pos],
+                "component": self.component[pos],
+                "instruction_mode": self.instruction_mode[pos],
+                "catalog_num": self.catalog_num[pos],
+                "enrollment_cap": enrollment_cap if enrollment_cap != NULL_INT else None,
+            })
+        return results
+
+    def __repr__(self):
+        return f"SectionIndex(term='{self.term}', sections={self.size}, version={self.version})"
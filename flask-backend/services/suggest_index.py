@@ -0,0 +1,174 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from database import db
+from models.section import Section, section_instructor
+from models.course import Course
+from models.instructor import Instructor
+from models.catalog_version import CatalogVersion
+
+WHITESPACE = re.compile(r"\s+")
+
+# words shorter than this aren't indexed on their own ("i" in "Computer Science I")
+MIN_WORD_LENGTH = 2
+
+
+def normalize(text):
+    #Lowercase with single spaces, the form keys and queries are compared in
+    return WHITESPACE.sub(" ", (text or "").strip().lower())
+
+
+class SuggestIndex:
+    """
+    Typeahead completions for course codes, titles and instructor names, answered from memory
+
+    Every suggestion is stored under a few lowercase keys ("cs 135", "cs135", "computer science i",
+    "science i", ...) in one sorted list, so a prefix is a bisect plus a walk over the matching range.
+    Suggestions are ranked by how many sections they have.
+    """
+
+    MAX_RESULTS = 20
+    DEFAULT_RESULTS = 8
+
+    # prefixes this short match a big part of the list, their answers are memoized per index
+    MEMO_PREFIX_LENGTH = 2
+
+    _current = None
+    _lock = threading.Lock()
+
+    def __init__(self, version):
+        self.version = version
+
+        # suggestions (parallel lists, one entry per course / instructor)
+        self.kinds = []
+        self.values = []
+        self.labels = []
+        self.weights = []
+
+        # sorted (key, suggestion position) pairs and the bare keys for bisect
+        self._keyed = []
+        self._keys = []
+        self._memo = {}
+
+    # ------------------ loading ------------------
+    @staticmethod
+    def load(version):
+        #Builds the index from two grouped queries (courses and instructors with their section counts)
+        index = SuggestIndex(version)
+
+        course_rows = db.session.execute(
+            db.select(Course.subject, Course.catalog_num, Course.title, db.func.count(Section.id))
+            .outerjoin(Section, Section.course_id == Course.id)
+            .group_by(Course.id)
+        ).all()
+        for subject, catalog_num, title, sections in course_rows:
+            code = f"{subject} {catalog_num.strip()}"
+            pos = index._add('course', code, title, sections)
+            index._key(normalize(code), pos)
+            index._key(normalize(f"{subject}{catalog_num.strip()}"), pos)
+            index._key_words(title, pos)
+
+        instructor_rows = db.session.execute(
+            db.select(Instructor.first_name, Instructor.last_name, db.func.count(section_instructor.c.section_id))
+            .outerjoin(section_instructor, section_instructor.c.instructor_id == Instructor.id)
+            .where(Instructor.first_name != 'TBA')
+            .group_by(Instructor.id)
+        ).all()
+        for first_name, last_name, sections in instructor_rows:
+            name = f"{first_name} {last_name}"
+            pos = index._add('instructor', name, f"{sections} sections", sections)
+            index._key_words(name, pos)
+
+        index._keyed.sort()
+        index._keys = [key for key, _ in index._keyed]
+        return index
+
+    def _add(self, kind, value, label, weight):
+        self.kinds.append(kind)
+        self.values.append(value)
+        self.labels.append(label)
+        self.weights.append(weight)
+        return len(self.kinds) - 1
+
+    def _key(self, key, pos):
+        if key:
+            self._keyed.append((key, pos))
+
+    def _key_words(self, text, pos):
+        #One key per word start so "sci" finds "Computer Science I"
+        words = normalize(text).split(" ")
+        for i, word in enumerate(words):
+            if len(word) >= MIN_WORD_LENGTH or i == 0:
+                self._key(" ".join(words[i:]), pos)
+
+    # ------------------ registry ------------------
+    @staticmethod
+    def current():
+        #Returns the index for this process, rebuilding it when the catalog version changed
+        version = CatalogVersion.cached_version()
+        index = SuggestIndex._current
+        if index is not None and index.version == version:
+            return index
+
+        with SuggestIndex._lock:
+            index = SuggestIndex._current
+            if index is None or index.version != version:
+                index = SuggestIndex.load(version)
+                SuggestIndex._current = index
+        return index
+
+    @staticmethod
+    def invalidate():
+        with SuggestIndex._lock:
+            SuggestIndex._current = None
+
+    # ------------------ querying ------------------
+    def _matches(self, prefix):
+        #Positions of every suggestion with a key starting with prefix
+        matches = set()
+        i = bisect_left(self._keys, prefix)
+        keys = self._keys
+        while i < len(keys) and keys[i].startswith(prefix):
+            matches.add(self._keyed[i][1])
+            i += 1
+        return matches
+
+    def _top(self, prefix, limit):
+        matches = self._matches(prefix)
+        return heapq.nsmallest(limit, matches, key=lambda pos: (-self.weights[pos], self.values[pos]))
+
+    def suggest(self, query, limit=None):
+        """
+        Top completions for what the user has typed so far
+
+        Args:
+            query (str): raw text, case and extra spaces don't matter
+            limit: number of suggestions, defaults to DEFAULT_RESULTS (at most MAX_RESULTS)
+
+        Returns:
+            list: [{"type": "course" | "instructor", "value", "label"}, ...] most sections first
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        try:
+            limit = max(1, min(int(limit or self.DEFAULT_RESULTS), self.MAX_RESULTS))
+        except (TypeError, ValueError):
+            limit = self.DEFAULT_RESULTS
+
+        if len(prefix) <= self.MEMO_PREFIX_LENGTH:
+            top = self._memo.get(prefix)
+            if top is None:
+                top = self._memo[prefix] = self._top(prefix, self.MAX_RESULTS)
+            top = top[:limit]
+        else:
+            top = self._top(prefix, limit)
+
+        return [
+            {"type": self.kinds[pos], "value": self.values[pos], "label": self.labels[pos]}
+            for pos in top
+        ]
+
+    def __repr__(self):
+        return f"SuggestIndex(suggestions={len(self.kinds)}, keys={len(self._keys)}, version={self.version})"
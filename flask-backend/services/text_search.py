@@ -0,0 +1,59 @@
+import re
+from sqlalchemy import or_, func, cast, literal, text
+from database import db
+from models.search_document import SectionSearchDocument
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def prefix_tsquery(search_query):
+    #"cs 13" -> "cs:* & 13:*" so every word matches as a prefix (typeahead)
+    tokens = TOKEN_PATTERN.findall(search_query.lower())
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+class SectionTextSearch:
+    """Free-text section search backed by the tsvector / pg_trgm indexed section_search_document table"""
+
+    @staticmethod
+    def match(search_query):
+        """
+        Builds the match condition and relevance for a search_query
+
+        Args:
+            search_query (str): raw text typed by the user
+
+        Returns:
+            tuple: (condition, rank) expressions over SectionSearchDocument,
+                   rank is a float where higher means more relevant
+        """
+        document = SectionSearchDocument.document
+        # substring fallback keeps mid-word matches working, the trigram GIN index serves it
+        conditions = [SectionSearchDocument.search_text.ilike(f"%{search_query}%")]
+        rank = literal(0.0)
+
+        tsquery_text = prefix_tsquery(search_query)
+        if tsquery_text:
+            tsquery = func.to_tsquery('simple', tsquery_text)
+            conditions.insert(0, document.op('@@')(tsquery))
+            rank = func.ts_rank_cd(document, tsquery)
+
+        # float8 so the value survives a round trip through the keyset cursor
+        return or_(*conditions), cast(rank, db.Float(precision=53))
+
+    @staticmethod
+    def available():
+        #True once schema.sql's full-text objects exist, whether or not searches use them yet
+        return db.session.execute(text("SELECT to_regproc('refresh_section_search_document') IS NOT NULL")).scalar()
+
+    @staticmethod
+    def refresh(section_ids=None):
+        #Rebuilds documents for the given sections (all when None), caller commits; no-op without the schema objects
+        if not SectionTextSearch.available():
+            return
+        db.session.execute(
+            text("SELECT refresh_section_search_document(:section_ids)"),
+            {'section_ids': list(section_ids) if section_ids is not None else None}
+        )
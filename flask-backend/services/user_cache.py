@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from database import db
+from models.user import User
+
+
+class CachedUser:
+    """
+    The fields auth decisions need, standing in for User as Flask-Login's current_user
+
+    Implements the Flask-Login user interface itself (UserMixin has no __slots__).
+    Anything else (password, planned_sections, ...) has to be loaded from User by id.
+    """
+
+    __slots__ = ('id', 'email', 'first_name', 'last_name', 'role', 'is_verified', 'expires_at')
+
+    FIELDS = ('id', 'email', 'first_name', 'last_name', 'role', 'is_verified')
+
+    def __init__(self, id, email, first_name, last_name, role, is_verified, expires_at=0.0):
+        self.id = id
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+        self.role = role
+        self.is_verified = is_verified
+        self.expires_at = expires_at
+
+    # ------------------ Flask-Login interface ------------------
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_active(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def get_id(self):
+        return str(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, CachedUser) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f'<CachedUser {self.email}>'
+
+
+class UserCache:
+    """
+    Short lived, size bounded cache of CachedUser records by user id for Flask-Login's user_loader
+
+    Entries are dropped explicitly when a user's auth fields change in this process (verification,
+    login, logout, role changes); the TTL bounds how long other worker processes can see old values.
+    """
+
+    def __init__(self, ttl=30, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()      # user id -> CachedUser, least recently used first
+        self._lock = threading.Lock()
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def load(user_id):
+        #One row of just the cached columns, no ORM instance
+        row = db.session.execute(
+            db.select(*(getattr(User, field) for field in CachedUser.FIELDS)).where(User.id == user_id)
+        ).one_or_none()
+        return CachedUser(*row) if row is not None else None
+
+    def get(self, user_id):
+        #CachedUser for user_id, or None when the user doesn't exist
+        now = time.monotonic()
+        with self._lock:
+            user = self._entries.get(user_id)
+            if user is not None and user.expires_at > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return user
+
+        self.misses += 1
+        user = self.load(user_id)
+        if user is None or self.ttl <= 0:
+            return user
+
+        user.expires_at = now + self.ttl
+        with self._lock:
+            self._entries[user_id] = user
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'entries': len(self._entries),
+            'max_size': self.max_size,
+        }
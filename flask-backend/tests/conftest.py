@@ -0,0 +1,44 @@
+# tests/conftest.py
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app import app as flask_app, db
+from models.user import User
+
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with flask_app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _cleanup_test_user(email):
+    with flask_app.app_context():
+        user = db.session.execute(
+            db.select(User).filter_by(email=email)
+        ).scalar_one_or_none()
+        if user:
+            db.session.delete(user)
+            db.session.commit()
+
+
+@pytest.fixture
+def count_queries():
+    #with count_queries() as statements: collects every SQL statement sent in the block, len() is the round trip count
+    return _count_queries
+
+
+@pytest.fixture
+def cleanup_test_user():
+    #cleanup_test_user(email) deletes that user (and their planner rows) if they exist
+    return _cleanup_test_user
@@ -0,0 +1,30 @@
+# tests/test_catalog_version.py
+from app import app as flask_app, db
+from models.catalog_version import CatalogVersion
+
+#Test the cached version only moves once the bump is committed
+def test_bump_refreshes_after_commit():
+    with flask_app.app_context():
+        before = CatalogVersion.cached_version()
+
+        new_version = CatalogVersion.bump()
+        assert CatalogVersion.cached_version() == before     # not committed yet, nothing re-read
+
+        db.session.commit()
+        assert CatalogVersion.cached_version() == new_version
+
+#Test a rolled back bump leaves the cached version alone
+def test_rolled_back_bump_is_ignored():
+    with flask_app.app_context():
+        before = CatalogVersion.cached_version()
+        CatalogVersion.bump()
+        db.session.rollback()
+
+        assert 'catalog_version_bumped' not in db.session.info
+        assert CatalogVersion.get_current() == before
+        assert CatalogVersion.cached_version() == before
+
+#Test new rows get their own updated_at instead of one fixed at import
+def test_updated_at_default_is_per_insert():
+    column = CatalogVersion.__table__.c.updated_at
+    assert column.default.is_callable
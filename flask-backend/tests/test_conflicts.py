@@ -0,0 +1,55 @@
+# tests/test_conflicts.py
+from datetime import date, time
+from types import SimpleNamespace
+from services.conflict_service import ConflictService
+
+
+FALL = SimpleNamespace(start_date=date(2025, 8, 25), end_date=date(2025, 12, 9))
+FIRST_HALF = SimpleNamespace(start_date=date(2025, 8, 25), end_date=date(2025, 10, 15))
+SECOND_HALF = SimpleNamespace(start_date=date(2025, 10, 20), end_date=date(2025, 12, 9))
+
+
+def section(section_id, days, start, end, term=FALL):
+    return SimpleNamespace(
+        id=section_id,
+        class_days=days,
+        start_time=time(*start) if start else None,
+        end_time=time(*end) if end else None,
+        term=term,
+    )
+
+#Test overlapping times on a shared day conflict, back to back ones don't
+def test_find_conflicts_pairs():
+    sections = [
+        section(1, 'MWF', (9, 0), (9, 50)),
+        section(2, 'W', (9, 30), (10, 45)),
+        section(3, 'MWF', (9, 50), (10, 40)),     # starts when 1 ends
+        section(4, 'TR', (9, 0), (10, 15)),
+        section(5, None, None, None),             # TBA
+    ]
+
+    assert ConflictService.find_conflicts(sections) == [(1, 2), (2, 3)]
+
+#Test sessions that don't overlap in dates never conflict
+def test_find_conflicts_respects_term_dates():
+    sections = [
+        section(1, 'TR', (13, 0), (14, 15), FIRST_HALF),
+        section(2, 'TR', (13, 0), (14, 15), SECOND_HALF),
+        section(3, 'R', (14, 0), (15, 0), FALL),
+    ]
+
+    assert ConflictService.find_conflicts(sections) == [(1, 3), (2, 3)]
+
+#Test chained pairs merge into one group
+def test_conflict_groups():
+    assert ConflictService.conflict_groups([(1, 2), (2, 3), (7, 9)]) == [[1, 2, 3], [7, 9]]
+
+#Test candidate check only reports sections it overlaps
+def test_check_candidate():
+    planned = [
+        section(1, 'MW', (10, 0), (11, 15)),
+        section(2, 'TR', (10, 0), (11, 15)),
+    ]
+
+    assert ConflictService.check_candidate(section(3, 'M', (11, 0), (12, 0)), planned) == [1]
+    assert ConflictService.check_candidate(section(4, 'F', (11, 0), (12, 0)), planned) == []
@@ -0,0 +1,110 @@
+# tests/test_connection_pool.py
+import time
+import psycopg2
+import pytest
+from sqlalchemy import create_engine
+from config import Config
+from dbconnect.connection import DatabaseConnection
+from dbconnect.pool import ConnectionPool, PoolTimeout
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def build(**options):
+        pool = ConnectionPool(Config.get_db_url(), **options)
+        pools.append(pool)
+        return pool
+
+    yield build
+    for pool in pools:
+        pool.close_all()
+
+
+def backend_pid(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid();")
+        pid = cur.fetchone()[0]
+    conn.rollback()
+    return pid
+
+#Test a returned connection is reused and left without an open transaction
+def test_checkout_and_return(make_pool):
+    pool = make_pool(min_size=0, max_size=2)
+    conn = pool.getconn()
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1;")    # opens a transaction that putconn has to roll back
+    assert pool.stats()['in_use'] == 1
+
+    pool.putconn(conn)
+    assert conn.status == psycopg2.extensions.STATUS_READY
+    stats = pool.stats()
+    assert (stats['in_use'], stats['idle'], stats['size']) == (0, 1, 1)
+
+    with pool.connection() as again:
+        assert again is conn
+    assert pool.stats()['checkouts'] == 2
+
+#Test checkout gives up after the timeout when every connection is in use
+def test_checkout_timeout(make_pool):
+    pool = make_pool(min_size=0, max_size=1, timeout=0.1)
+    conn = pool.getconn()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    pool.putconn(conn)
+    assert pool.stats()['timeouts'] == 1
+
+#Test a connection the server dropped fails the pre-ping and is replaced
+def test_pre_ping_evicts_dead_connection(make_pool):
+    pool = make_pool(min_size=0, max_size=2, check_idle_after=0)
+    conn = pool.getconn()
+    pid = backend_pid(conn)
+    pool.putconn(conn)
+
+    with DatabaseConnection.connection() as admin:
+        with admin.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(%s);", [pid])
+        admin.commit()
+    time.sleep(0.1)
+
+    with pool.connection() as fresh:
+        assert fresh is not conn
+        assert backend_pid(fresh) != pid
+    stats = pool.stats()
+    assert stats['failed_health_checks'] == 1 and stats['size'] == 1
+
+#Test connections older than max_lifetime are closed, on return and when idle
+def test_max_lifetime_recycling(make_pool):
+    pool = make_pool(min_size=0, max_size=2, max_lifetime=0.2)
+
+    conn = pool.getconn()
+    time.sleep(0.25)
+    pool.putconn(conn)
+    assert conn.closed
+    assert (pool.stats()['recycled'], pool.stats()['size']) == (1, 0)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+    time.sleep(0.25)
+    with pool.connection() as fresh:
+        assert fresh is not conn
+    assert conn.closed
+    assert pool.stats()['recycled'] == 2
+
+#Test pool_stats reports the shared pool's checkouts
+def test_pool_stats():
+    before = DatabaseConnection.pool_stats()
+    assert DatabaseConnection.execute_single("SELECT 1;") == (1,)
+    after = DatabaseConnection.pool_stats()
+
+    assert after['checkouts'] == before['checkouts'] + 1
+    assert after['in_use'] == 0
+    assert set(after) >= {'size', 'idle', 'waiting', 'timeouts', 'recycled', 'avg_checkout_ms', 'max_checkout_ms'}
+
+#Test sqlite URLs get engine options their pool accepts
+def test_engine_options_for_sqlite():
+    options = Config.get_engine_options('sqlite://')
+    assert 'pool_size' not in options
+    create_engine('sqlite://', **options).connect().close()
+    assert Config.get_engine_options('postgresql://localhost/ncs')['max_overflow'] == 0
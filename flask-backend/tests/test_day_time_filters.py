@@ -0,0 +1,46 @@
+# tests/test_day_time_filters.py
+import pytest
+from app import app as flask_app
+from services.meeting_times import DAY_BITS, days_string, minute_of_day, parse_days
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    with flask_app.test_client() as client:
+        yield client
+
+
+def search(client, query):
+    return client.get(f'/courses/search?limit=500&{query}').get_json()['sections']
+
+#Test day filter parsing, two letter abbreviations only when the second letter is lowercase
+def test_parse_days():
+    assert parse_days('MW') == DAY_BITS['M'] | DAY_BITS['W']
+    assert parse_days('tr') == parse_days('TR')
+    assert parse_days('M, Tu, Th') == parse_days('MTR')
+    assert parse_days('TU') == DAY_BITS['T'] | DAY_BITS['U']
+    assert parse_days('NaN') == 0
+    assert days_string(parse_days('Su Sa M')) == 'MSU'
+
+#Test days_only keeps sections meeting on no other day
+def test_days_only_filter(client):
+    sections = search(client, 'days_only=MW')
+
+    assert sections
+    assert {s['days'] for s in sections} <= {'M', 'W', 'MW'}
+
+#Test days matches any of the days, including Th for Thursday
+def test_days_any_filter(client):
+    sections = search(client, 'days=Th')
+
+    assert sections
+    assert all('R' in s['days'] for s in sections)
+
+#Test start_after / end_before bound the meeting times
+def test_time_filters(client):
+    sections = search(client, 'start_after=10:00&end_before=13:00')
+
+    assert sections
+    assert all(minute_of_day(s['start_time']) >= 600 for s in sections)
+    assert all(minute_of_day(s['end_time']) <= 780 for s in sections)
@@ -0,0 +1,194 @@
+# tests/test_etl_pipeline.py
+import os
+import sys
+import pandas as pd
+import psycopg2
+import pytest
+from config import Config
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ETL"))
+from etl_pipeline import (extract_excel, iter_excel_chunks, transform_data, fill_instructor_names,
+                          load_to_db_bulk, load_to_db_incremental, refresh_search_view, bump_catalog_version,
+                          find_workbooks, parse_args)
+import etl_pipeline
+
+# a made up term / subject / instructors, so loads never touch the real catalog
+YEAR = 2099
+SUBJECT = "ZZT"
+DEPARTMENT = "ZZT00"
+
+
+def schedule_row(catalog, section, capacity, first_name="Zeta", last_name="Tester", days="MWF", start=9.0, end=9.5):
+    # one raw workbook row, same columns as the master schedule export
+    return {
+        "College": "ZZC", "Acad Org": DEPARTMENT, "Subject": SUBJECT, "Catalog": catalog, "Section": section,
+        "Title": f"Test Course {catalog}", "Component": "LEC", "Session": "1", "Class Nbr": 1,
+        "Instruction Mode": "P", "Class Days": days, "Class Start Time": start, "Class End Time": end,
+        "Start Date": pd.Timestamp(f"{YEAR}-08-25"), "End Date": pd.Timestamp(f"{YEAR}-12-12"),
+        "Room": "ZZ 101", "Instructor Last Name": last_name, "Instructor First Name": first_name,
+        "Room Capacity": 0, "Enrollment Capacity": capacity, "Current Enrollment": 0,
+        "Waitlist Capacity": 0, "Waitlist Total": 0, "Combined?": "No", "Class Stat": "A",
+        "Prgrss Unt": 3, "Acad Group": 1,
+    }
+
+
+def schedule_rows():
+    return [
+        schedule_row(101, 1001, 30),
+        schedule_row(101, 1001, 30, first_name="Eta", last_name="Tester"),     # second instructor
+        schedule_row(101, 1002, None, days="TR", start=13.0, end=14.15),       # blank capacity
+        schedule_row(202, 1001, 45, days="TR"),
+    ]
+
+
+def schedule(rows):
+    df = pd.DataFrame(rows)
+    df["year"] = YEAR
+    return fill_instructor_names(transform_data(df))
+
+
+@pytest.fixture
+def conn():
+    conn = psycopg2.connect(Config.get_db_url())
+    yield conn
+    conn.rollback()
+    with conn.cursor() as cur:
+        # courses, sections and instructor links cascade from the department / term
+        cur.execute("DELETE FROM department WHERE department_code = %s;", (DEPARTMENT,))
+        cur.execute("DELETE FROM term WHERE year = %s;", (YEAR,))
+        cur.execute("DELETE FROM instructor WHERE last_name = 'Tester';")
+        # the loads refreshed the search view / bumped the version with the test rows in, do it again without them
+        refresh_search_view(cur)
+        bump_catalog_version(cur)
+    conn.commit()
+    conn.close()
+
+
+def loaded_sections(conn):
+    #section_num -> (catalog_num, enrollment_capacity, row version), for the test term
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT c.catalog_num, s.section_num, s.enrollment_capacity, s.xmin::text
+            FROM section s
+            JOIN course c ON c.id = s.course_id
+            JOIN term t ON t.id = s.term_id
+            WHERE t.year = %s
+        """, (YEAR,))
+        rows = {(catalog, section): (capacity, version) for catalog, section, capacity, version in cur.fetchall()}
+    conn.rollback()
+    return rows
+
+
+def write_workbook(path, rows):
+    # header on the 2nd row like the real export, the year comes from the file name
+    pd.DataFrame(rows).to_excel(path, startrow=1, index=False)
+    return str(path)
+
+
+def catalog_version(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT version FROM catalog_version WHERE id = 1;")
+        version = cur.fetchone()[0]
+    conn.rollback()
+    return version
+
+#Test enrollment capacity is an integer column, blanks NULL, so COPY never gets "45.0" / "nan"
+def test_transform_capacity_is_nullable_int():
+    capacity = schedule(schedule_rows())["enrollment_capacity"]
+    assert str(capacity.dtype) == "Int64"
+    assert capacity.isna().tolist() == [False, False, True, False]
+
+#Test a bulk load of a chunk with a blank capacity
+def test_bulk_load_blank_capacity(conn):
+    load_to_db_bulk(schedule(schedule_rows()), conn)
+
+    capacities = {key: capacity for key, (capacity, _) in loaded_sections(conn).items()}
+    assert capacities == {("101", "1001"): 30, ("101", "1002"): None, ("202", "1001"): 45}
+
+#Test a full load then a rerun of the same schedule writes nothing
+def test_incremental_rerun_writes_nothing(conn):
+    first = load_to_db_incremental(schedule(schedule_rows()), conn)
+    assert first == {"inserted": 3, "updated": 0, "unchanged": 0, "deleted": 0}
+    sections = loaded_sections(conn)
+    version = catalog_version(conn)
+
+    rerun = load_to_db_incremental(schedule(schedule_rows()), conn)
+    assert rerun == {"inserted": 0, "updated": 0, "unchanged": 3, "deleted": 0}
+    assert loaded_sections(conn) == sections        # same row versions, no section was rewritten
+    assert catalog_version(conn) == version         # app caches are kept
+
+#Test an incremental run with one section changed and one removed from the file
+def test_incremental_change_and_remove(conn):
+    load_to_db_incremental(schedule(schedule_rows()), conn)
+    before = loaded_sections(conn)
+    version = catalog_version(conn)
+
+    rows = schedule_rows()
+    rows[3] = schedule_row(202, 1001, 60, days="TR")     # capacity 45 -> 60
+    del rows[2]                                          # 101-1002 dropped from the file
+    summary = load_to_db_incremental(schedule(rows), conn)
+    assert summary == {"inserted": 0, "updated": 1, "unchanged": 1, "deleted": 1}
+
+    after = loaded_sections(conn)
+    assert set(after) == {("101", "1001"), ("202", "1001")}
+    assert after[("101", "1001")] == before[("101", "1001")]
+    assert after[("202", "1001")][0] == 60
+    assert catalog_version(conn) == version + 1
+
+#Test reading a workbook in chunks gives the same rows as reading it whole, sections never split
+def test_chunked_read_matches_full_read(tmp_path):
+    rows = schedule_rows() + [schedule_row(303, 1001 + i, 20 + i) for i in range(5)]
+    workbook = write_workbook(tmp_path / f"Test {YEAR} Schedule.xlsx", rows)
+
+    chunks = list(iter_excel_chunks(workbook, chunksize=1))
+    assert [len(chunk) for chunk in chunks] == [2, 1, 1, 1, 1, 1, 1, 1]   # 101-1001's two instructors stay together
+
+    chunked = transform_data(pd.concat(chunks, ignore_index=True))
+    full = transform_data(extract_excel(workbook))
+    pd.testing.assert_frame_equal(chunked, full)
+
+#Test command line defaults, environment defaults and overrides
+def test_parse_args(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql:///from_env")
+    monkeypatch.delenv("ETL_LOAD_MODE", raising=False)
+    monkeypatch.delenv("ETL_CHUNKSIZE", raising=False)
+
+    args = parse_args(["a.xlsx", "folder"])
+    assert args.paths == ["a.xlsx", "folder"]
+    assert (args.mode, args.workers, args.chunksize) == ("bulk", None, None)
+    assert args.database_url == "postgresql:///from_env"
+
+    monkeypatch.setenv("ETL_LOAD_MODE", "incremental")
+    monkeypatch.setenv("ETL_CHUNKSIZE", "500")
+    args = parse_args(["a.xlsx", "--workers", "4", "--database-url", "postgresql:///given"])
+    assert (args.mode, args.workers, args.chunksize) == ("incremental", 4, 500)
+    assert args.database_url == "postgresql:///given"
+
+#Test bad command lines exit with a usage error
+@pytest.mark.parametrize("argv", [
+    [],                                             # no workbooks
+    ["a.xlsx", "--mode", "fast"],                   # unknown mode
+    ["a.xlsx", "--chunksize", "many"],              # not a number
+    ["a.xlsx", "--mode", "batch", "--chunksize", "500"],    # batch can't stream
+])
+def test_parse_args_errors(monkeypatch, argv):
+    monkeypatch.setenv("DATABASE_URL", "postgresql:///from_env")
+    monkeypatch.delenv("ETL_CHUNKSIZE", raising=False)
+    with pytest.raises(SystemExit) as error:
+        parse_args(argv)
+    assert error.value.code == 2
+
+#Test a missing database url is a usage error, not a connection failure later
+def test_parse_args_needs_database_url(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(etl_pipeline, "load_dotenv", lambda: None)     # ignore a developer's .env
+    with pytest.raises(SystemExit):
+        parse_args(["a.xlsx"])
+
+#Test folders expand to their workbooks, excel lock files skipped
+def test_find_workbooks(tmp_path):
+    for name in ["b 2099.xlsx", "a 2099.xlsx", "~$a 2099.xlsx", "notes.txt"]:
+        (tmp_path / name).touch()
+    assert find_workbooks([str(tmp_path), "other 2098.xlsx"]) == [
+        str(tmp_path / "a 2099.xlsx"), str(tmp_path / "b 2099.xlsx"), "other 2098.xlsx"
+    ]
@@ -0,0 +1,52 @@
+# tests/test_facets.py
+import pytest
+from app import app as flask_app
+from services.search_service import FACETS, SearchService
+from services.section_index import SectionIndex
+
+
+TEST_TERM = '1'  # session code that always exists
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    with flask_app.test_client() as client:
+        yield client
+
+
+def facets_for(filters, use_index):
+    search = SearchService(use_index=use_index)
+    for name, value in filters.items():
+        search.add_filter(name, value)
+    return search.get_facets()
+
+#Test every facet comes back and the total agrees with /courses/search/count
+def test_facets_endpoint(client):
+    data = client.get('/courses/search/facets?subject=CS').get_json()
+    count = client.get('/courses/search/count?subject=CS').get_json()
+
+    assert data['status'] == 'success'
+    assert set(data['facets']) == set(FACETS)
+    assert data['total'] == count['total']
+    assert sum(f['count'] for f in data['facets']['subject']) == data['total']
+
+#Test a facet count equals the total after applying that value as a filter
+def test_facet_count_matches_filtered_total(client):
+    data = client.get(f'/courses/search/facets?term={TEST_TERM}').get_json()
+    component = data['facets']['component'][0]
+    level = data['facets']['level'][0]
+
+    filtered = client.get(f"/courses/search/count?term={TEST_TERM}&component={component['value']}").get_json()
+    by_level = client.get(f"/courses/search/count?term={TEST_TERM}&level={level['value']}").get_json()
+
+    assert filtered['total'] == component['count']
+    assert by_level['total'] == level['count']
+
+#Test index facets match the GROUPING SETS query
+@pytest.mark.parametrize('filters', [{}, {'subject': 'CS'}, {'days': 'MW', 'status': 'A'}])
+def test_index_facets_match_database(filters):
+    filters = dict(filters, term=TEST_TERM)
+    with flask_app.app_context():
+        SectionIndex.invalidate()
+        assert facets_for(filters, use_index=True) == facets_for(filters, use_index=False)
@@ -0,0 +1,165 @@
+# tests/test_mail_queue.py
+import time
+import pytest
+from flask_mail import Message
+import app as app_module
+from app import app as flask_app, db
+from models.user import User
+from services.mail_queue import FileSink, MailQueue, MailSpool
+
+
+TEST_EMAIL = 'mailqueuetest@gmail.com'
+
+
+class FlakySink:
+    #Fails the first `failures` sends, then records what it sent
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+        self.closed = 0
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('smtp down')
+        self.sent.append(message)
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return MailSpool(str(tmp_path / 'spool.sqlite3'))
+
+
+def message(to='student@unr.edu'):
+    msg = Message('Verify your NCS email', recipients=[to], sender='ncs@unr.edu')
+    msg.body = 'Click the link'
+    return msg
+
+#Test queued mail survives in the spool until a sink takes it
+def test_drain_to_file_sink(spool, tmp_path):
+    queue = MailQueue(spool, lambda: FileSink(str(tmp_path / 'mail.txt')))
+    spool.add(['a@unr.edu'], 'First', 'one')
+    spool.add(['b@unr.edu', 'c@unr.edu'], 'Second', 'two')
+    assert spool.stats()['queued'] == 2
+
+    queue.drain()
+
+    text = (tmp_path / 'mail.txt').read_text()
+    assert 'Subject: First' in text and 'To: b@unr.edu, c@unr.edu' in text
+    assert spool.stats()['queued'] == 0
+    assert queue.sent == 2
+
+#Test failed sends back off exponentially and end up dead
+def test_retry_with_backoff(spool):
+    spool.MAX_ATTEMPTS = 2
+    sink = FlakySink(failures=2)
+    queue = MailQueue(spool, lambda: sink)
+    message_id = spool.add(['a@unr.edu'], 'Hi', 'body')
+
+    before = time.time()
+    queue.drain(sink)
+    assert sink.sent == [] and sink.closed >= 1
+    assert spool.claim(10) == []    # not due until the backoff passed
+    stats = spool.stats()
+    assert (stats['queued'], stats['retrying'], stats['dead']) == (1, 1, 0)
+
+    with spool._connect() as conn:
+        next_attempt_at = conn.execute("SELECT next_attempt_at FROM outbox WHERE id = ?", (message_id,)).fetchone()[0]
+        assert next_attempt_at >= before + spool.BACKOFF_BASE
+        conn.execute("UPDATE outbox SET next_attempt_at = 0")
+
+    queue.drain(sink)
+    assert spool.stats()['dead'] == 1
+
+#Test claimed messages are hidden from other workers until their lease ends
+def test_claim_is_exclusive(spool):
+    for i in range(5):
+        spool.add([f'{i}@unr.edu'], 'Hi', 'body')
+    first = spool.claim(3)
+    second = spool.claim(3)
+    assert len(first) == 3 and len(second) == 2
+    assert not {m['id'] for m in first} & {m['id'] for m in second}
+    assert spool.claim(3) == []
+
+#Test the spool file is only created when first used
+def test_spool_created_lazily(tmp_path):
+    path = tmp_path / 'mail' / 'spool.sqlite3'
+    spool = MailSpool(str(path))
+    assert not path.exists()
+    spool.add(['a@unr.edu'], 'Hi', 'body')
+    assert path.exists() and spool.stats()['queued'] == 1
+
+#Test a batch that takes longer than one lease stays with its worker
+def test_lease_renewed_per_message(spool):
+    spool.LEASE = 0.5
+    for i in range(3):
+        spool.add([f'{i}@unr.edu'], 'Hi', 'body')
+    stolen = []
+
+    class SlowSink(FlakySink):
+        def send(self, message):
+            time.sleep(0.3)                     # three sends outlast the first lease
+            stolen.extend(spool.claim(10))      # another worker polling meanwhile
+            super().send(message)
+
+    sink = SlowSink(failures=0)
+    MailQueue(spool, lambda: sink, batch_size=3).process_batch(sink)
+    assert stolen == []
+    assert len(sink.sent) == 3 and spool.stats()['queued'] == 0
+
+#Test starting the workers sends mail already in the spool, without a new enqueue
+def test_start_drains_spool(spool):
+    spool.add(['a@unr.edu'], 'Left over', 'body')
+    sink = FlakySink(failures=0)
+    queue = MailQueue(spool, lambda: sink, workers=1, poll_interval=0.05)
+    queue.start()
+    try:
+        deadline = time.time() + 5
+        while not sink.sent and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        queue.stop()
+    assert [m['subject'] for m in sink.sent] == ['Left over']
+
+#Test background workers deliver enqueued mail
+def test_workers_send_enqueued_mail(spool):
+    sink = FlakySink(failures=0)
+    queue = MailQueue(spool, lambda: sink, workers=1, poll_interval=0.05)
+    queue.enqueue(message())
+    try:
+        deadline = time.time() + 5
+        while not sink.sent and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        queue.stop()
+    assert sink.sent[0]['recipients'] == ['student@unr.edu']
+    assert sink.sent[0]['sender'] == 'ncs@unr.edu'
+
+#Test signup answers without waiting on SMTP and spools the verification mail
+def test_signup_queues_verification(spool, monkeypatch):
+    sink = FlakySink(failures=0)
+    monkeypatch.setattr(app_module, 'mail_queue', MailQueue(spool, lambda: sink, workers=0))
+    flask_app.config['TESTING'] = True
+    flask_app.config['WTF_CSRF_ENABLED'] = False
+
+    with flask_app.app_context():
+        db.session.execute(db.delete(User).where(User.email == TEST_EMAIL))
+        db.session.commit()
+    try:
+        with flask_app.test_client() as client:
+            response = client.post('/signup', json={
+                'first_name': 'Mail', 'last_name': 'Queue', 'email': TEST_EMAIL, 'password': 'mailqueuepassword123'
+            })
+        assert response.status_code == 201
+        assert spool.stats()['queued'] == 1
+
+        app_module.mail_queue.drain(sink)
+        assert sink.sent[0]['recipients'] == [TEST_EMAIL]
+        assert '/verify-email/' in sink.sent[0]['body']
+    finally:
+        with flask_app.app_context():
+            db.session.execute(db.delete(User).where(User.email == TEST_EMAIL))
+            db.session.commit()
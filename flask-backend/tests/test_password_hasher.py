@@ -0,0 +1,75 @@
+# tests/test_password_hasher.py
+import pytest
+from werkzeug.security import generate_password_hash
+from app import app as flask_app, db, password_hasher
+from models.user import User
+from services.password_hasher import PasswordHasher
+
+
+TEST_EMAIL = 'passwordhashertest@gmail.com'
+TEST_PASSWORD = 'passwordhasherpassword123'
+FAST_METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    flask_app.config['WTF_CSRF_ENABLED'] = False
+    with flask_app.test_client() as client:
+        yield client
+
+#Test hashes verify and report whether they use the configured parameters
+def test_hash_and_verify():
+    hasher = PasswordHasher(FAST_METHOD)
+    password_hash = hasher.hash(TEST_PASSWORD)
+
+    assert hasher.prefix == FAST_METHOD
+    assert hasher.verify(password_hash, TEST_PASSWORD)
+    assert not hasher.verify(password_hash, 'wrong')
+    assert not hasher.needs_rehash(password_hash)
+    assert hasher.needs_rehash(generate_password_hash(TEST_PASSWORD, method='pbkdf2:sha256:2000'))
+
+#Test verify_and_update only rehashes matching passwords with old parameters
+def test_verify_and_update():
+    hasher = PasswordHasher(FAST_METHOD)
+    old_hash = generate_password_hash(TEST_PASSWORD, method='pbkdf2:sha256:2000')
+
+    assert hasher.verify_and_update(old_hash, 'wrong') == (False, None)
+    matches, new_hash = hasher.verify_and_update(old_hash, TEST_PASSWORD)
+    assert matches and new_hash.startswith(FAST_METHOD + '$')
+    assert hasher.verify_and_update(new_hash, TEST_PASSWORD) == (True, None)
+
+#Test hashing through the process pool gives the same results
+def test_process_pool():
+    hasher = PasswordHasher(FAST_METHOD, pool_size=1)
+    try:
+        password_hash = hasher.hash(TEST_PASSWORD)
+        assert hasher.verify(password_hash, TEST_PASSWORD)
+        assert not hasher.verify(password_hash, 'wrong')
+    finally:
+        hasher.shutdown()
+
+#Test logging in moves a hash made with old settings onto the current ones
+def test_login_rehashes_old_hash(client, cleanup_test_user):
+    cleanup_test_user(TEST_EMAIL)
+    with flask_app.app_context():
+        db.session.add(User(
+            first_name='Password',
+            last_name='Hasher',
+            email=TEST_EMAIL,
+            password=generate_password_hash(TEST_PASSWORD, method='pbkdf2:sha256:1000'),
+            is_verified=True
+        ))
+        db.session.commit()
+    try:
+        assert client.post('/login', json={'email': TEST_EMAIL, 'password': 'wrong'}).status_code == 401
+        assert client.post('/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD}).status_code == 200
+
+        with flask_app.app_context():
+            stored = db.session.execute(db.select(User.password).filter_by(email=TEST_EMAIL)).scalar_one()
+        assert not password_hasher.needs_rehash(stored)
+
+        client.post('/logout')
+        assert client.post('/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD}).status_code == 200
+    finally:
+        cleanup_test_user(TEST_EMAIL)
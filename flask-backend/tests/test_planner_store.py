@@ -0,0 +1,107 @@
+# tests/test_planner_store.py
+import pytest
+from werkzeug.security import generate_password_hash
+from app import app as flask_app, db
+from models.user import User
+from services.planner_store import PlannerStore
+
+
+TEST_EMAIL = 'plannerstoretest@gmail.com'
+TEST_PASSWORD = 'plannerstorepassword123'
+MISSING_SECTION_ID = 999999999
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    flask_app.config['WTF_CSRF_ENABLED'] = False
+    with flask_app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def section_ids():
+    with flask_app.app_context():
+        return db.session.execute(db.text("SELECT id FROM section ORDER BY id LIMIT 4")).scalars().all()
+
+
+@pytest.fixture
+def logged_in(client, cleanup_test_user):
+    cleanup_test_user(TEST_EMAIL)
+    with flask_app.app_context():
+        db.session.add(User(
+            first_name='Planner',
+            last_name='Store',
+            email=TEST_EMAIL,
+            password=generate_password_hash(TEST_PASSWORD),
+            is_verified=True
+        ))
+        db.session.commit()
+    client.post('/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD})
+    client.get('/auth/status')     # loads the user into the user cache
+    yield
+    cleanup_test_user(TEST_EMAIL)
+
+
+def planned(client):
+    return [section['section_id'] for section in client.get('/planner').get_json()['sections']]
+
+#Test add and remove are one statement each
+def test_add_remove_statement_count(client, logged_in, section_ids, count_queries):
+    with count_queries() as statements:
+        response = client.post('/planner/section', json={'section_id': section_ids[0]})
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        response = client.delete(f'/planner/section/{section_ids[0]}')
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert planned(client) == []
+
+#Test the single section endpoints keep their error responses
+def test_add_remove_errors(client, logged_in, section_ids):
+    assert client.post('/planner/section', json={'section_id': section_ids[0]}).status_code == 200
+    response = client.post('/planner/section', json={'section_id': section_ids[0]})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Section already in planner'
+    assert client.post('/planner/section', json={'section_id': MISSING_SECTION_ID}).status_code == 404
+
+    assert client.delete(f'/planner/section/{section_ids[1]}').status_code == 400
+    assert client.delete(f'/planner/section/{MISSING_SECTION_ID}').status_code == 404
+    assert planned(client) == [section_ids[0]]
+
+#Test bulk add / remove reports what happened to every id
+def test_bulk_update(client, logged_in, section_ids):
+    a, b, c, d = section_ids
+    data = client.post('/planner/sections', json={'add': [a, b, c, MISSING_SECTION_ID]}).get_json()
+    assert data['added'] == [a, b, c]
+    assert data['not_found'] == [MISSING_SECTION_ID]
+
+    data = client.post('/planner/sections', json={'add': [a, d], 'remove': [b, MISSING_SECTION_ID]}).get_json()
+    assert data['added'] == [d]
+    assert data['already_planned'] == [a]
+    assert data['removed'] == [b]
+    assert data['not_planned'] == [MISSING_SECTION_ID]
+    assert sorted(planned(client)) == [a, c, d]
+
+#Test bulk input is validated before anything is written
+def test_bulk_update_invalid(client, logged_in, section_ids):
+    assert client.post('/planner/sections', json={}).status_code == 400
+    assert client.post('/planner/sections', json={'add': ['x']}).status_code == 400
+    assert client.post('/planner/sections', json={'add': section_ids[0]}).status_code == 400
+    assert client.post('/planner/sections', json={'add': [section_ids[0]], 'remove': [section_ids[0]]}).status_code == 400
+    assert client.post('/planner/sections', json={'add': list(range(1, 300))}).status_code == 400
+    assert planned(client) == []
+
+#Test the conflict check takes at most MAX_BULK section ids
+def test_conflicts_section_id_limit(client, logged_in, section_ids):
+    ids = ','.join(str(section_id) for section_id in section_ids)
+    response = client.get(f'/planner/conflicts?section_ids={ids}')
+    assert response.status_code == 200
+    assert 'conflicts' in response.get_json()
+
+    ids = ','.join(str(i) for i in range(1, PlannerStore.MAX_BULK + 2))
+    response = client.get(f'/planner/conflicts?section_ids={ids}')
+    assert response.status_code == 400
+    assert client.get('/planner/conflicts?section_ids=1,x').status_code == 400
@@ -0,0 +1,83 @@
+# tests/test_query_counts.py
+import pytest
+from werkzeug.security import generate_password_hash
+from app import app as flask_app, db
+from models.user import User, user_planned_section
+
+
+TEST_EMAIL = 'querycounttest@gmail.com'
+TEST_PASSWORD = 'querycountpassword123'
+TEST_SECTION_ID = 1  # section ID that always exist
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    flask_app.config['WTF_CSRF_ENABLED'] = False
+    with flask_app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def planner_user(client, cleanup_test_user):
+    #Verified user logged in through /login, returns a function that fills their planner
+    cleanup_test_user(TEST_EMAIL)
+    with flask_app.app_context():
+        user = User(
+            first_name='Query',
+            last_name='Counter',
+            email=TEST_EMAIL,
+            password=generate_password_hash(TEST_PASSWORD),
+            is_verified=True
+        )
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    client.post('/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD})
+    client.get('/auth/status')     # loads the user into the user cache
+
+    def plan_sections(count):
+        with flask_app.app_context():
+            db.session.execute(user_planned_section.delete().where(user_planned_section.c.user_id == user_id))
+            section_ids = db.session.execute(
+                db.text("SELECT id FROM section ORDER BY id LIMIT :count"), {'count': count}
+            ).scalars().all()
+            db.session.execute(user_planned_section.insert(), [
+                {'user_id': user_id, 'section_id': section_id} for section_id in section_ids
+            ])
+            db.session.commit()
+
+    yield plan_sections
+    cleanup_test_user(TEST_EMAIL)
+
+#Test planner queries don't grow with the number of planned sections
+def test_planner_query_count_is_constant(client, planner_user, count_queries):
+    planner_user(2)
+    with count_queries() as small:
+        assert len(client.get('/planner').get_json()['sections']) == 2
+
+    planner_user(20)
+    with count_queries() as large:
+        assert len(client.get('/planner').get_json()['sections']) == 20
+
+    assert len(large) == len(small)
+    assert len(large) <= 2   # sections + course + term, instructors (the user comes from the user cache)
+
+#Test section details load in one query plus the instructors
+def test_section_details_query_count(client, count_queries):
+    with count_queries() as statements:
+        data = client.get(f'/sections/{TEST_SECTION_ID}').get_json()
+
+    assert data['status'] == 'success'
+    assert 'course' in data['section'] and 'term' in data['section']
+    assert len(statements) <= 2
+
+#Test course details load the department with the course
+def test_course_details_query_count(client, count_queries):
+    with count_queries() as statements:
+        data = client.get('/courses-test/1').get_json()
+
+    assert data['status'] == 'success'
+    assert 'department' in data['course']
+    assert len(statements) == 1
@@ -0,0 +1,46 @@
+# tests/test_reference_cache.py
+import gzip
+import pytest
+from app import app as flask_app, reference_cache
+from models.catalog_version import CatalogVersion
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    reference_cache.clear()
+    with flask_app.test_client() as client:
+        yield client
+
+#Test a matching If-None-Match gets 304 with no body
+@pytest.mark.parametrize('url', ['/departments', '/instructors', '/terms', '/courses-test'])
+def test_etag_revalidation(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'success'
+    assert response.headers['ETag']
+    assert 'max-age' in response.headers['Cache-Control']
+
+    response = client.get(url, headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert response.data == b''
+
+#Test gzip body decompresses to the plain body
+def test_gzip_body_matches_plain(client):
+    plain = client.get('/instructors')
+    compressed = client.get('/instructors', headers={'Accept-Encoding': 'gzip'})
+
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers['ETag'] == plain.headers['ETag']
+
+#Test a catalog version bump invalidates the cached body
+def test_new_version_changes_etag(client, monkeypatch):
+    first = client.get('/terms').headers['ETag']
+
+    version = CatalogVersion.cached_version
+    monkeypatch.setattr(CatalogVersion, 'cached_version', staticmethod(lambda: version() + 1))
+    response = client.get('/terms', headers={'If-None-Match': first})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != first
@@ -0,0 +1,91 @@
+# tests/test_schedule_generator.py
+from datetime import time
+from types import SimpleNamespace
+import pytest
+from services.meeting_times import slot_mask
+from services.schedule_generator import ScheduleGenerator
+
+
+def section(section_id, subject, catalog_num, component, days, start, end, mode='P'):
+    return SimpleNamespace(
+        id=section_id,
+        course=SimpleNamespace(subject=subject, catalog_num=f' {catalog_num}'),
+        component=component,
+        class_days=days,
+        start_time=time(*start) if start else None,
+        end_time=time(*end) if end else None,
+        class_status='A',
+        instruction_mode=mode,
+    )
+
+
+SECTIONS = [
+    section(1, 'CS', '135', 'LEC', 'MW', (9, 0), (10, 15)),
+    section(2, 'CS', '135', 'LEC', 'TR', (9, 0), (10, 15)),
+    section(3, 'CS', '135', 'LAB', 'M', (9, 30), (10, 45)),     # clashes with 1
+    section(4, 'CS', '135', 'LAB', 'W', (10, 30), (11, 45)),
+    section(5, 'MATH', '181', 'LEC', 'MW', (9, 0), (10, 15)),   # same time as 1
+    section(6, 'MATH', '181', 'LEC', 'MWF', (13, 0), (13, 50)),
+]
+
+COURSES = [{'subject': 'CS', 'catalog_num': '135'}, {'subject': 'MATH', 'catalog_num': '181'}]
+
+
+def solve(sections=SECTIONS, **constraints):
+    generator = ScheduleGenerator('1', COURSES, **constraints)
+    schedules = generator.solve(generator.build_domains(sections))
+    return generator, [sorted(o.sections[0].id for o in options) for options in schedules]
+
+#Test slot masks overlap only when meetings do
+def test_slot_mask_overlap():
+    a = slot_mask('MWF', time(9, 0), time(9, 50))
+    assert not a & slot_mask('W', time(9, 50), time(10, 40))
+    assert a & slot_mask('F', time(9, 45), time(10, 0))
+    assert slot_mask(None, None, None) == 0
+
+#Test every schedule is conflict free and has one section per component
+def test_schedules_are_conflict_free():
+    _, schedules = solve()
+
+    assert schedules
+    assert [1, 3, 5] not in schedules
+    for ids in schedules:
+        masks = [slot_mask(s.class_days, s.start_time, s.end_time) for s in SECTIONS if s.id in ids]
+        assert len(ids) == 3
+        for i in range(len(masks)):
+            for j in range(i + 1, len(masks)):
+                assert not masks[i] & masks[j]
+
+#Test days on campus plus gaps decide the ranking
+def test_best_schedule_first():
+    _, schedules = solve()
+
+    # TR lecture + W lab + MW math: 4 days, 15 minute gap (255)
+    # beats MW lecture + W lab + MWF math: 3 days, but 4 hours of gaps (435)
+    assert schedules[0] == [2, 4, 5]
+    assert schedules.index([2, 4, 6]) < schedules.index([1, 4, 6])
+
+#Test constraints remove sections and report components left empty
+def test_constraints():
+    generator, schedules = solve(earliest_start='10:00')
+
+    assert schedules == []
+    assert generator.empty_components == ['CS 135 LEC']
+
+    # no afternoon math left, so the lecture has to move to TR
+    _, schedules = solve(latest_end='12:00')
+    assert schedules == [[2, 4, 5]]
+
+#Test allowed days take the same day abbreviations as the search filters and are a hard constraint
+def test_allowed_days():
+    # Tu / Th are Tuesday and Thursday, not T + U (Sunday) and T + h
+    _, schedules = solve(allowed_days='M, Tu, W, Th')
+    assert [2, 4, 5] in schedules
+    assert not any(6 in ids for ids in schedules)     # MWF math meets on Friday
+
+    generator, schedules = solve(allowed_days='TuTh')
+    assert schedules == []
+    assert generator.empty_components == ['CS 135 LAB', 'MATH 181 LEC']
+
+    with pytest.raises(ValueError):
+        ScheduleGenerator('1', COURSES, allowed_days='xyz')
@@ -0,0 +1,64 @@
+# tests/test_search.py
+import pytest
+from app import app as flask_app
+
+
+TEST_TERM = '1'  # session code that always exists
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    with flask_app.test_client() as client:
+        yield client
+
+
+def fetch_all_pages(client, params, limit):
+    section_ids = []
+    cursor = None
+    while True:
+        query = dict(params, limit=limit)
+        if cursor:
+            query['cursor'] = cursor
+        data = client.get('/courses/search', query_string=query).get_json()
+        assert data['status'] == 'success'
+        assert data['count'] <= limit
+        section_ids += [s['section_id'] for s in data['sections']]
+        cursor = data['next_cursor']
+        if not cursor:
+            return section_ids
+
+#Test keyset pages cover every match exactly once
+def test_search_pages_cover_all_results(client):
+    params = {'term': TEST_TERM, 'component': 'LAB'}
+    section_ids = fetch_all_pages(client, params, limit=25)
+
+    total = client.get('/courses/search/count', query_string=params).get_json()['total']
+
+    assert len(section_ids) == total
+    assert len(set(section_ids)) == total
+
+#Test a search without limit or cursor still returns every match in one response
+def test_search_without_limit_is_unpaged(client):
+    params = {'term': TEST_TERM}
+    data = client.get('/courses/search', query_string=params).get_json()
+    total = client.get('/courses/search/count', query_string=params).get_json()['total']
+
+    assert total > 100
+    assert data['count'] == total
+    assert data['limit'] is None and data['next_cursor'] is None
+
+#Test paging with a cursor but no limit uses the default page size
+def test_search_default_limit(client):
+    first = client.get('/courses/search', query_string={'term': TEST_TERM, 'limit': 10}).get_json()
+    data = client.get('/courses/search', query_string={'term': TEST_TERM, 'cursor': first['next_cursor']}).get_json()
+
+    assert data['count'] == data['limit'] == 100
+    assert data['next_cursor'] is not None
+
+#Test malformed cursor is rejected
+def test_search_invalid_cursor(client):
+    response = client.get('/courses/search', query_string={'cursor': 'not-a-cursor'})
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid cursor'
@@ -0,0 +1,80 @@
+# tests/test_search_cache.py
+import time
+import pytest
+from app import app as flask_app
+from models.catalog_version import CatalogVersion
+from services.search_cache import MemoryBackend, SearchCache
+from services.search_service import SearchService
+
+
+@pytest.fixture
+def app_context():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        yield
+    # re-read the real version on the next call
+    CatalogVersion._cached_version = None
+
+
+def pin_version(version):
+    #Makes CatalogVersion.cached_version() return version without reading the database
+    CatalogVersion._cached_version = version
+    CatalogVersion._checked_at = time.monotonic()
+
+
+def search_with(cache, **filters):
+    search = SearchService(use_projection=True, cache=cache)
+    for name, value in filters.items():
+        search.add_filter(name, value)
+    search.execute_search(limit=20)
+    return search
+
+#Test equivalent filters normalize to the same cache key filters
+def test_cache_key_filters_are_canonical():
+    first = SearchService()
+    second = SearchService()
+    for name, value in {'subject': 'cs', 'days': 'WM', 'units': '3', 'units_operator': 'exact', 'title': 'Intro'}.items():
+        first.add_filter(name, value)
+    for name, value in {'subject': 'CS', 'days': 'MW', 'units': '03', 'title': 'intro', 'level': 'abc'}.items():
+        second.add_filter(name, value)
+
+    assert first.cache_key_filters() == second.cache_key_filters()
+    assert first.cache_key_filters()['days'] == 'MW'
+
+#Test memory backend evicts least recently used entries past the byte bound and expired ones
+def test_memory_backend_lru_and_ttl():
+    backend = MemoryBackend(max_bytes=10)
+    backend.set('a', b'12345', ttl=60)
+    backend.set('b', b'12345', ttl=60)
+    backend.get('a')
+    backend.set('c', b'12345', ttl=60)
+
+    assert backend.get('b') is None
+    assert backend.get('a') == b'12345'
+    assert backend.bytes == 10
+
+    backend.set('d', b'1', ttl=-1)
+    assert backend.get('d') is None
+
+#Test a repeated search is a hit and returns the same page
+def test_repeated_search_hits_cache(app_context):
+    pin_version(1)
+    cache = SearchCache()
+    first = search_with(cache, subject='cs')
+    second = search_with(cache, subject='CS')
+
+    assert cache.hits == 1 and cache.misses == 1
+    assert second.get_results_as_dict() == first.get_results_as_dict()
+    assert second.next_cursor == first.next_cursor
+
+#Test a catalog version bump makes old entries miss
+def test_version_bump_invalidates(app_context):
+    pin_version(1)
+    cache = SearchCache()
+    search_with(cache, subject='CS')
+
+    pin_version(2)
+    search_with(cache, subject='CS')
+
+    assert cache.hits == 0 and cache.misses == 2
+    assert cache.backend.stats()['entries'] == 1
@@ -0,0 +1,77 @@
+# tests/test_search_index.py
+import pytest
+from app import app as flask_app
+from services.search_service import SearchService, encode_cursor
+from services.section_index import SectionIndex
+
+
+TEST_TERM = '1'  # session code that always exists
+
+FILTER_SETS = [
+    {},
+    {'subject': 'cs'},
+    {'days': 'MW'},
+    {'days_only': 'TR'},
+    {'start_after': '10:00', 'end_before': '14:00'},
+    {'units': '3'},
+    {'units': '5', 'units_operator': 'greater_equal'},
+    {'course_career': 'Graduate'},
+    {'level': '1', 'status': 'A'},
+    {'component': 'LAB', 'instruction_mode': 'P'},
+    {'title': 'intro'},
+    {'instructor': 'smith'},
+    {'search_query': 'calculus'},
+]
+
+
+@pytest.fixture
+def app_context():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        SectionIndex.invalidate()
+        yield
+
+
+def run_search(filters, use_index):
+    search = SearchService(use_index=use_index)
+    search.add_filter('term', TEST_TERM)
+    for name, value in filters.items():
+        search.add_filter(name, value)
+    search.execute_search()
+    return search.get_results_as_dict()
+
+#Test index answers match the database query
+@pytest.mark.parametrize('filters', FILTER_SETS)
+def test_index_matches_database(app_context, filters):
+    db_ids = {r['section_id'] for r in run_search(filters, use_index=False)}
+    index_ids = {r['section_id'] for r in run_search(filters, use_index=True)}
+
+    assert index_ids == db_ids
+
+#Test index rows have the same shape as the summary view
+def test_index_rows_match_summary_keys(app_context):
+    db_rows = run_search({'subject': 'CS'}, use_index=False)
+    index_rows = run_search({'subject': 'CS'}, use_index=True)
+
+    assert index_rows
+    assert set(index_rows[0].keys()) == set(db_rows[0].keys())
+
+#Test index is rebuilt after a catalog version bump
+def test_index_reloads_on_version_change(app_context):
+    first = SectionIndex.for_term(TEST_TERM)
+    assert SectionIndex.for_term(TEST_TERM) is first
+
+    first.version = -1
+    assert SectionIndex.for_term(TEST_TERM) is not first
+
+#Test cursors that don't fit the index's sort key are a 400 like on the database path, not a 500
+@pytest.mark.parametrize('sort_key', [
+    [0.5, 'CS', '135', '1001', 5],      # ranked full-text cursor
+    ['CS', 135, '1001', 5],             # catalog_num of the wrong type
+])
+def test_index_rejects_foreign_cursor(app_context, monkeypatch, sort_key):
+    monkeypatch.setitem(flask_app.config, 'SEARCH_INDEX_ENABLED', True)
+    with flask_app.test_client() as client:
+        response = client.get(f'/courses/search?term={TEST_TERM}&limit=5&cursor={encode_cursor(sort_key)}')
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid cursor'
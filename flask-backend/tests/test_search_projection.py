@@ -0,0 +1,57 @@
+# tests/test_search_projection.py
+import pytest
+from app import app as flask_app
+from services.search_service import SearchService
+
+
+FILTER_SETS = [
+    {},
+    {'subject': 'cs'},
+    {'term': '1', 'days': 'MW'},
+    {'instructor': 'smith'},
+    {'search_query': 'calculus'},
+]
+
+
+@pytest.fixture
+def app_context():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        yield
+
+
+def run_search(filters, use_projection, limit=None, cursor=None):
+    search = SearchService(use_projection=use_projection)
+    for name, value in filters.items():
+        search.add_filter(name, value)
+    search.execute_search(limit=limit, cursor=cursor)
+    return search.get_results_as_dict(), search.next_cursor
+
+
+def comparable(rows):
+    #Instructor order isn't defined by the ORM relationship, compare the names as sets
+    return [dict(row, instructor=set(row['instructor'].split(', '))) for row in rows]
+
+#Test projection rows match the ORM summary dicts
+@pytest.mark.parametrize('filters', FILTER_SETS)
+def test_projection_matches_orm(app_context, filters):
+    orm_rows, orm_cursor = run_search(filters, use_projection=False)
+    projection_rows, projection_cursor = run_search(filters, use_projection=True)
+
+    assert comparable(projection_rows) == comparable(orm_rows)
+    assert projection_cursor == orm_cursor
+
+#Test paging with the projection cursor walks the same sections as one big page
+def test_projection_cursor_pages(app_context):
+    filters = {'subject': 'CS'}
+    everything, _ = run_search(filters, use_projection=True, limit=500)
+
+    paged = []
+    cursor = None
+    while True:
+        rows, cursor = run_search(filters, use_projection=True, limit=7, cursor=cursor)
+        paged.extend(rows)
+        if cursor is None:
+            break
+
+    assert [r['section_id'] for r in paged] == [r['section_id'] for r in everything]
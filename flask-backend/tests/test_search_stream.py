@@ -0,0 +1,70 @@
+# tests/test_search_stream.py
+import json
+import pytest
+from app import app as flask_app, db
+from services.search_service import SearchService
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    with flask_app.test_client() as client:
+        yield client
+
+
+def ndjson_rows(response):
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+#Test ?stream=1 returns every matching section as NDJSON, not just the first page
+def test_stream_returns_all_rows(client, monkeypatch):
+    monkeypatch.setattr(SearchService, 'STREAM_BATCH_SIZE', 7)     # many fetches after the view returned
+    page = client.get('/courses/search?subject=CS&limit=5').get_json()
+    total = client.get('/courses/search/count?subject=CS').get_json()
+
+    response = client.get('/courses/search?subject=CS&limit=5&stream=1')
+    rows = ndjson_rows(response)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert len(rows) == total['total']
+    assert rows[:5] == page['sections']
+
+#Test the Accept header turns streaming on, */* keeps the JSON page
+def test_stream_accept_header(client):
+    streamed = client.get('/courses/search?subject=CS', headers={'Accept': 'application/x-ndjson'})
+    streamed_rows = ndjson_rows(streamed)
+    plain = client.get('/courses/search?subject=CS', headers={'Accept': '*/*'})
+
+    assert streamed.mimetype == 'application/x-ndjson'
+    assert plain.mimetype == 'application/json'
+    assert streamed_rows == plain.get_json()['sections']
+
+#Test streaming resumes after a cursor and rejects a bad one before streaming
+def test_stream_cursor(client):
+    page = client.get('/courses/search?subject=CS&limit=5').get_json()
+    rows = ndjson_rows(client.get(f"/courses/search?subject=CS&stream=1&cursor={page['next_cursor']}"))
+    bad = client.get('/courses/search?stream=1&cursor=not-a-cursor')
+
+    assert rows[0]['section_id'] not in {s['section_id'] for s in page['sections']}
+    assert bad.status_code == 400
+
+#Test a query failing on its first fetch gets an error status, not a 200 with a broken body
+def test_stream_query_error_before_response(client, monkeypatch):
+    monkeypatch.setattr(SearchService, '_projection_query_after', lambda self, after: db.text("SELECT 1 / 0"))
+    response = client.get('/courses/search?subject=CS&stream=1')
+
+    assert response.status_code == 500
+    assert response.mimetype == 'application/json'
+
+#Test a failure after the first batch ends the stream with an error line
+def test_stream_error_line(client, monkeypatch):
+    # rows 1 and 2 are fine, the 3rd divides by zero once the server-side cursor gets to it
+    query = db.text("SELECT 1 / (3 - n) FROM generate_series(1, 5) AS n")
+    monkeypatch.setattr(SearchService, '_projection_query_after', lambda self, after: query)
+    monkeypatch.setattr(SearchService, 'STREAM_BATCH_SIZE', 1)
+    response = client.get('/courses/search?subject=CS&stream=1')
+    rows = ndjson_rows(response)
+
+    assert response.status_code == 200
+    assert rows[:2] == [{'section_id': 0}, {'section_id': 1}]
+    assert 'division by zero' in rows[-1]['error']
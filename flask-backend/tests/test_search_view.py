@@ -0,0 +1,122 @@
+# tests/test_search_view.py
+import threading
+import time
+import pytest
+from app import app as flask_app
+from database import db
+from models.section import Section
+from models.section_search import SectionSearch
+from services.search_service import SearchService
+from services.search_view_refresher import SearchViewRefresher
+
+
+FILTER_SETS = [
+    {},
+    {'subject': 'cs'},
+    {'term': '1', 'days': 'MW'},
+    {'instructor': 'smith'},
+    {'search_query': 'calculus'},
+    {'level': '1', 'status': 'A', 'units': '3', 'units_operator': 'greater_equal'},
+    {'days_only': 'TR', 'start_after': '10:00'},
+    {'course_career': 'Graduate', 'title': 'intro'},
+]
+
+
+@pytest.fixture
+def app_context():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        yield
+
+
+def run_search(filters, use_view):
+    search = SearchService(use_projection=True, use_view=use_view)
+    for name, value in filters.items():
+        search.add_filter(name, value)
+    search.execute_search()
+    return search.get_results_as_dict(), search.next_cursor, search.get_total_count(), search.get_facets()
+
+#Test the section_search view answers exactly like the joined tables
+@pytest.mark.parametrize('filters', FILTER_SETS)
+def test_view_matches_tables(app_context, filters):
+    assert run_search(filters, use_view=True) == run_search(filters, use_view=False)
+
+#Test the view has one row per section and refreshes concurrently inside a transaction
+def test_view_refresh(app_context):
+    SectionSearch.refresh()
+    view_rows = db.session.execute(db.select(db.func.count()).select_from(SectionSearch)).scalar()
+    sections = db.session.execute(db.select(db.func.count()).select_from(Section)).scalar()
+    db.session.rollback()
+
+    assert view_rows == sections
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+#Test a burst of scheduled refreshes runs one refresh after the delay
+def test_refresher_coalesces_writes():
+    refresher = SearchViewRefresher(flask_app, delay=0.1)
+    for _ in range(3):
+        refresher.schedule()
+    assert refresher.refreshes == 0         # never in the caller's request
+
+    assert wait_for(lambda: refresher.refreshes == 1)
+    time.sleep(0.2)
+    assert refresher.stats() == {'scheduled': 3, 'refreshes': 1, 'failures': 0, 'pending': False}
+
+#Test writes scheduled while a refresh runs get one more refresh after it
+def test_refresher_reruns_after_running_refresh():
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowRefresher(SearchViewRefresher):
+        def refresh(self):
+            started.set()
+            release.wait(5)
+            self.refreshes += 1
+
+    refresher = SlowRefresher(flask_app, delay=0)
+    refresher.schedule()
+    assert started.wait(5)
+    refresher.schedule()
+    refresher.schedule()
+    release.set()
+
+    assert wait_for(lambda: refresher.refreshes == 2)
+    time.sleep(0.1)
+    assert refresher.refreshes == 2
+
+#Test a failed refresh is retried with backoff until one succeeds
+def test_refresher_retries_failed_refresh():
+    class FlakyRefresher(SearchViewRefresher):
+        RETRY_BASE = 0.05
+        attempts = 0
+
+        def refresh(self):
+            self.attempts += 1
+            if self.attempts <= 2:
+                raise RuntimeError('could not refresh')
+            self.refreshes += 1
+
+    refresher = FlakyRefresher(flask_app, delay=0)
+    refresher.schedule()
+
+    assert wait_for(lambda: refresher.refreshes == 1)
+    assert refresher.attempts == 3
+    assert refresher.stats()['failures'] == 0 and refresher.stats()['pending'] is False
+
+#Test flush runs a refresh still waiting on its timer right away (at exit)
+def test_refresher_flush():
+    refresher = SearchViewRefresher(flask_app, delay=60)
+    refresher.schedule()
+    assert refresher.stats()['pending']
+
+    refresher.flush()
+    assert refresher.refreshes == 1
+    assert refresher.stats()['pending'] is False
+    refresher.flush()                       # nothing owed, no second refresh
+    assert refresher.refreshes == 1
@@ -0,0 +1,138 @@
+# tests/test_section_import.py
+import pytest
+from werkzeug.security import generate_password_hash
+import app as app_module
+from app import app as flask_app, db
+from models.user import User
+from models.catalog_version import CatalogVersion
+
+
+TEST_EMAIL = 'sectionimporttest@gmail.com'
+TEST_PASSWORD = 'sectionimportpassword123'
+INSTRUCTOR_LAST_NAME = 'Importtest'
+CSV_HEADER = 'course_id,term_id,section_num,component,instruction_mode,days,start_time,end_time,combined,status,capacity,room,instructors\n'
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    flask_app.config['WTF_CSRF_ENABLED'] = False
+    with flask_app.test_client() as client:
+        yield client
+
+
+def cleanup_imported():
+    with flask_app.app_context():
+        db.session.execute(db.text("DELETE FROM section WHERE section_num LIKE 'IMP%'"))
+        db.session.execute(db.text("DELETE FROM instructor WHERE last_name = :last"), {'last': INSTRUCTOR_LAST_NAME})
+        CatalogVersion.bump()
+        db.session.commit()
+
+
+@pytest.fixture
+def admin(client, cleanup_test_user):
+    cleanup_test_user(TEST_EMAIL)
+    cleanup_imported()
+    with flask_app.app_context():
+        db.session.add(User(
+            first_name='Section',
+            last_name='Importer',
+            email=TEST_EMAIL,
+            password=generate_password_hash(TEST_PASSWORD),
+            is_verified=True
+        ))
+        db.session.commit()
+    client.post('/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD})
+    yield
+    cleanup_imported()
+    cleanup_test_user(TEST_EMAIL)
+
+
+def section_row(num, **fields):
+    row = {
+        'course_id': 1, 'term_id': 1, 'section_num': f'IMP{num:02d}', 'component': 'LEC',
+        'instruction_mode': 'P', 'days': 'M W', 'start_time': '09:00', 'end_time': '09:50',
+        'combined': False, 'status': 'Open', 'capacity': 30, 'room': 'SEM 101',
+        'instructors': [f'Ada{num % 3} {INSTRUCTOR_LAST_NAME}'],
+    }
+    row.update(fields)
+    return row
+
+#Test a JSON import costs the same handful of statements for any number of rows
+def test_json_import(client, admin, count_queries):
+    with count_queries() as statements:
+        response = client.post('/admin/sections/bulk', json=[section_row(i) for i in range(50)])
+    data = response.get_json()
+
+    assert response.status_code == 201
+    assert len(data['section_ids']) == 50
+    assert len(statements) <= 12     # incl. the search document check + refresh
+
+    section = client.get(f"/sections/{data['section_ids'][7]}").get_json()['section']
+    assert section['section_num'] == 'IMP07'
+    assert [i['full_name'] for i in section['instructors']] == [f'Ada1 {INSTRUCTOR_LAST_NAME}']
+
+#Test one bad row rejects the whole import and every bad row is reported
+def test_import_reports_row_errors(client, admin):
+    rows = [
+        section_row(1),
+        section_row(2, course_id=999999999),
+        section_row(3, days='XYZ'),
+        section_row(4, start_time='9am'),
+        section_row(1),
+        {'course_id': 1},
+    ]
+    response = client.post('/admin/sections/bulk', json=rows)
+    errors = response.get_json()['errors']
+
+    assert response.status_code == 400
+    assert [error['row'] for error in errors] == [2, 3, 4, 5, 6]
+    assert errors[0]['error'] == 'Course not found'
+    assert errors[3]['error'] == 'Duplicate section in import'
+
+    with flask_app.app_context():
+        assert db.session.execute(db.text("SELECT count(*) FROM section WHERE section_num LIKE 'IMP%'")).scalar() == 0
+
+#Test CSV import and re-importing an existing section
+def test_csv_import(client, admin):
+    body = CSV_HEADER + f'1,1,IMP01,LEC,P,TuTh,10:00,11:15,false,Open,40,SEM 102,Ada0 {INSTRUCTOR_LAST_NAME};Bo {INSTRUCTOR_LAST_NAME}\n'
+    response = client.post('/admin/sections/bulk', data=body, content_type='text/csv')
+    assert response.status_code == 201
+
+    section = client.get(f"/sections/{response.get_json()['section_ids'][0]}").get_json()['section']
+    assert len(section['instructors']) == 2
+
+    response = client.post('/admin/sections/bulk', data=body, content_type='text/csv')
+    assert response.status_code == 400
+    assert response.get_json()['errors'][0]['error'] == 'Section already exists'
+
+#Test an import with the search view on schedules one view refresh, outside the request
+def test_import_schedules_one_view_refresh(client, admin, count_queries, monkeypatch):
+    class RecordingRefresher:
+        scheduled = 0
+
+        def schedule(self):
+            self.scheduled += 1
+
+    refresher = RecordingRefresher()
+    monkeypatch.setattr(app_module, 'search_view_refresher', refresher)
+    monkeypatch.setitem(flask_app.config, 'SEARCH_VIEW_ENABLED', True)
+
+    with count_queries() as statements:
+        response = client.post('/admin/sections/bulk', json=[section_row(i) for i in range(20)])
+
+    assert response.status_code == 201
+    assert refresher.scheduled == 1
+    assert not any('REFRESH MATERIALIZED VIEW' in statement for statement in statements)
+
+#Test imported sections get search documents even while full-text search is off
+def test_import_writes_search_documents(client, admin, monkeypatch):
+    monkeypatch.setitem(flask_app.config, 'FULL_TEXT_SEARCH_ENABLED', False)
+    response = client.post('/admin/sections/bulk', json=[section_row(i) for i in range(3)])
+    section_ids = response.get_json()['section_ids']
+
+    with flask_app.app_context():
+        documents = db.session.execute(
+            db.text("SELECT count(*) FROM section_search_document WHERE section_id = ANY(:ids)"), {'ids': section_ids}
+        ).scalar()
+    assert documents == 3
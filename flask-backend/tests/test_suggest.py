@@ -0,0 +1,48 @@
+# tests/test_suggest.py
+import pytest
+from app import app as flask_app
+from services.suggest_index import SuggestIndex
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    with flask_app.test_client() as client:
+        yield client
+
+
+def suggest(client, query, limit=None):
+    url = f'/suggest?q={query}' + (f'&limit={limit}' if limit else '')
+    return client.get(url).get_json()['suggestions']
+
+#Test course codes complete with or without the space and in any case
+def test_suggest_course_codes(client):
+    spaced = suggest(client, 'cs 13')
+    joined = suggest(client, 'CS13')
+
+    assert spaced and spaced == joined
+    assert all(s['type'] == 'course' and s['value'].startswith('CS 13') for s in spaced)
+
+#Test a word in the middle of a title or a last name matches
+def test_suggest_title_words_and_instructors(client):
+    titles = suggest(client, 'science')
+    instructors = suggest(client, 'smith')
+
+    assert any('science' in s['label'].lower() for s in titles if s['type'] == 'course')
+    assert any(s['type'] == 'instructor' and 'Smith' in s['value'] for s in instructors)
+
+#Test limit, empty queries and unknown prefixes
+def test_suggest_limits(client):
+    assert len(suggest(client, 'c', limit=3)) == 3
+    assert len(suggest(client, 'c', limit=500)) == SuggestIndex.MAX_RESULTS
+    assert suggest(client, '') == []
+    assert suggest(client, 'zzzzqq') == []
+
+#Test the index is rebuilt after a catalog version change
+def test_suggest_index_reloads_on_version_change(client):
+    with flask_app.app_context():
+        first = SuggestIndex.current()
+        assert SuggestIndex.current() is first
+
+        first.version = -1
+        assert SuggestIndex.current() is not first
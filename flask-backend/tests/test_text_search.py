@@ -0,0 +1,90 @@
+# tests/test_text_search.py
+import pytest
+from app import app as flask_app, db
+from models.section import Section
+from models.instructor import Instructor
+from models.search_document import SectionSearchDocument
+from services.search_service import SearchService, decode_cursor
+from services.text_search import SectionTextSearch, prefix_tsquery
+
+
+@pytest.fixture
+def app_context():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        yield
+        db.session.rollback()
+
+
+def full_text_search(query, use_projection=False, limit=None, cursor=None, **filters):
+    search = SearchService(use_full_text=True, use_projection=use_projection)
+    search.add_filter('search_query', query)
+    for name, value in filters.items():
+        search.add_filter(name, value)
+    search.execute_search(limit=limit, cursor=cursor)
+    return search
+
+
+def search_ids(query, **filters):
+    return [row['section_id'] for row in full_text_search(query, **filters).get_results_as_dict()]
+
+#Test prefix tsquery building
+def test_prefix_tsquery():
+    assert prefix_tsquery('CS 13') == 'cs:* & 13:*'
+    assert prefix_tsquery('  ?! ') is None
+
+#Test results come back most relevant first, course code matches (weight A) ahead of the rest
+def test_rank_ordering(app_context):
+    rows = full_text_search('cs 135', use_projection=True).results
+    ranks = [-row.neg_rank for row in rows]
+
+    assert rows
+    assert ranks == sorted(ranks, reverse=True)
+    assert rows[0].course_code.split() == ['CS', '135']
+
+#Test keyset pages with the 5 element ranked cursor match the unpaged order, ties included
+@pytest.mark.parametrize('use_projection', [False, True])
+def test_ranked_keyset_pages(app_context, use_projection):
+    query = 'science'     # many sections share a rank, the section key breaks the ties
+    expected = search_ids(query)
+
+    seen, cursor, first_cursor = [], None, None
+    while True:
+        search = full_text_search(query, use_projection=use_projection, limit=7, cursor=cursor)
+        seen += [row['section_id'] for row in search.get_results_as_dict()]
+        cursor = search.next_cursor
+        first_cursor = first_cursor or cursor
+        if not cursor:
+            break
+
+    assert len(expected) > 14
+    assert seen == expected
+
+    neg_rank, subject, catalog_num, section_num, section_id = decode_cursor(first_cursor)
+    assert neg_rank < 0     # negated so ascending keyset order is descending relevance
+    assert section_id == expected[6]
+
+#Test a query that matches nothing
+def test_no_matches(app_context):
+    search = full_text_search('zzqxvj')
+    assert search.get_results_as_dict() == []
+    assert search.next_cursor is None
+    assert search.get_total_count() == 0
+
+#Test refresh_section_search_document picks up new sections and changed instructors
+def test_refresh_after_insert_and_update(app_context):
+    template = db.session.get(Section, 1)
+    section = Section(course_id=template.course_id, term_id=template.term_id, section_num='FTS01')
+    db.session.add(section)
+    db.session.flush()
+    assert db.session.get(SectionSearchDocument, section.id) is None
+
+    SectionTextSearch.refresh([section.id])
+    assert section.id in search_ids(template.course.subject + ' ' + template.course.catalog_num.strip())
+
+    section.instructors.append(Instructor(first_name='Quillon', last_name='Fulltextova'))
+    db.session.flush()
+    assert section.id not in search_ids('fulltextova')
+
+    SectionTextSearch.refresh([section.id])
+    assert search_ids('fulltextova') == [section.id]
@@ -0,0 +1,95 @@
+# tests/test_user_cache.py
+import pytest
+from werkzeug.security import generate_password_hash
+from app import app as flask_app, db, timedSerializer, user_cache
+from models.user import User
+from services.user_cache import CachedUser, UserCache
+
+
+TEST_EMAIL = 'usercachetest@gmail.com'
+TEST_PASSWORD = 'usercachepassword123'
+
+
+@pytest.fixture
+def client():
+    flask_app.config['TESTING'] = True
+    flask_app.config['WTF_CSRF_ENABLED'] = False
+    with flask_app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def user_id(cleanup_test_user):
+    cleanup_test_user(TEST_EMAIL)
+    with flask_app.app_context():
+        user = User(
+            first_name='User',
+            last_name='Cache',
+            email=TEST_EMAIL,
+            password=generate_password_hash(TEST_PASSWORD),
+            is_verified=True
+        )
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    yield user_id
+    user_cache.invalidate(user_id)
+    cleanup_test_user(TEST_EMAIL)
+
+
+def users_queries(statements):
+    return [statement for statement in statements if 'FROM users' in statement]
+
+#Test authenticated requests after the first don't query the users table
+def test_requests_use_cached_user(client, user_id, count_queries):
+    client.post('/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD})
+
+    with count_queries() as first:
+        assert client.get('/auth/status').get_json()['user']['email'] == TEST_EMAIL
+    with count_queries() as second:
+        data = client.get('/auth/status').get_json()
+
+    assert len(users_queries(first)) == 1
+    assert users_queries(second) == []
+    assert data['user'] == {
+        'id': user_id, 'email': TEST_EMAIL, 'first_name': 'User', 'last_name': 'Cache', 'role': 'Student'
+    }
+
+#Test logout and email verification drop the cached record
+def test_invalidation(client, user_id):
+    client.post('/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD})
+    client.get('/auth/status')
+    assert user_id in user_cache._entries
+
+    client.post('/logout')
+    assert user_id not in user_cache._entries
+
+    with flask_app.app_context():
+        db.session.execute(db.update(User).where(User.id == user_id).values(is_verified=False))
+        db.session.commit()
+        assert user_cache.get(user_id).is_verified is False
+
+    client.get(f"/verify-email/{timedSerializer.dumps(TEST_EMAIL, salt='email-verify')}")
+    with flask_app.app_context():
+        assert user_cache.get(user_id).is_verified is True
+
+#Test records expire after the TTL and the cache stays within max_size
+def test_ttl_and_size_bound(user_id):
+    with flask_app.app_context():
+        cache = UserCache(ttl=30, max_size=1)
+        user = cache.get(user_id)
+        assert cache.get(user_id) is user
+
+        user.expires_at = 0
+        assert cache.get(user_id) is not user
+        assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+        assert cache.get(-1) is None
+        assert len(cache._entries) == 1
+
+#Test the record is a compact __slots__ object that works as a Flask-Login user
+def test_cached_user_record():
+    user = CachedUser(1, 'a@unr.edu', 'A', 'B', 'Student', True)
+    assert not hasattr(user, '__dict__')
+    assert user.is_authenticated and user.is_active and not user.is_anonymous
+    assert user.get_id() == '1'
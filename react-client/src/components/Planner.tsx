@@ -46,6 +46,8 @@ export function Planner({ onRemoveFromPlanner, onSwapPrompt }: PlannerProps) {
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [courseToSwap, setCourseToSwap] = useState<Course | null>(null);
+  // conflict pairs come from the backend sweep line, with the planner itself (/planner)
+  const [conflictPairs, setConflictPairs] = useState<[number, number][]>([]);
 
   useEffect(() => {
     fetch('/api/planner', {
@@ -55,6 +57,7 @@ export function Planner({ onRemoveFromPlanner, onSwapPrompt }: PlannerProps) {
       .then(data => {
         if (data.status === 'success') {
           setPlannedCourses(data.sections);
+          setConflictPairs(data.conflicts);
         } else {
           setError('Failed to load planner');
         }
@@ -78,6 +81,27 @@ export function Planner({ onRemoveFromPlanner, onSwapPrompt }: PlannerProps) {
     updated[index] = newCourse;
     setPlannedCourses(updated);
     setCourseToSwap(null); // closes modal
+    refreshConflicts(updated);
+  };
+
+  // removing a section only drops pairs (the lookup below skips them), a swapped in one needs a new check
+  const refreshConflicts = (sections: Course[]) => {
+    const ids = sections.map(s => s.section_id).join(",");
+    if (!ids) {
+      setConflictPairs([]);
+      return;
+    }
+
+    fetch(`/api/planner/conflicts?section_ids=${ids}`, {
+      credentials: 'include'
+    })
+      .then(res => res.json())
+      .then(data => {
+        if (data.status === 'success') {
+          setConflictPairs(data.conflicts);
+        }
+      })
+      .catch(err => console.error('Error checking conflicts:', err));
   };
 
   const totalCredits = plannedCourses.reduce((sum, s) => sum + s.course.units, 0);
@@ -148,39 +172,17 @@ export function Planner({ onRemoveFromPlanner, onSwapPrompt }: PlannerProps) {
   }
 
   const conflicts = useMemo(() => {
+    const byId = new Map(plannedCourses.map(s => [s.section_id, s]));
     const results: { a: Course; b: Course }[] = [];
 
-    const timesOverlap = (
-      startA: string,
-      endA: string,
-      startB: string,
-      endB: string
-    ) => startA < endB && startB < endA;
-
-    for (let i = 0; i < plannedCourses.length; i++) {
-      const a = plannedCourses[i];
-      if (!a.days || !a.start_time || !a.end_time) continue;
-
-      const daysA = parseMeetingDays(a.days);
-
-      for (let j = i + 1; j < plannedCourses.length; j++) {
-        const b = plannedCourses[j];
-        if (!b.days || !b.start_time || !b.end_time) continue;
-
-        const daysB = parseMeetingDays(b.days);
-        const shareDay = daysA.some(d => daysB.includes(d));
-
-        if (
-          shareDay &&
-          timesOverlap(a.start_time, a.end_time, b.start_time, b.end_time)
-        ) {
-          results.push({ a, b });
-        }
-      }
-    }
+    conflictPairs.forEach(([idA, idB]) => {
+      const a = byId.get(idA);
+      const b = byId.get(idB);
+      if (a && b) results.push({ a, b });
+    });
 
     return results;
-  }, [plannedCourses]);
+  }, [plannedCourses, conflictPairs]);
 
   const conflictIds = useMemo(() => {
     const ids = new Set<number>();
@@ -18,6 +18,8 @@ export interface SearchParams {
   //search_query_type?: string;
   course_career?: string;
   level?: string;
+  limit?: number;
+  cursor?: string;
 }
 
 export interface Section {
@@ -85,9 +87,23 @@ export interface SearchResponse {
   status: string;
   sections: Section[];
   count: number;
+  limit?: number;
+  next_cursor?: string | null;
   filters_used?: Record<string, any>;
 }
 
+export interface Suggestion {
+  type: 'course' | 'instructor';
+  value: string;
+  label: string;
+}
+
+export interface SuggestResponse {
+  status: string;
+  query: string;
+  suggestions: Suggestion[];
+}
+
 export interface SectionDetailsResponse {
   status: string;
   section?: SectionDetails;
@@ -122,6 +138,21 @@ class CourseAPI {
     return data;
   }
 
+  /**
+   * Typeahead completions for course codes, titles and instructors.
+   * Call it debounced and pass an AbortSignal so a newer keystroke cancels the older request
+   */
+  async getSuggestions(query: string, limit = 8, signal?: AbortSignal): Promise<SuggestResponse> {
+    const queryParams = new URLSearchParams({ q: query, limit: limit.toString() });
+    const response = await fetch(`${API_BASE_URL}/suggest?${queryParams.toString()}`, { signal });
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch suggestions');
+    }
+
+    return response.json();
+  }
+
   /**
    * Get detailed information about a specific section
    */